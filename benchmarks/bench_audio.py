@@ -0,0 +1,104 @@
+"""
+Benchmark dos sinais sonoros (core.audio): tempo de decodificação dos arquivos
+de sounds/, custo de play() dentro do turno com o som já no cache e ainda não
+decodificado, e latência dos turnos do GameEngine com e sem áudio.
+
+Um backend lento (decodificação artificialmente demorada) mostra que o turno
+não espera pela decodificação.
+
+Uso: python benchmarks/bench_audio.py --turns 2000 --slow-ms 200
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.audio import CUES, AudioSystem, RecordingBackend
+from core.engine import GameEngine
+
+COMMANDS = ["mover norte", "mover sul", "olhar", "inventario"]
+
+
+class SlowBackend(RecordingBackend):
+    """Backend de gravação cuja decodificação demora `delay` segundos."""
+
+    name = "lento"
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+
+    def decode(self, path):
+        time.sleep(self.delay)
+        return super().decode(path)
+
+
+def turn_latencies(audio, turns, seed):
+    engine = GameEngine(seed=seed, audio=audio)
+    engine.game.fear = 60  # eventos (e sinais) frequentes
+    latencies = []
+    cues = 0
+    for turn in range(turns):
+        start = time.perf_counter()
+        result = engine.execute(COMMANDS[turn % len(COMMANDS)])
+        latencies.append(time.perf_counter() - start)
+        cues += len(result.cues)
+        engine.game.health = engine.game.sanity = 100  # mantém a partida viva
+    latencies.sort()
+    return latencies, cues
+
+
+def describe(label, latencies):
+    mean = sum(latencies) / len(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{label:<40} média {mean * 1e6:8.1f} µs  p99 {p99 * 1e6:8.1f} µs  máx {latencies[-1] * 1e6:9.1f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=5)
+    parser.add_argument("--slow-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    audio = AudioSystem(RecordingBackend())
+    audio.wait()
+    stats = audio.stats()
+    print(f"decodificação (gravação): {stats['decodes']} arquivos, {stats['decode_ms']:.2f} ms "
+          f"({stats['decode_avg_ms']:.2f} ms/arquivo)")
+    start = time.perf_counter()
+    for _ in range(10000):
+        audio.play("random_event")
+    print(f"play() com o som no cache:         {(time.perf_counter() - start) / 10000 * 1e6:8.2f} µs")
+    audio.close()
+
+    slow = AudioSystem(SlowBackend(args.slow_ms / 1000), preload=False, max_delay=10.0)
+    start = time.perf_counter()
+    slow.play("nightfall")
+    print(f"play() antes da decodificação:     {(time.perf_counter() - start) * 1e6:8.2f} µs "
+          f"(decodificação leva {args.slow_ms:g} ms)")
+    slow.wait()
+    print(f"tocado {slow.stats()['max_delay_ms']:.0f} ms depois, fora do turno\n")
+    slow.close()
+
+    baseline, _ = turn_latencies(None, args.turns, args.seed)
+    describe("turno sem áudio", baseline)
+    recording = AudioSystem(RecordingBackend())
+    recording.wait()
+    latencies, cues = turn_latencies(recording, args.turns, args.seed)
+    describe("turno com áudio (cache quente)", latencies)
+    recording.close()
+    cold = AudioSystem(SlowBackend(args.slow_ms / 1000), max_delay=10.0)
+    latencies, _ = turn_latencies(cold, args.turns, args.seed)
+    describe(f"turno com áudio (decodificação {args.slow_ms:g} ms)", latencies)
+    cold.wait()
+    stats = cold.stats()
+    print(f"\n{cues} sinais em {args.turns} turnos ({', '.join(sorted(set(CUES)))}); "
+          f"backend lento: {stats['hits']} no cache, {stats['misses']} esperaram, {stats['dropped']} descartados")
+    cold.close()
+
+
+if __name__ == "__main__":
+    main()
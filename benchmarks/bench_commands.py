@@ -0,0 +1,54 @@
+"""
+Benchmark do caminho quente por turno: interpretação (com e sem cache) e
+despacho/execução de comandos no GameEngine.
+
+Uso: python benchmarks/bench_commands.py --number 200000
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.command_system import CommandSystem
+from core.engine import GameEngine
+
+COMMANDS = ["olhar", "mover norte", "mover sul", "inventario", "exa chave_enferrujada", "peg lanterna", "ajuda"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200000)
+    args = parser.parse_args()
+    n = args.number
+
+    def parse_cached():
+        for cmd in COMMANDS:
+            CommandSystem.parse(cmd)
+
+    def parse_uncached():
+        for cmd in COMMANDS:
+            CommandSystem._parse_cached.__wrapped__(cmd)
+
+    engine = GameEngine()
+    # Isola o custo do despacho (aceita qualquer assinatura de trigger_random_event)
+    engine.game.trigger_random_event = lambda *args, **kwargs: None
+
+    def execute():
+        for cmd in COMMANDS:
+            engine.execute(cmd)
+
+    per_cmd = len(COMMANDS)
+    results = [
+        ("parse (cache)", timeit.timeit(parse_cached, number=n // per_cmd)),
+        ("parse (sem cache)", timeit.timeit(parse_uncached, number=n // per_cmd)),
+        ("parse + despacho (execute)", timeit.timeit(execute, number=n // per_cmd // 4) * 4),
+    ]
+    for label, seconds in results:
+        print(f"{label:<30} {seconds / n * 1e9:>8.0f} ns/comando")
+    print(CommandSystem.cache_info())
+
+
+if __name__ == "__main__":
+    main()
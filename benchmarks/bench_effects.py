@@ -0,0 +1,82 @@
+"""
+Benchmark da aplicação de efeitos: o apply_effects antigo (percorre o
+dicionário a cada chamada, limites fixos) contra os efeitos compilados na carga
+(core.effects), aplicados direto ou via GameState.apply_effects, que busca a
+especificação já compilada no cache da biblioteca.
+
+Os efeitos medidos são os do próprio conteúdo: eventos de events.json e
+penalidades dos quizzes.
+
+Uso: python benchmarks/bench_effects.py --repeat 200000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import rules
+from core.game_state import GameState
+
+
+def legacy_apply_effects(game, effects):
+    """apply_effects como era antes dos efeitos compilados (referência)."""
+    if "health" in effects:
+        game.health = max(0, min(100, game.health + effects["health"]))
+    if "fear" in effects:
+        game.fear = max(0, min(100, game.fear + effects["fear"]))
+    if "sanity" in effects:
+        game.sanity = max(0, min(100, game.sanity + effects["sanity"]))
+
+
+def reset(game):
+    game.health, game.fear, game.sanity = 60, 40, 60
+
+
+def measure(label, rounds, applications, func):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<38} {elapsed:7.3f}s  {elapsed / applications * 1e9:6.0f} ns/efeito")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200000)
+    args = parser.parse_args()
+
+    game = GameState()
+    library = game.effects
+    specs = [event.get("effect", {}) for event in game.events.events]
+    specs += [rules.penalty_effects(quiz.get("penalty") or {}) for quiz in game.quiz_system.quizzes.values()]
+    compiled = [library.compile(spec) for spec in specs]
+    rounds = max(1, args.repeat // len(specs))
+    total = rounds * len(specs)
+    print(f"{len(specs)} efeitos do conteúdo, {total:,} aplicações\n")
+
+    def legacy():
+        for spec in specs:
+            legacy_apply_effects(game, spec)
+
+    def each():
+        for effect in compiled:
+            effect.apply(game)
+
+    def cached():
+        for spec in specs:
+            game.apply_effects(spec)
+
+    reset(game)
+    base = measure("apply_effects antigo (dict)", rounds, total, legacy) / total
+    reset(game)
+    per = measure("Effect.apply (compilado)", rounds, total, each) / total
+    reset(game)
+    via = measure("GameState.apply_effects (cache)", rounds, total, cached) / total
+    print(f"\ncompilado: {base / per:.2f}x | apply_effects: {base / via:.2f}x em relação ao antigo")
+
+
+if __name__ == "__main__":
+    main()
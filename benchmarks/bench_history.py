@@ -0,0 +1,124 @@
+"""
+Benchmark do histórico da sessão (core.history): memória dos snapshots em uma
+sessão longa numa mansão gerada, comparada com guardar uma cópia do estado
+(GameState.to_dict) por turno; custo do snapshot no turno (e do turno enquanto
+o histórico só anota os comandos); tempo de desfazer/refazer; e fork() de uma sessão comparado com copiar via to_dict/from_dict.
+
+O jogador é um bot que anda ao acaso e pega o primeiro item de metade das
+salas por onde passa (o inventário não tem limite aqui, para o mundo alterado
+crescer durante toda a sessão).
+
+Uso: python benchmarks/bench_history.py --turns 10000 --rooms 2000
+"""
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.engine import GameEngine
+from core.game_state import GameState
+from core.generator import MansionGenerator
+
+
+def bot_command(game, rng):
+    room = game.get_current_room_data()
+    if room.items and rng.random() < 0.5:
+        return f"pegar {room.items[0]}"
+    return f"mover {rng.choice(list(room.connections))}"
+
+
+def play(data_dir, turns, seed, history_limit, keep_copies=False, trace=False, lazy=False):
+    """
+    Sessão de `turns` turnos: (motor, segundos por turno, bytes retidos ao final ou None).
+    Sem `lazy`, o histórico monta os snapshots desde o primeiro turno, como depois de um desfazer.
+    """
+    engine = GameEngine(GameState(data_dir=data_dir, seed=seed), history_limit=history_limit)
+    if engine.history is not None and not lazy:
+        engine.history.activate()
+    game = engine.game
+    game.inventory.limit = turns
+    rng = random.Random(seed)
+    copies = []
+    if trace:
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+    elapsed = 0.0
+    for _ in range(turns):
+        game.health = game.sanity = 100
+        cmd = bot_command(game, rng)
+        start = time.perf_counter()
+        engine.execute(cmd)
+        elapsed += time.perf_counter() - start
+        if keep_copies:
+            copies.append(game.to_dict())
+    retained = None
+    if trace:
+        retained = tracemalloc.get_traced_memory()[0] - base
+        tracemalloc.stop()
+    return engine, elapsed / turns, retained
+
+
+def per_call(func, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=10000)
+    parser.add_argument("--rooms", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    data_dir = Path(tempfile.mkdtemp(prefix="casa_history_"))
+    try:
+        MansionGenerator(args.rooms, seed=args.seed).write(data_dir)
+        GameState(data_dir=data_dir).content  # carga do conteúdo fora das medições
+
+        _, plain_turn, plain_bytes = play(data_dir, args.turns, args.seed, 0, trace=True)
+        engine, _, history_bytes = play(data_dir, args.turns, args.seed, None, trace=True)
+        _, _, copies_bytes = play(data_dir, args.turns, args.seed, 0, keep_copies=True, trace=True)
+        _, history_turn, _ = play(data_dir, args.turns, args.seed, None)
+        _, lazy_turn, _ = play(data_dir, args.turns, args.seed, None, lazy=True)
+        _, plain_turn, _ = play(data_dir, args.turns, args.seed, 0)
+
+        game = engine.game
+        depth = engine.history.stats()["undo"]
+        snapshots = history_bytes - plain_bytes
+        copies = copies_bytes - plain_bytes
+        print(f"{args.turns} turnos, {args.rooms} salas: {depth} estados no histórico, "
+              f"{len(game.world.export_overlay())} salas alteradas, {len(game.inventory)} itens")
+        print(f"memória do histórico      {snapshots / 2**20:8.2f} MiB  ({snapshots / depth:7.0f} B por estado)")
+        print(f"cópia por turno (to_dict) {copies / 2**20:8.2f} MiB  ({copies / args.turns:7.0f} B por turno)")
+        print(f"turno sem histórico       {plain_turn * 1e6:8.2f} µs")
+        print(f"turno com histórico       {history_turn * 1e6:8.2f} µs")
+        print(f"turno antes de desfazer   {lazy_turn * 1e6:8.2f} µs")
+
+        history = engine.history
+        step = per_call(lambda: (history.undo(), history.redo()), 2000) / 2
+        print(f"desfazer/refazer 1 passo  {step * 1e6:8.2f} µs")
+        start = time.perf_counter()
+        undone = history.undo(depth)
+        middle = time.perf_counter() - start
+        start = time.perf_counter()
+        history.redo(depth)
+        print(f"desfazer {undone} passos   {middle * 1e3:8.2f} ms   refazer: {(time.perf_counter() - start) * 1e3:.2f} ms")
+
+        fork = per_call(engine.fork, 1000)
+        copy = per_call(lambda: GameState.from_dict(game.to_dict(), data_dir=data_dir), 50)
+        print(f"fork()                    {fork * 1e6:8.2f} µs")
+        print(f"from_dict(to_dict())      {copy * 1e6:8.2f} µs")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
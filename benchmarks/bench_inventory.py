@@ -0,0 +1,79 @@
+"""
+Micro-benchmark das operações de core/items.py com inventários de 10, 1k e 100k itens,
+comparando o Inventory indexado com a implementação antiga de busca linear.
+
+Uso: python benchmarks/bench_inventory.py --sizes 10 1000 100000
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.items import Item, Inventory
+
+
+class LinearInventory:
+    """Inventário antigo (lista + busca linear com .lower()), só para comparação."""
+
+    def __init__(self, limit):
+        self.items = []
+        self.limit = limit
+
+    def add_item(self, item):
+        if len(self.items) < self.limit:
+            self.items.append(item)
+            return True
+        return False
+
+    def remove_item(self, item_name):
+        item = self.get_item(item_name)
+        if item:
+            self.items.remove(item)
+        return item
+
+    def has_item(self, item_name):
+        return any(item.name.lower() == item_name.lower() for item in self.items)
+
+    def get_item(self, item_name):
+        return next((item for item in self.items if item.name.lower() == item_name.lower()), None)
+
+
+def measure(cls, size, number):
+    inventory = cls(limit=size + 1)
+    for i in range(size):
+        inventory.add_item(Item(f"Item_{i}", "x"))
+    probe = f"ITEM_{size - 1}"  # pior caso para a busca linear
+    extra = Item("extra", "x")
+
+    def add_remove():
+        inventory.add_item(extra)
+        inventory.remove_item("extra")
+
+    return {
+        "has_item": timeit.timeit(lambda: inventory.has_item(probe), number=number) / number,
+        "get_item": timeit.timeit(lambda: inventory.get_item(probe), number=number) / number,
+        "add+remove": timeit.timeit(add_remove, number=number) / number,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'itens':>8} {'operação':<12} {'indexado (µs)':>14} {'linear (µs)':>12}")
+    for size in args.sizes:
+        number = max(3, 200000 // size)
+        indexed = measure(Inventory, size, number)
+        linear = measure(LinearInventory, size, max(3, number // 10))
+        for op in indexed:
+            print(f"{size:>8} {op:<12} {indexed[op] * 1e6:>14.3f} {linear[op] * 1e6:>12.3f}")
+
+    items = [Item(f"item_{i}", "x") for i in range(100000)]
+    print(f"\nItem com __slots__: {sys.getsizeof(items[0])} bytes por instância (sem __dict__)")
+
+
+if __name__ == "__main__":
+    main()
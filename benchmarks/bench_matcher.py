@@ -0,0 +1,82 @@
+"""
+Benchmark do core.matcher: construção do índice e resolução de nomes com
+acentos e erros de digitação em vocabulários de milhares de itens, comparando
+a BK-tree com uma varredura linear pela distância de edição. A última coluna
+é o caso do jogo: o alvo restrito aos poucos itens da sala.
+
+Uso: python benchmarks/bench_matcher.py --items 1000 10000 --queries 500
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.generator import ITEM_ADJECTIVES, ITEM_NOUNS
+from core.matcher import Matcher, edit_distance, normalize, tolerance
+
+
+def vocabulary(count, rng):
+    return [f"{rng.choice(ITEM_NOUNS)}_{rng.choice(ITEM_ADJECTIVES)}_{i}" for i in range(count)]
+
+
+def typo(name, rng):
+    """Um erro de digitação em uma posição aleatória (troca, omissão ou inserção)."""
+    position = rng.randrange(len(name))
+    kind = rng.randrange(3)
+    if kind == 0:
+        return name[:position] + "x" + name[position + 1:]
+    if kind == 1:
+        return name[:position] + name[position + 1:]
+    return name[:position] + "x" + name[position:]
+
+
+def linear_resolve(names, text):
+    """Referência: compara a consulta com cada nome."""
+    key = normalize(text)
+    limit = tolerance(key)
+    best = [(edit_distance(key, normalize(name), limit), name) for name in names]
+    best = [entry for entry in best if entry[0] <= limit]
+    return min(best)[1] if best else None
+
+
+def per_query(func, queries):
+    start = time.perf_counter()
+    for query in queries:
+        func(query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'itens':>7} {'índice':>10} {'exato':>10} {'acentos':>10} {'erro (BK)':>11} {'erro (linear)':>14} {'acertos':>8} {'sala':>9}")
+    for count in args.items:
+        names = vocabulary(count, rng)
+        start = time.perf_counter()
+        matcher = Matcher(names)
+        matcher.suggest(names[0])  # monta a BK-tree (preguiçosa)
+        build_ms = (time.perf_counter() - start) * 1e3
+        sample = [rng.choice(names) for _ in range(args.queries)]
+        typos = [typo(name, rng) for name in sample]
+        exact_us = per_query(matcher.resolve, sample)
+        spaced_us = per_query(matcher.resolve, [name.replace("_", " ").upper() for name in sample])
+        fuzzy_us = per_query(matcher.resolve, typos)
+        hits = sum(matcher.resolve(query) == name for query, name in zip(typos, sample))
+        linear_queries = typos[:max(1, args.queries // 10)]  # a varredura é lenta demais para todas
+        linear_us = per_query(lambda query: linear_resolve(names, query), linear_queries)
+        room = sample[:5]
+        room_us = per_query(lambda query: matcher.resolve(query, room), [typo(name, rng) for name in room] * 40)
+        print(f"{count:>7} {build_ms:>8.1f}ms {exact_us:>8.2f}µs {spaced_us:>8.2f}µs {fuzzy_us:>9.1f}µs "
+              f"{linear_us:>12.1f}µs {hits / len(typos):>7.0%} {room_us:>7.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
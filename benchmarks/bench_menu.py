@@ -0,0 +1,60 @@
+"""
+Benchmark do menu de ações (interface.actions): tempo de montar o menu de uma
+sala com N ações (saídas, itens no chão e inventário) quando o estado muda,
+comparado com o turno seguinte sem mudança, que reaproveita o menu guardado
+e deve custar o mesmo para qualquer N.
+
+Uso: python benchmarks/bench_menu.py --actions 10 100 1000 --repeat 2000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.game_state import GameState
+from core.items import Item
+from interface.actions import ActionMenu
+
+
+def crowded_game(actions):
+    """Sessão cuja sala inicial oferece cerca de `actions` ações (metade no chão, metade no inventário)."""
+    game = GameState(seed=1)
+    game.world.edit_room(game.current_room).items.extend(f"objeto_{n}" for n in range(actions // 2))
+    game.inventory.limit = actions
+    for n in range(actions - actions // 2):
+        game.inventory.add_item(Item(name=f"achado_{n}", description=""))
+    return game
+
+
+def per_call(func, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--actions", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'ações':>6} {'montagem µs':>12} {'em cache µs':>12} {'páginas':>8}")
+    for actions in args.actions:
+        game = crowded_game(actions)
+        menu = ActionMenu()
+
+        def rebuild():
+            game.world.edit_room(game.current_room)  # nova versão da sala: o menu é refeito
+            menu.actions(game)
+            menu.lines(game)
+
+        build = per_call(rebuild, max(1, args.repeat // 10))
+        cached = per_call(lambda: (menu.actions(game), menu.lines(game)), args.repeat)
+        print(f"{len(menu.actions(game)):>6} {build * 1e6:>12.1f} {cached * 1e6:>12.2f} {menu.pages:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark do custo da instrumentação (core.metrics) por turno: o mesmo
+roteiro executado no GameEngine com as métricas ligadas e desligadas em tempo
+de execução. Para o custo zero (decoradores removidos), compare com
+CASA_METRICS=0 no ambiente.
+
+Uso: python benchmarks/bench_metrics.py --number 20000
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import metrics
+from core.engine import GameEngine
+
+COMMANDS = ["olhar", "mover norte", "mover sul", "inventario", "exa chave_enferrujada", "peg lanterna", "ajuda"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+    n = args.number
+
+    engine = GameEngine(seed=1)
+    engine.game.trigger_random_event = lambda trigger: None  # isola o custo do despacho
+
+    def turns():
+        for cmd in COMMANDS:
+            engine.execute(cmd)
+
+    turns_per_run = n * len(COMMANDS)
+    results = {}
+    for label, flag in (("ligadas", True), ("desligadas", False)):
+        metrics.enable(flag)
+        results[label] = min(timeit.repeat(turns, number=n, repeat=3)) / turns_per_run
+        print(f"métricas {label:<11} {results[label] * 1e9:8.0f} ns/turno")
+    metrics.enable(True)
+    overhead = results["ligadas"] - results["desligadas"]
+    print(f"\ncusto da instrumentação: {overhead * 1e9:.0f} ns/turno "
+          f"({overhead / results['desligadas']:.1%} do turno)")
+    print(f"inicial (variável de ambiente): {'ligadas' if metrics.enabled() else 'desligadas'}")
+
+
+if __name__ == "__main__":
+    main()
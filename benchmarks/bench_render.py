@@ -0,0 +1,77 @@
+"""
+Benchmark do desenho de quadros do loop de jogo (interface.renderer).
+
+Joga um passeio aleatório pelas ações do menu e desenha cada turno em um
+terminal simulado, comparando o quadro com diff (só linhas alteradas), o
+redesenho completo a cada turno (equivalente a limpar a tela e reimprimir)
+e o modo texto puro. Reporta o custo de desenho (µs/turno) e os bytes
+enviados por turno, que dominam a latência em conexões SSH lentas.
+
+Uso: python benchmarks/bench_render.py --turns 2000 --seed 1 [--columns 120 --lines 50]
+"""
+import argparse
+import io
+import os
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from interface.game_interface import GameInterface
+from interface.renderer import FrameRenderer
+
+
+class FakeTerminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+class FullRedrawRenderer(FrameRenderer):
+    """Redesenha o quadro inteiro a cada turno (comportamento anterior ao diff)."""
+
+    def render(self, lines):
+        self.invalidate()
+        return super().render(lines)
+
+
+def run(renderer, turns, seed):
+    interface = GameInterface(renderer=renderer)
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(turns):
+        actions = interface.menu.actions(interface.game)
+        renderer.render(interface.frame_lines(messages))
+        # Evita encerrar o passeio ('sair') e não pega itens, para o quadro comparar com as medições anteriores
+        choices = [cmd for cmd in actions.values() if cmd != 'sair' and not cmd.startswith('pegar')]
+        messages = interface.execute(rng.choice(choices))
+        if not interface.running:
+            interface = GameInterface(renderer=renderer)
+        renderer.stream.seek(0)
+        renderer.stream.truncate()
+    return renderer.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--columns", type=int, default=120)
+    parser.add_argument("--lines", type=int, default=50)
+    args = parser.parse_args()
+    # shutil.get_terminal_size consulta estas variáveis antes do terminal real
+    os.environ["COLUMNS"], os.environ["LINES"] = str(args.columns), str(args.lines)
+
+    modes = [
+        ("diff (ANSI)", FrameRenderer(FakeTerminal(), mode='ansi')),
+        ("redesenho completo", FullRedrawRenderer(FakeTerminal(), mode='ansi')),
+        ("texto puro", FrameRenderer(FakeTerminal(), mode='plain')),
+    ]
+    print(f"{'modo':<20} {'µs/turno':>10} {'bytes/turno':>12}")
+    for name, renderer in modes:
+        stats = run(renderer, args.turns, args.seed)
+        print(f"{name:<20} {stats['render_us']:>10.1f} {stats['bytes_per_frame']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark do salvamento: save_game/load_game (JSON completo indentado) contra
+o SaveManager (diário de alterações com snapshots compactos).
+
+Mede, ao longo de um passeio de N turnos: o custo por turno de salvar tudo com
+save_game, o custo de GameState.to_dict (a única parte que o AutoSaver faz
+dentro do turno) e de SaveManager.append (feito na thread de fundo), os bytes
+gravados, o tempo de carga de cada formato e o tempo para listar muitos slots
+pelo índice contra abrir cada arquivo de save.
+
+Uso: python benchmarks/bench_save.py --turns 500 --slots 300
+"""
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.engine import GameEngine
+from core.game_state import GameState
+from core.save_system import SaveManager
+
+
+def play(engine, rng):
+    game = engine.game
+    options = ['olhar', 'inventario'] + [f'mover {d}' for d in game.get_current_room_connections()]
+    room = game.get_current_room_data()
+    options += [f'pegar {item}' for item in room.items]
+    engine.execute(rng.choice(options))
+
+
+def directory_size(path):
+    return sum(p.stat().st_size for p in Path(path).rglob('*') if p.is_file())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--slots", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="casa_saves_"))
+    try:
+        legacy_dir, journal_dir = root / "legacy", root / "journal"
+        manager = SaveManager(journal_dir)
+        engine = GameEngine()
+        rng = random.Random(args.seed)
+        legacy_time = capture_time = append_time = 0.0
+        legacy_bytes = 0
+        for _ in range(args.turns):
+            play(engine, rng)
+            start = time.perf_counter()
+            engine.game.save_game("bench.json", saves_dir=legacy_dir)
+            legacy_time += time.perf_counter() - start
+            legacy_bytes += (legacy_dir / "bench.json").stat().st_size
+
+            start = time.perf_counter()
+            state = engine.game.to_dict()
+            capture_time += time.perf_counter() - start
+            start = time.perf_counter()
+            manager.append("bench", state)
+            append_time += time.perf_counter() - start
+        journal_bytes = directory_size(journal_dir / "bench")
+
+        start = time.perf_counter()
+        legacy = GameState.load_game("bench.json", saves_dir=legacy_dir)
+        legacy_load = time.perf_counter() - start
+        start = time.perf_counter()
+        journaled = SaveManager(journal_dir).load("bench")
+        journal_load = time.perf_counter() - start
+        assert legacy.to_dict() == journaled.to_dict(), "os dois formatos divergiram"
+
+        state = engine.game.to_dict()
+        for n in range(args.slots):
+            engine.game.save_game(f"slot_{n}.json", saves_dir=legacy_dir)
+            manager.save(f"slot_{n}", state)
+        start = time.perf_counter()
+        for path in sorted(legacy_dir.glob("slot_*.json")):
+            with open(path, 'r', encoding='utf-8') as f:
+                json.load(f)
+        scan_time = time.perf_counter() - start
+        start = time.perf_counter()
+        manager.list_slots()
+        index_time = time.perf_counter() - start
+    finally:
+        shutil.rmtree(root)
+
+    turns = args.turns
+    print(f"Turnos: {turns}")
+    print(f"save_game por turno:              {legacy_time / turns * 1e6:9.1f} µs  ({legacy_bytes / turns:,.0f} bytes/turno gravados)")
+    print(f"to_dict por turno (no turno):     {capture_time / turns * 1e6:9.1f} µs")
+    print(f"append por turno (em segundo plano): {append_time / turns * 1e6:6.1f} µs  (slot final: {journal_bytes:,} bytes)")
+    print(f"load_game:                        {legacy_load * 1e3:9.2f} ms")
+    print(f"SaveManager.load (snapshot+diário): {journal_load * 1e3:7.2f} ms")
+    print(f"Listar {args.slots} slots: abrindo os saves {scan_time * 1e3:.2f} ms | pelo índice {index_time * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
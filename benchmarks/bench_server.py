@@ -0,0 +1,66 @@
+"""
+Benchmark do servidor asyncio: N clientes simultâneos jogando roteiros fixos.
+Mede turnos/s e a latência por turno (p50/p99), do envio do comando até o próximo prompt.
+
+Uso: python benchmarks/bench_server.py --clients 100 --turns 50
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from interface.server import GameServer, PROMPT
+
+SCRIPT = ["olhar", "mover norte", "mover leste", "olhar", "mover oeste", "mover sul", "inventario"]
+PROMPT_BYTES = PROMPT.replace("\n", "\r\n").encode('utf-8')
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def client(port, turns, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    await reader.readuntil(PROMPT_BYTES)
+    for turn in range(turns):
+        start = time.perf_counter()
+        writer.write((SCRIPT[turn % len(SCRIPT)] + "\r\n").encode('utf-8'))
+        await writer.drain()
+        await reader.readuntil(PROMPT_BYTES)
+        latencies.append(time.perf_counter() - start)
+    writer.write(b"sair\r\n")
+    await writer.drain()
+    writer.close()
+
+
+async def run(clients, turns):
+    server = GameServer(port=0, intro=False)
+    await server.start()
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(server.port, turns, latencies) for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    await server.stop()
+    return elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--turns", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'clientes':>9} {'turnos/s':>10} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for clients in args.clients:
+        elapsed, latencies = asyncio.run(run(clients, args.turns))
+        print(f"{clients:>9} {len(latencies) / elapsed:>10,.0f} "
+              f"{percentile(latencies, 50) * 1000:>9.2f} {percentile(latencies, 99) * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
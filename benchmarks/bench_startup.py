@@ -0,0 +1,85 @@
+"""
+Benchmark de inicialização: carga dos arquivos de data/ via JSON vs pacote de conteúdo,
+e custo de criar uma nova sessão (GameState) com o cache já aquecido.
+
+Com --scale N o mundo é replicado N vezes num diretório temporário, para
+medir conteúdos maiores que o da distribuição.
+
+Uso: python benchmarks/bench_startup.py --repeat 2000 --scale 1 100 1000
+"""
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import utils
+from core.content_pack import build_pack
+from core.game_state import GameState
+from core.world import World
+
+FILES = ["world.json", "quizzes.json", "puzzles.json", "config.json"]
+
+
+def cold_load(use_pack, data_dir):
+    utils.clear_data_cache()
+    for name in FILES:
+        utils.load_json_data(name, use_pack=use_pack, data_dir=data_dir)
+
+
+def new_session():
+    GameState()
+
+
+def report(label, seconds, repeat):
+    print(f"{label:<40} {seconds / repeat * 1e6:>10.1f} µs")
+
+
+def scaled_data_dir(source, scale):
+    """Copia data/ para um diretório temporário com o mundo replicado `scale` vezes."""
+    target = Path(tempfile.mkdtemp(prefix="casa_bench_"))
+    for path in source.glob("*.json"):
+        shutil.copy(path, target / path.name)
+    world = json.loads((source / "world.json").read_text(encoding='utf-8'))
+    scaled = {}
+    for copy in range(scale):
+        for room_id, room in world.items():
+            room = dict(room)
+            room.pop("puzzle_id", None)  # o alvo do puzzle não é replicado
+            room["connections"] = {d: f"{t}_{copy}" for d, t in room.get("connections", {}).items()}
+            scaled[f"{room_id}_{copy}"] = room
+    (target / "world.json").write_text(json.dumps(scaled, ensure_ascii=False), encoding='utf-8')
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 100, 1000])
+    args = parser.parse_args()
+
+    for scale in args.scale:
+        data_dir = scaled_data_dir(utils.DATA_DIR, scale)
+        try:
+            build_pack(data_dir)
+            repeat = max(1, args.repeat // scale) if scale > 1 else args.repeat
+            rooms = len(json.loads((data_dir / "world.json").read_text(encoding='utf-8')))
+            print(f"-- mundo x{scale} ({rooms} salas)")
+            report("carga a frio (JSON)", timeit.timeit(lambda: cold_load(False, data_dir), number=repeat), repeat)
+            report("carga a frio (pacote)", timeit.timeit(lambda: cold_load(True, data_dir), number=repeat), repeat)
+        finally:
+            utils.clear_data_cache()
+            shutil.rmtree(data_dir)
+
+    World.clear_template_cache()
+    GameState()  # aquece os caches
+    print("--")
+    report("nova sessão GameState (cache quente)", timeit.timeit(new_session, number=args.repeat), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark da telemetria (core.telemetry): custo de record() no turno,
+latência dos turnos do GameEngine com e sem telemetria (com o escritor de
+fundo trabalhando ao mesmo tempo), vazão do escritor e do agregador, e
+memória do agregador com arquivos de tamanhos diferentes (deve ficar constante).
+
+Uso: python benchmarks/bench_telemetry.py --turns 20000 --sessions 2000 20000
+"""
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.engine import GameEngine
+from core.telemetry import TelemetryWriter, aggregate, telemetry_files
+
+COMMANDS = ["olhar", "mover norte", "mover leste", "pegar livro_antigo", "resolver livro dos mortos",
+            "mover oeste", "mover sul", "inventario", "xyzzy", "pegar chave"]
+
+
+def turn_latencies(turns, telemetry, seed):
+    latencies = []
+    engine = GameEngine(seed=seed, telemetry=telemetry, source="bench")
+    for turn in range(turns):
+        start = time.perf_counter()
+        result = engine.execute(COMMANDS[turn % len(COMMANDS)])
+        latencies.append(time.perf_counter() - start)
+        if not result.running or result.ending:
+            engine.close()
+            engine = GameEngine(seed=seed + turn, telemetry=telemetry, source="bench")
+        engine.game.health = engine.game.sanity = 100
+    engine.close()
+    latencies.sort()
+    return latencies
+
+
+def describe(label, latencies):
+    mean = sum(latencies) / len(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{label:<34} média {mean * 1e6:7.2f} µs  p99 {p99 * 1e6:7.2f} µs  máx {latencies[-1] * 1e6:8.1f} µs")
+
+
+def synthetic_sessions(directory, sessions, rng):
+    """Grava `sessions` sessões jogadas com comandos aleatórios; retorna (eventos, bytes gravados)."""
+    writer = TelemetryWriter(directory, max_bytes=4 * 1024 * 1024, flush_interval=0.05, max_pending=10 ** 7)
+    for number in range(sessions):
+        engine = GameEngine(seed=number, telemetry=writer, source="bench")
+        for _ in range(rng.randrange(3, 30)):
+            result = engine.execute(rng.choice(COMMANDS))
+            if not result.running or result.ending:
+                break
+        engine.close(rng.choice(["disconnect", "closed"]))
+    writer.close(timeout=None)
+    return writer.events, writer.bytes_written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=20000)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp(prefix="casa_telemetry_"))
+    try:
+        writer = TelemetryWriter(directory / "record", flush_interval=3600)
+        engine = GameEngine(seed=args.seed)
+        result = engine.execute("olhar")
+        start = time.perf_counter()
+        for _ in range(100000):
+            writer.record("s", result, 0.001)
+        print(f"record() no turno: {(time.perf_counter() - start) / 100000 * 1e9:.0f} ns")
+        writer.close()
+
+        describe("turno sem telemetria", turn_latencies(args.turns, None, args.seed))
+        writer = TelemetryWriter(directory / "turns", flush_interval=0.01)
+        describe("turno com telemetria (flush 10 ms)", turn_latencies(args.turns, writer, args.seed))
+        writer.close()
+        print(f"  {writer.events} eventos, {writer.dropped} descartados, {writer.bytes_written / 1024:.0f} KiB\n")
+
+        rng = random.Random(args.seed)
+        for sessions in args.sessions:
+            target = directory / f"agg_{sessions}"
+            start = time.perf_counter()
+            events, size = synthetic_sessions(target, sessions, rng)
+            write_time = time.perf_counter() - start
+            paths = telemetry_files(target)
+            tracemalloc.start()
+            start = time.perf_counter()
+            report = aggregate(paths)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{sessions:>6} sessões: {events} eventos ({size / 2**20:.1f} MiB, {len(paths)} arquivo(s)) "
+                  f"gravados em {write_time:.2f}s; agregados em {elapsed:.2f}s "
+                  f"({events / elapsed:,.0f} eventos/s), pico de memória {peak / 1024:.0f} KiB, "
+                  f"{len(report['funnel'])} salas")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
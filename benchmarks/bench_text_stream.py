@@ -0,0 +1,119 @@
+"""
+Benchmark do texto animado (interface.text_stream): writes, flushes, pausas e
+bytes da introdução no typewriter antigo (um write, um flush e um sleep por
+caractere) e no TextStreamer em quadros, no terminal e no servidor, e quanto
+tempo leva para a introdução terminar depois de um ENTER.
+
+As pausas não são dormidas: são contadas (e somadas) por um relógio falso.
+
+Uso: python benchmarks/bench_text_stream.py --fps 12
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.colors import GameColors as C
+from interface.menu import MainMenu
+from interface.text_stream import TextStreamer
+
+
+class CountingStream:
+    """Saída falsa que conta writes, flushes e bytes."""
+
+    def __init__(self):
+        self.writes = 0
+        self.flushes = 0
+        self.bytes = 0
+
+    def write(self, data):
+        self.writes += 1
+        self.bytes += len(data.encode('utf-8'))
+
+    def flush(self):
+        self.flushes += 1
+
+    def isatty(self):
+        return True
+
+
+class FakeSleep:
+    """Relógio falso: dormir só avança o tempo."""
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+
+    def __call__(self, seconds):
+        self.calls += 1
+        self.total += seconds
+
+    def clock(self):
+        return self.total
+
+
+def legacy_intro(stream, sleep, delay=0.03):
+    """O typewriter anterior: C.format, print(flush=True) e sleep por caractere."""
+    for text, color, pause in MainMenu.INTRO_LINES:
+        for char in text:
+            stream.write(C.format(char, color))
+            stream.flush()
+            sleep(delay)
+        stream.write("\n")
+        sleep(pause)
+
+
+def streamed_intro(stream, sleep, fps, speed="normal"):
+    streamer = TextStreamer(stream, speed=speed, fps=fps, key_pressed=None, sleep=sleep, clock=sleep.clock)
+    for text, color, pause in MainMenu.INTRO_LINES:
+        streamer.type(text, color)
+        streamer.pause(pause)
+
+
+def report(label, stream, sleep):
+    print(f"{label:<28} {stream.writes:>7} {stream.flushes:>8} {sleep.calls:>7} {sleep.total:>9.2f}s {stream.bytes:>8}")
+
+
+async def server_intro(fps, skip_after):
+    """Introdução do servidor com um ENTER depois de `skip_after` segundos: (writes, bytes, duração)."""
+    writes = []
+
+    async def write(text):
+        writes.append(text)
+
+    streamer = TextStreamer(speed="normal", fps=fps, key_pressed=None)
+    start = time.perf_counter()
+    intro = asyncio.ensure_future(MainMenu.show_intro_async(write, streamer=streamer))
+    if skip_after is not None:
+        await asyncio.sleep(skip_after)
+        streamer.skip()
+    await intro
+    return len(writes), sum(len(text.encode('utf-8')) for text in writes), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fps", type=float, default=12.0)
+    parser.add_argument("--skip-after", type=float, default=0.5, help="segundos até o ENTER no teste de pular")
+    args = parser.parse_args()
+
+    print(f"{'terminal':<28} {'writes':>7} {'flushes':>8} {'pausas':>7} {'dormido':>10} {'bytes':>8}")
+    for label, run in (("typewriter antigo", lambda s, z: legacy_intro(s, z)),
+                       (f"TextStreamer {args.fps:g} fps", lambda s, z: streamed_intro(s, z, args.fps)),
+                       ("TextStreamer fast", lambda s, z: streamed_intro(s, z, args.fps, "fast"))):
+        stream, sleep = CountingStream(), FakeSleep()
+        run(stream, sleep)
+        report(label, stream, sleep)
+
+    writes, size, elapsed = asyncio.run(server_intro(args.fps, None))
+    print(f"\nservidor, introdução completa: {writes} writes, {size} bytes, {elapsed:.2f}s")
+    writes, size, elapsed = asyncio.run(server_intro(args.fps, args.skip_after))
+    print(f"servidor, ENTER em {args.skip_after:g}s:        {writes} writes, {size} bytes, "
+          f"terminou em {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
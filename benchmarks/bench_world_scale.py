@@ -0,0 +1,115 @@
+"""
+Benchmark de escala do mundo com mansões geradas por core.generator.
+
+Para cada tamanho, registra o tempo de geração, o tempo de carga
+(World.load_from_json a frio), o pico de memória da carga (tracemalloc), a
+latência por movimento (GameState.move_to_room em um passeio aleatório) e a
+latência de montagem do menu (GameInterface.available_actions).
+
+Com --format shards o mundo é gravado em shards NDJSON e lido sob demanda,
+com o cache de salas limitado por --budget-mb; os contadores do cache
+(acertos, faltas, pré-carregadas, descartes) entram no resultado.
+
+Uso: python benchmarks/bench_world_scale.py --sizes 1000 10000 100000 [1000000] --seed 42 [--format shards --budget-mb 8]
+"""
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import utils
+from core.content import ContentRegistry
+from core.generator import MansionGenerator
+from core.game_state import GameState
+from core.world import World
+from interface.game_interface import GameInterface
+
+
+def clear_caches():
+    utils.clear_data_cache()
+    World.clear_template_cache()
+    ContentRegistry._cache.clear()
+
+
+def measure_load(data_dir):
+    clear_caches()
+    start = time.perf_counter()
+    World.load_from_json(data_dir=data_dir)
+    elapsed = time.perf_counter() - start
+
+    clear_caches()
+    tracemalloc.start()
+    World.load_from_json(data_dir=data_dir)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def measure_moves(data_dir, moves, seed):
+    game = GameState(data_dir=data_dir)
+    rng = random.Random(seed)
+    move_time = 0.0
+    menu_time = 0.0
+    for _ in range(moves):
+        start = time.perf_counter()
+        GameInterface.available_actions(game)
+        menu_time += time.perf_counter() - start
+
+        directions = game.get_current_room_connections()
+        start = time.perf_counter()
+        game.move_to_room(rng.choice(directions))
+        move_time += time.perf_counter() - start
+    return move_time / moves, menu_time / moves, game.world.cache_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--moves", type=int, default=5000)
+    parser.add_argument("--branching", type=int, default=3)
+    parser.add_argument("--item-density", type=float, default=0.5)
+    parser.add_argument("--format", choices=("json", "shards"), default="json")
+    parser.add_argument("--budget-mb", type=float, default=World.stream_budget_bytes / 2 ** 20,
+                        help="orçamento do cache de salas no formato shards")
+    parser.add_argument("--output", help="grava os resultados em JSON neste arquivo")
+    args = parser.parse_args()
+    World.stream_budget_bytes = int(args.budget_mb * 2 ** 20)
+
+    results = []
+    print(f"{'salas':>9} {'geração (s)':>11} {'carga (s)':>10} {'pico (MB)':>10} {'mover (µs)':>11} {'menu (µs)':>10}")
+    for size in args.sizes:
+        data_dir = Path(tempfile.mkdtemp(prefix="casa_mansao_"))
+        try:
+            start = time.perf_counter()
+            MansionGenerator(size, args.seed, args.branching, args.item_density).write(
+                data_dir, shards=args.format == "shards")
+            generation = time.perf_counter() - start
+            load, peak = measure_load(data_dir)
+            move, menu, cache = measure_moves(data_dir, args.moves, args.seed)
+        finally:
+            clear_caches()
+            shutil.rmtree(data_dir)
+        result = {"rooms": size, "generation_s": generation, "load_s": load, "peak_mb": peak / 2 ** 20,
+                  "move_us": move * 1e6, "menu_us": menu * 1e6, "room_cache": cache}
+        results.append(result)
+        print(f"{size:>9} {generation:>11.2f} {load:>10.3f} {result['peak_mb']:>10.1f} "
+              f"{result['move_us']:>11.2f} {result['menu_us']:>10.2f}")
+        if cache:
+            print(f"{'':>9} cache: {cache['hits']} acertos, {cache['misses']} faltas, "
+                  f"{cache['prefetched']} pré-carregadas, {cache['evictions']} descartes, "
+                  f"{cache['resident']} salas residentes")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"seed": args.seed, "format": args.format, "results": results}, indent=2), encoding='utf-8')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Suíte de benchmarks com linhas de base e portão de regressão.
+
+Mede os caminhos que crescem com o conteúdo: inicialização a frio
+(importar main + MainGame()), World.load_from_json em mundos gerados de
+vários tamanhos, CommandSystem.parse, turnos completos de handle_command,
+operações do Inventory e ida e volta save_game/load_game.
+
+Os resultados (segundos por operação, melhor de N rodadas) vão para um JSON
+e são comparados com benchmarks/baselines.json. Como as linhas de base vêm de
+outra máquina, cada arquivo guarda também o tempo de uma carga de calibração
+(Python puro) e a linha de base é escalada pela razão entre as calibrações.
+Um caso mais lento que a linha de base escalada por mais que o limite
+(--threshold) é uma regressão e a execução termina com código 1.
+
+Uso: python benchmarks/suite.py [--quick] [--only parse inventory] [--threshold 0.3] [--update-baseline]
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core import utils
+from core.command_system import CommandSystem
+from core.game_state import GameState
+from core.generator import MansionGenerator
+from core.items import Inventory, Item
+from core.world import World
+from interface.game_interface import GameInterface
+from interface.renderer import FrameRenderer
+
+FORMAT = "casa-bench-1"
+BASELINE = Path(__file__).resolve().parent / "baselines.json"
+RESULTS = Path(__file__).resolve().parent / "results.json"
+WORLD_SIZES = (100, 1000, 10000)
+COMMANDS = ["olhar", "mover norte", "mover sul", "inventario", "exa chave_enferrujada", "peg lanterna", "ajuda"]
+
+# Caso -> função(escala) -> segundos por operação. Escala 1 na execução normal, menor com --quick.
+Case = Callable[[float], float]
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str):
+    """Registra a função decorada como um caso da suíte."""
+    def decorator(func: Case) -> Case:
+        CASES[name] = func
+        return func
+    return decorator
+
+
+def best(func: Callable[[], None], number: int, repeat: int = 5) -> float:
+    """Menor tempo por chamada entre `repeat` rodadas de `number` chamadas."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def calibrate() -> float:
+    """Carga fixa em Python puro: mede a velocidade da máquina/interpretador."""
+    def work():
+        total = 0
+        data = {}
+        for i in range(20000):
+            data[str(i)] = i
+            total += len(str(i)) * (i & 7)
+        return total
+    return best(work, 5, 7)
+
+
+@case("startup_cold")
+def _startup(scale: float) -> float:
+    """Processo novo importando main e construindo MainGame(), descontado o interpretador vazio."""
+    code = "import sys; sys.path.insert(0, {root!r}); from main import MainGame; MainGame()".format(root=str(ROOT))
+    runs = max(3, int(7 * scale))
+
+    def spawn(args: List[str]) -> float:
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, *args], cwd=ROOT, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    return spawn(["-c", code]) - spawn(["-c", "pass"])
+
+
+def _world_case(rooms: int) -> Case:
+    def run(scale: float) -> float:
+        data_dir = Path(tempfile.mkdtemp(prefix="casa_suite_"))
+        try:
+            MansionGenerator(rooms, seed=1).write(data_dir)
+
+            def load():
+                utils.clear_data_cache()
+                World.clear_template_cache()
+                World.load_from_json(data_dir=data_dir)
+            return best(load, max(1, int(2000 * scale) // rooms), 3)
+        finally:
+            utils.clear_data_cache()
+            World.clear_template_cache()
+            shutil.rmtree(data_dir)
+    return run
+
+
+for _rooms in WORLD_SIZES:
+    case(f"world_load_{_rooms}")(_world_case(_rooms))
+
+
+@case("parse")
+def _parse(scale: float) -> float:
+    def run():
+        for cmd in COMMANDS:
+            CommandSystem.parse(cmd)
+    return best(run, max(1, int(20000 * scale))) / len(COMMANDS)
+
+
+@case("handle_command")
+def _handle_command(scale: float) -> float:
+    """Turno completo pela interface (interpretação, despacho, evento aleatório e impressão)."""
+    interface = GameInterface(renderer=FrameRenderer(io.StringIO(), mode='plain'))
+    number = max(1, int(500 * scale))
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(5):
+            interface.set_game(GameState(seed=1))  # mesmo estado inicial a cada rodada
+            start = time.perf_counter()
+            for _ in range(number):
+                for cmd in COMMANDS:
+                    interface.handle_command(cmd)
+            times.append(time.perf_counter() - start)
+    return min(times) / (number * len(COMMANDS))
+
+
+@case("inventory")
+def _inventory(scale: float) -> float:
+    """Adicionar, consultar e remover 1000 itens (por operação)."""
+    items = [Item(name=f"item_{i}", description="") for i in range(1000)]
+
+    def run():
+        inventory = Inventory(limit=len(items))
+        for item in items:
+            inventory.add_item(item)
+        for item in items:
+            inventory.has_item(item.name)
+            inventory.get_item(item.name)
+        for item in items:
+            inventory.remove_item(item.name)
+    return best(run, max(1, int(50 * scale))) / (len(items) * 4)
+
+
+@case("save_roundtrip")
+def _save_roundtrip(scale: float) -> float:
+    """save_game seguido de load_game do mesmo arquivo."""
+    saves_dir = Path(tempfile.mkdtemp(prefix="casa_suite_saves_"))
+    try:
+        game = GameState(seed=1)
+
+        def run():
+            game.save_game("suite.json", saves_dir=saves_dir)
+            GameState.load_game("suite.json", saves_dir=saves_dir)
+        return best(run, max(1, int(200 * scale)))
+    finally:
+        shutil.rmtree(saves_dir)
+
+
+def run_suite(names: List[str], scale: float) -> Dict[str, float]:
+    results = {}
+    for name in names:
+        results[name] = CASES[name](scale)
+        print(f"{name:<20} {results[name] * 1e6:12.2f} µs/op")
+    return results
+
+
+def compare(results: Dict[str, float], calibration: float, baseline: Dict, threshold: float) -> List[str]:
+    """Casos acima da linha de base escalada (vazio se não houver regressões)."""
+    factor = calibration / baseline["calibration"]
+    print(f"\nComparação com a linha de base (máquina {factor:.2f}x a da linha de base, limite +{threshold:.0%}):")
+    regressions = []
+    for name, seconds in results.items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            print(f"{name:<20} {'(sem linha de base)':>24}")
+            continue
+        expected = reference * factor
+        change = seconds / expected - 1
+        status = "REGRESSÃO" if change > threshold else "ok"
+        print(f"{name:<20} {expected * 1e6:12.2f} -> {seconds * 1e6:10.2f} µs/op {change:+7.1%}  {status}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES), metavar="CASO", help="executa só estes casos")
+    parser.add_argument("--quick", action="store_true", help="menos iterações (mais ruído)")
+    parser.add_argument("--threshold", type=float, default=0.3, help="regressão tolerada (fração, padrão 0.3)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--output", type=Path, default=RESULTS)
+    parser.add_argument("--update-baseline", action="store_true", help="grava os resultados como nova linha de base")
+    args = parser.parse_args(argv)
+
+    calibration = calibrate()
+    print(f"calibração: {calibration * 1e3:.2f} ms\n")
+    results = run_suite(args.only or list(CASES), 0.2 if args.quick else 1.0)
+    document = {
+        "format": FORMAT,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "calibration": calibration,
+        "results": results,
+    }
+    args.output.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+    print(f"\nResultados gravados em {args.output}")
+
+    if args.update_baseline:
+        if args.baseline.exists():
+            previous = json.loads(args.baseline.read_text(encoding="utf-8"))
+            # Mantém os casos não executados agora (com --only), na escala desta máquina
+            factor = calibration / previous["calibration"]
+            document["results"] = {**{name: seconds * factor for name, seconds in previous["results"].items()},
+                                   **results}
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+        print(f"Linha de base atualizada em {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"Sem linha de base em {args.baseline}; use --update-baseline para criá-la.")
+        return 0
+    regressions = compare(results, calibration, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regressão(ões): {', '.join(regressions)}")
+        return 1
+    print("\nNenhuma regressão.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
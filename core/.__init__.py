@@ -1,12 +1,31 @@
 # Package initialization
-from .character import Character
-from .game_state import GameState
-from .items import Item, Inventory
-from .world import Room, World
-from .quizzes import QuizSystem
-from .puzzles import PuzzleSystem
-from .colors import GameColors # Adicionado para consistência, embora já importado diretamente
-from .command_system import CommandSystem # Adicionado para consistência
-
-__all__ = ['Character', 'GameState', 'Item', 'Inventory', 'Room', 'World', 
+# Os submódulos são importados só quando um dos nomes abaixo é usado (PEP 562),
+# para que importar o pacote não carregue o jogo inteiro.
+from importlib import import_module
+
+_EXPORTS = {
+    'Character': '.character',
+    'GameState': '.game_state',
+    'Item': '.items', 'Inventory': '.items',
+    'Room': '.world', 'World': '.world',
+    'QuizSystem': '.quizzes',
+    'PuzzleSystem': '.puzzles',
+    'GameColors': '.colors',
+    'CommandSystem': '.command_system',
+}
+
+__all__ = ['Character', 'GameState', 'Item', 'Inventory', 'Room', 'World',
            'QuizSystem', 'PuzzleSystem', 'GameColors', 'CommandSystem']
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,228 @@
+"""
+Sinais sonoros do jogo.
+
+O GameState anota sinais (cues) quando algo acontece: evento aleatório,
+cair da noite, penalidade de quiz. O motor os entrega ao AudioSystem no fim
+do turno. O AudioSystem nunca bloqueia o turno: o backend é criado e os sons
+de sounds/ são decodificados em uma thread de fundo, já na criação (antes de
+serem necessários). Um sinal cujo som ainda não está pronto é tocado assim
+que a decodificação termina, ou descartado se ficar velho demais.
+
+Backends (CASA_AUDIO ou --audio no main.py):
+  - null: descarta tudo (servidores e máquinas sem áudio);
+  - recording: lê os arquivos e registra o que foi tocado (testes e benchmarks);
+  - pygame: toca de verdade com pygame.mixer (dependência opcional);
+  - auto: pygame se estiver disponível, senão null.
+"""
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from core import metrics
+
+SOUNDS_DIR = Path(__file__).parent.parent / "sounds"
+
+# Sinal -> arquivo em sounds/
+CUES: Dict[str, str] = {
+    "random_event": "event.mp3",
+    "nightfall": "monster.mp3",
+    "quiz_penalty": "monster.mp3",
+}
+
+# Segundos que um sinal pode esperar pela decodificação antes de ser descartado
+MAX_DELAY = 0.5
+
+
+class NullBackend:
+    """Sem áudio: nada é decodificado nem tocado."""
+
+    name = "null"
+
+    def decode(self, path: Path) -> Any:
+        return path.name
+
+    def play(self, cue: str, buffer: Any) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class RecordingBackend(NullBackend):
+    """Lê os arquivos (o custo de E/S é real) e registra o que seria tocado."""
+
+    name = "recording"
+
+    def __init__(self):
+        self.played: List[Tuple[str, float]] = []  # (sinal, instante)
+
+    def decode(self, path: Path) -> Any:
+        return path.read_bytes()
+
+    def play(self, cue: str, buffer: Any) -> None:
+        self.played.append((cue, time.perf_counter()))
+
+
+class PygameBackend:
+    """pygame.mixer: decodifica para um Sound em memória; play() não bloqueia."""
+
+    name = "pygame"
+
+    def __init__(self):
+        import pygame  # opcional: pip install pygame
+        pygame.mixer.init()
+        self._mixer = pygame.mixer
+
+    def decode(self, path: Path) -> Any:
+        return self._mixer.Sound(str(path))
+
+    def play(self, cue: str, buffer: Any) -> None:
+        buffer.play()
+
+    def close(self) -> None:
+        self._mixer.quit()
+
+
+BACKENDS = {"null": NullBackend, "recording": RecordingBackend, "pygame": PygameBackend}
+
+
+def create_backend(name: Optional[str] = None):
+    """Cria o backend pedido (padrão: CASA_AUDIO ou 'auto'); 'auto' cai para null sem pygame ou sem dispositivo."""
+    name = name or os.environ.get("CASA_AUDIO", "auto")
+    if name != "auto":
+        return BACKENDS[name]()
+    try:
+        return PygameBackend()
+    except Exception:  # pygame ausente ou sem dispositivo de áudio
+        return NullBackend()
+
+
+class AudioSystem:
+    """
+    Toca sinais sem bloquear: play() só consulta o cache de sons decodificados
+    e, se o som não estiver pronto, deixa o pedido para a thread de fundo.
+    """
+
+    def __init__(self, backend: Union[str, None, Any] = None, sounds_dir: Path = SOUNDS_DIR,
+                 cues: Optional[Dict[str, str]] = None, preload: bool = True, max_delay: float = MAX_DELAY):
+        self.sounds_dir = Path(sounds_dir)
+        self.cues = dict(cues if cues is not None else CUES)
+        self.max_delay = max_delay
+        # Um nome (ou None) cria o backend na thread de fundo: importar o pygame não atrasa o jogo
+        if isinstance(backend, str) or backend is None:
+            self.backend, self._backend_name = None, backend
+        else:
+            self.backend, self._backend_name = backend, None
+        self._buffers: Dict[str, Any] = {}  # arquivo -> som decodificado
+        self._failed: Dict[str, str] = {}   # arquivo -> erro
+        self._queue: 'queue.Queue[Optional[Tuple[str, Optional[str], float]]]' = queue.Queue()
+        self.decodes = 0
+        self.decode_time = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.played = 0
+        self.dropped = 0
+        self.delays: List[float] = []  # espera dos sinais que aguardaram a decodificação
+        self.backend_error: Optional[str] = None
+        self._thread = threading.Thread(target=self._run, name="audio", daemon=True)
+        self._thread.start()
+        if preload:
+            for name in dict.fromkeys(self.cues.values()):
+                self._queue.put((name, None, 0.0))
+
+    def play(self, cue: str) -> bool:
+        """Toca o sinal; retorna True se ele saiu na hora (som já decodificado)."""
+        name = self.cues.get(cue)
+        if name is None or name in self._failed:
+            return False
+        metrics.inc("casa_audio_cues_total", labels=(("cue", cue),))
+        buffer = self._buffers.get(name)
+        if buffer is not None and self.backend is not None:
+            self.hits += 1
+            self._play(cue, buffer)
+            return True
+        self.misses += 1
+        self._queue.put((name, cue, time.perf_counter()))
+        return False
+
+    def play_all(self, cues: List[str]) -> None:
+        for cue in cues:
+            self.play(cue)
+
+    def _play(self, cue: str, buffer: Any) -> None:
+        try:
+            self.backend.play(cue, buffer)
+            self.played += 1
+        except Exception:
+            self.dropped += 1
+
+    def _decode(self, name: str) -> Any:
+        start = time.perf_counter()
+        try:
+            buffer = self.backend.decode(self.sounds_dir / name)
+        except Exception as e:
+            self._failed[name] = str(e)
+            return None
+        elapsed = time.perf_counter() - start
+        self.decodes += 1
+        self.decode_time += elapsed
+        metrics.observe("casa_audio_decode_seconds", elapsed, (("file", name),))
+        self._buffers[name] = buffer
+        return buffer
+
+    def _run(self) -> None:
+        if self.backend is None:
+            try:
+                self.backend = create_backend(self._backend_name)
+            except Exception as e:  # backend pedido indisponível: segue mudo
+                self.backend_error = f"{self._backend_name}: {e}"
+                self.backend = NullBackend()
+        while True:
+            request = self._queue.get()
+            try:
+                if request is None:
+                    break
+                name, cue, requested = request
+                buffer = self._buffers.get(name)
+                if buffer is None and name not in self._failed:
+                    buffer = self._decode(name)
+                if cue is None:
+                    continue
+                delay = time.perf_counter() - requested
+                if buffer is None or delay > self.max_delay:
+                    self.dropped += 1
+                else:
+                    self.delays.append(delay)
+                    self._play(cue, buffer)
+            finally:
+                self._queue.task_done()
+
+    def wait(self) -> None:
+        """Espera a fila de fundo esvaziar (pré-carga e sinais pendentes)."""
+        self._queue.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Tempos de decodificação e uso do cache."""
+        return {
+            "backend": getattr(self.backend, "name", None),
+            "backend_error": self.backend_error,
+            "cached": len(self._buffers),
+            "failed": dict(self._failed),
+            "decodes": self.decodes,
+            "decode_ms": self.decode_time * 1000,
+            "decode_avg_ms": self.decode_time / self.decodes * 1000 if self.decodes else 0.0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "played": self.played,
+            "dropped": self.dropped,
+            "max_delay_ms": max(self.delays) * 1000 if self.delays else 0.0,
+        }
+
+    def close(self, timeout: Optional[float] = 2.0) -> None:
+        """Encerra a thread de fundo e libera o backend."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+        if self.backend is not None:
+            self.backend.close()
@@ -1,7 +1,7 @@
-from dataclasses import dataclass
+from typing import NamedTuple
 
-@dataclass
-class Character:
+# NamedTuple em vez de dataclass: dataclasses importa inspect/ast e pesa na inicialização
+class Character(NamedTuple):
     name: str
     description: str
     dialog: str
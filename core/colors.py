@@ -1,6 +1,20 @@
 from colorama import Fore, Back, Style, init
 
-init(autoreset=True)
+_output_ready = False
+
+
+def init_output() -> None:
+    """
+    Inicializa o colorama (cores no Windows, autoreset e remoção dos códigos
+    quando a saída não é um terminal). Feito pelos pontos de entrada antes da
+    primeira saída, e não na importação: quem só importa o motor (roteiros,
+    benchmarks) não paga esse custo. Pode ser chamada várias vezes.
+    """
+    global _output_ready
+    if not _output_ready:
+        init(autoreset=True)
+        _output_ready = True
+
 
 class GameColors:
     """Configurações de cores para o jogo"""
@@ -1,43 +1,138 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
 from colorama import Style
 from core.colors import GameColors as C
+from core.metrics import timed
+
+class VerbTrie:
+    """
+    Árvore de prefixos sobre os verbos conhecidos.
+    Permite abreviações ("exa", "peg") desde que o prefixo leve a uma única ação.
+    """
+
+    def __init__(self, verbs: Dict[str, str]):
+        # Cada nó: (filhos, ações alcançáveis a partir do nó)
+        self._root: Tuple[Dict[str, tuple], Set[str]] = ({}, set())
+        for verb, action in verbs.items():
+            self.insert(verb, action)
+
+    def insert(self, verb: str, action: str) -> None:
+        node = self._root
+        node[1].add(action)
+        for char in verb:
+            node = node[0].setdefault(char, ({}, set()))
+            node[1].add(action)
+
+    def resolve(self, prefix: str) -> Optional[str]:
+        """Retorna a ação do prefixo, ou None se ele for desconhecido ou ambíguo."""
+        node = self._root
+        for char in prefix:
+            node = node[0].get(char)
+            if node is None:
+                return None
+        actions = node[1]
+        if len(actions) == 1:
+            return next(iter(actions))
+        return None
 
 class CommandSystem:
     """Sistema avançado de interpretação de comandos"""
-    
+
     VERBS = {
         'mover': 'move', 'ir': 'move', 'andar': 'move', 'navegar': 'move',
         'inspecionar': 'examine', 'examinar': 'examine',
         'ver': 'look', 'olhar': 'look',
         'pegar': 'take', 'coletar': 'take',
         'usar': 'use',
+        'resolver': 'solve',
+        'responder': 'answer',
         'combinar': 'combine', 'juntar': 'combine',
         'inventario': 'inventory', 'inv': 'inventory',
         'sair': 'quit', 'terminar': 'quit',
+        'desfazer': 'undo', 'refazer': 'redo',
         'ajuda': 'help'
     }
 
+    # Como os argumentos de cada ação são interpretados: None (sem argumentos),
+    # 'target' (resto da linha) ou 'items' (dois itens). Ações novas usam 'target'.
+    ARGUMENTS = {
+        'inventory': None, 'quit': None, 'help': None,
+        'move': 'target', 'examine': 'target', 'look': 'target', 'take': 'target', 'use': 'target',
+        'solve': 'target', 'answer': 'target', 'undo': 'target', 'redo': 'target',
+        'combine': 'items'
+    }
+
+    SEPARATOR = ';'
+    CACHE_SIZE = 4096
+
+    _trie = VerbTrie(VERBS)
+
+    @classmethod
+    def add_verb(cls, verb: str, action: str, arguments: Optional[str] = 'target') -> None:
+        """Registra um novo verbo (e, se necessário, o formato dos argumentos da ação)."""
+        cls.VERBS[verb] = action
+        cls.ARGUMENTS.setdefault(action, arguments)
+        cls._trie.insert(verb, action)
+        cls._parse_cached.cache_clear()
+
+    @classmethod
+    def resolve_verb(cls, word: str) -> Optional[str]:
+        action = cls.VERBS.get(word)
+        if action is None:
+            action = cls._trie.resolve(word)
+        return action
+
     @staticmethod
-    def parse(cmd):
-        """Interpreta o comando do jogador"""
-        cmd = cmd.lower().strip()
-        if not cmd:
-            return None
-            
+    @lru_cache(maxsize=CACHE_SIZE)
+    @timed("casa_parse_seconds")
+    def _parse_cached(cmd: str) -> Optional[dict]:
+        """
+        Interpreta um comando já normalizado; o resultado fica em cache e não deve
+        ser alterado. Só as faltas do cache entram em casa_parse_seconds.
+        """
         parts = cmd.split()
-        action = CommandSystem.VERBS.get(parts[0])
-        
+        if not parts:
+            return None
+        action = CommandSystem.resolve_verb(parts[0])
+
         if not action:
             return {'action': 'unknown', 'original': cmd}
-            
-        if action in {'inventory', 'quit', 'help'}:
+
+        arguments = CommandSystem.ARGUMENTS.get(action, 'target')
+        if arguments is None:
             return {'action': action}
-        
-        elif action in {'move', 'examine', 'look', 'take', 'use'}:
+
+        elif arguments == 'target':
             if len(parts) > 1:
                 return {'action': action, 'target': ' '.join(parts[1:])}
-            
-        elif action == 'combine':
+
+        elif arguments == 'items':
             if len(parts) >= 3:
                 return {'action': action, 'items': [parts[1], parts[2]]}
-                
-        return {'action': action, 'target': None} # Retorna o comando mesmo sem target
\ No newline at end of file
+
+        return {'action': action, 'target': None} # Retorna o comando mesmo sem target
+
+    @staticmethod
+    def parse(cmd):
+        """Interpreta o comando do jogador"""
+        parsed = CommandSystem._parse_cached(cmd.lower().strip())
+        if parsed is None:
+            return None
+        # Cópia rasa: quem recebe pode alterar o dicionário sem estragar o cache
+        parsed = parsed.copy()
+        if 'items' in parsed:
+            parsed['items'] = list(parsed['items'])
+        return parsed
+
+    @staticmethod
+    def split_line(line) -> List[str]:
+        """Separa uma linha com vários comandos (';') nos comandos individuais"""
+        if CommandSystem.SEPARATOR not in line:
+            return [line]
+        return [cmd.strip() for cmd in line.split(CommandSystem.SEPARATOR) if cmd.strip()] or [line]
+
+    @staticmethod
+    def cache_info():
+        """Estatísticas do cache de comandos interpretados"""
+        return CommandSystem._parse_cached.cache_info()
+
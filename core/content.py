@@ -0,0 +1,207 @@
+"""
+Registro central do conteúdo do jogo.
+
+Constrói, em uma única passada, índices por id para salas, quizzes, puzzles
+e itens, e valida todas as referências cruzadas entre eles. Todos os
+problemas encontrados são reportados de uma vez.
+
+Uso: python -m core.content   (lista erros e avisos do conteúdo em data/)
+"""
+from collections import deque
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from core.effects import spec_errors
+from core.matcher import Matcher, Solution
+from core.utils import DATA_DIR, load_json_data
+from core.world_stream import has_shards
+
+
+# Mundo vazio compartilhado (mundos em shards), para que a chave do cache de load() seja estável
+_NO_ROOMS: Dict[str, Any] = {}
+
+
+class ContentError(Exception):
+    """Conteúdo inválido; `errors` traz a lista completa de problemas."""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("Conteúdo inválido:\n  " + "\n  ".join(errors))
+        self.errors = errors
+
+
+class ContentRegistry:
+    """Índices O(1) por id e validação de referências do conteúdo carregado."""
+
+    _cache: Dict[tuple, 'ContentRegistry'] = {}
+
+    def __init__(self, world: Dict[str, Any], quizzes: List[Dict[str, Any]], puzzles: List[Dict[str, Any]],
+                 start_room: Optional[str] = None):
+        self.rooms: Dict[str, Dict[str, Any]] = world or {}
+        self.quizzes: Dict[str, Dict[str, Any]] = {}
+        self.puzzles: Dict[str, Dict[str, Any]] = {}
+        # item -> lista de origens ("sala:x", "quiz:y", "puzzle:z")
+        self.items: Dict[str, List[str]] = {}
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+        self.start_room = start_room
+        self._sources = (world, quizzes, puzzles)  # mantém vivos os objetos usados como chave do cache
+        self._option_matchers: Dict[str, Matcher] = {}
+
+        self._index_entries("quiz", quizzes or [], self.quizzes)
+        self._index_entries("puzzle", puzzles or [], self.puzzles)
+        for room_id, room in self.rooms.items():
+            for item in room.get('items', []):
+                self.items.setdefault(item, []).append(f"sala:{room_id}")
+        self._validate()
+
+    def _index_entries(self, kind: str, entries: List[Dict[str, Any]], index: Dict[str, Dict[str, Any]]) -> None:
+        for position, entry in enumerate(entries):
+            entry_id = entry.get('id') if isinstance(entry, dict) else None
+            if entry_id is None:
+                self.errors.append(f"{kind} #{position}: sem 'id'")
+                continue
+            if entry_id in index:
+                self.errors.append(f"{kind} '{entry_id}': id duplicado")
+                continue
+            index[entry_id] = entry
+            reward = entry.get('reward_item')
+            if reward:
+                self.items.setdefault(reward, []).append(f"{kind}:{entry_id}")
+
+    def _validate(self) -> None:
+        errors = self.errors
+        for quiz_id, quiz in self.quizzes.items():
+            options = quiz.get('options') or []
+            if not isinstance(quiz.get('correct'), int) or not 0 <= quiz['correct'] < len(options):
+                errors.append(f"quiz '{quiz_id}': resposta correta fora das opções")
+
+        for kind, index in (("quiz", self.quizzes), ("puzzle", self.puzzles)):
+            for entry_id, entry in index.items():
+                for error in spec_errors(entry.get('reward_effect')):
+                    errors.append(f"{kind} '{entry_id}': {error}")
+        for quiz_id, quiz in self.quizzes.items():
+            for error in spec_errors(quiz.get('penalty')):
+                errors.append(f"quiz '{quiz_id}': penalidade com {error}")
+
+        placed_puzzles = set()
+        for room_id, room in self.rooms.items():
+            for direction, target in room.get('connections', {}).items():
+                if target not in self.rooms:
+                    errors.append(f"sala '{room_id}': conexão '{direction}' aponta para sala inexistente '{target}'")
+            quiz_id = room.get('quiz_id')
+            if quiz_id and quiz_id not in self.quizzes:
+                errors.append(f"sala '{room_id}': quiz desconhecido '{quiz_id}'")
+            puzzle_id = room.get('puzzle_id')
+            if puzzle_id:
+                if puzzle_id not in self.puzzles:
+                    errors.append(f"sala '{room_id}': puzzle desconhecido '{puzzle_id}'")
+                else:
+                    placed_puzzles.add(puzzle_id)
+
+        for puzzle_id, puzzle in self.puzzles.items():
+            target = puzzle.get('unlocks')
+            if target and target not in self.rooms:
+                message = f"puzzle '{puzzle_id}': desbloqueia sala inexistente '{target}'"
+                # Um puzzle que não está em nenhuma sala ainda não pode ser resolvido
+                (errors if puzzle_id in placed_puzzles else self.warnings).append(message)
+            if puzzle_id not in placed_puzzles:
+                self.warnings.append(f"puzzle '{puzzle_id}': não está em nenhuma sala")
+
+        if self.start_room is not None:
+            if self.start_room not in self.rooms:
+                errors.append(f"sala inicial '{self.start_room}' não existe")
+            else:
+                for room_id in self.unreachable_rooms():
+                    errors.append(f"sala '{room_id}': inalcançável a partir de '{self.start_room}'")
+
+    def neighbours(self, room_id: str) -> List[str]:
+        """Salas alcançáveis a partir de uma sala, incluindo as que um puzzle dela desbloqueia."""
+        room = self.rooms[room_id]
+        targets = list(room.get('connections', {}).values())
+        puzzle = self.puzzles.get(room.get('puzzle_id'))
+        if puzzle and puzzle.get('unlocks') in self.rooms:
+            targets.append(puzzle['unlocks'])
+        return targets
+
+    def unreachable_rooms(self) -> List[str]:
+        """Salas que não podem ser alcançadas a partir da sala inicial (BFS linear)."""
+        seen = {self.start_room}
+        queue = deque([self.start_room])
+        while queue:
+            for target in self.neighbours(queue.popleft()):
+                if target in self.rooms and target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        return [room_id for room_id in self.rooms if room_id not in seen]
+
+    def get_quiz(self, quiz_id: str) -> Optional[Dict[str, Any]]:
+        return self.quizzes.get(quiz_id)
+
+    def get_puzzle(self, puzzle_id: str) -> Optional[Dict[str, Any]]:
+        return self.puzzles.get(puzzle_id)
+
+    def item_sources(self, item_name: str) -> List[str]:
+        return self.items.get(item_name, [])
+
+    @cached_property
+    def item_matcher(self) -> Matcher:
+        """Nomes de todos os itens do conteúdo, normalizados uma vez e compartilhados pelas sessões."""
+        return Matcher(self.items)
+
+    def option_matcher(self, quiz_id: str) -> Optional[Matcher]:
+        """Opções do quiz normalizadas (montadas no primeiro uso e guardadas)."""
+        matcher = self._option_matchers.get(quiz_id)
+        if matcher is None and quiz_id in self.quizzes:
+            matcher = self._option_matchers[quiz_id] = Matcher(self.quizzes[quiz_id].get('options') or [])
+        return matcher
+
+    @cached_property
+    def solutions(self) -> Dict[str, Solution]:
+        """Soluções dos puzzles pré-normalizadas, por id."""
+        return {puzzle_id: Solution(puzzle['solution']) for puzzle_id, puzzle in self.puzzles.items()
+                if puzzle.get('solution') is not None}
+
+    @classmethod
+    def load(cls, start_room: Optional[str] = None, strict: bool = False,
+             data_dir: Optional[Path] = None) -> 'ContentRegistry':
+        """
+        Retorna o registro do conteúdo em data/, reconstruindo-o só quando os arquivos mudam.
+        Erros são impressos todos de uma vez; com strict=True, levanta ContentError.
+        Mundos em shards não são carregados aqui: as salas são validadas quando os shards são gravados.
+        """
+        if has_shards(Path(data_dir) if data_dir is not None else DATA_DIR):
+            world, start_room = _NO_ROOMS, None
+        else:
+            world = load_json_data("world.json", data_dir=data_dir)
+        quizzes = load_json_data("quizzes.json", data_dir=data_dir)
+        puzzles = load_json_data("puzzles.json", data_dir=data_dir)
+        # load_json_data devolve o mesmo objeto enquanto o arquivo não muda
+        key = (id(world), id(quizzes), id(puzzles), start_room)
+        registry = cls._cache.get(key)
+        if registry is None:
+            registry = cls(world, quizzes, puzzles, start_room)
+            # Descarta registros de versões anteriores dos arquivos
+            for old_key in [k for k in cls._cache if k[:3] != key[:3]]:
+                del cls._cache[old_key]
+            cls._cache[key] = registry
+            if registry.errors:
+                from core.colors import GameColors as C
+                print(f"{C.DANGER}Foram encontrados {len(registry.errors)} erro(s) no conteúdo:{C.RESET}")
+                for error in registry.errors:
+                    print(f"{C.DANGER}  - {error}{C.RESET}")
+        if strict and registry.errors:
+            raise ContentError(registry.errors)
+        return registry
+
+
+if __name__ == "__main__":
+    import sys
+    from core.colors import init_output
+    from core.game_state import GAME_CONFIG
+    init_output()
+    registry = ContentRegistry.load(GAME_CONFIG["start_room"])
+    for warning in registry.warnings:
+        print(f"aviso: {warning}")
+    print(f"{len(registry.rooms)} salas, {len(registry.quizzes)} quizzes, {len(registry.puzzles)} puzzles, "
+          f"{len(registry.items)} itens; {len(registry.errors)} erro(s), {len(registry.warnings)} aviso(s)")
+    sys.exit(1 if registry.errors else 0)
@@ -0,0 +1,169 @@
+"""
+Pacote de conteúdo pré-compilado.
+
+Compila todos os arquivos JSON de `data/` em um único arquivo binário
+(`data/content.pack`) com strings internadas, para que a inicialização não
+precise interpretar JSON. Formato:
+
+    CAPK | versão do formato (u16) | versão do marshal (u16) | Python major/minor (u8, u8)
+    | tamanho do índice (u32) | índice | seções
+
+O índice (marshal) mapeia cada arquivo para (offset, tamanho, mtime_ns,
+tamanho da fonte, sha1 da fonte). Cada seção é um objeto marshal
+independente, lido sob demanda a partir de um mmap, então só os arquivos
+usados são decodificados.
+
+Uso: python -m core.content_pack   (ou python main.py --build-pack)
+"""
+import json
+import marshal
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from core.utils import PACK_NAME
+
+MAGIC = b"CAPK"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHBBI")
+
+# Tipo esperado na raiz de cada arquivo conhecido
+_EXPECTED_ROOT = {
+    "world.json": dict,
+    "quizzes.json": list,
+    "puzzles.json": list,
+    "config.json": dict,
+    "events.json": dict,
+}
+
+
+class ContentPackError(Exception):
+    """Erro ao compilar ou ler o pacote de conteúdo."""
+
+
+def _intern(value: Any) -> Any:
+    """Interna recursivamente todas as strings (chaves e valores) de um documento JSON."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {sys.intern(k): _intern(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_intern(v) for v in value]
+    return value
+
+
+def _validate(file_name: str, document: Any) -> List[str]:
+    errors = []
+    expected = _EXPECTED_ROOT.get(file_name)
+    if expected is not None and not isinstance(document, expected):
+        errors.append(f"{file_name}: raiz deveria ser {expected.__name__}, é {type(document).__name__}")
+    elif file_name in ("quizzes.json", "puzzles.json"):
+        for index, entry in enumerate(document):
+            if not isinstance(entry, dict) or "id" not in entry:
+                errors.append(f"{file_name}[{index}]: entrada sem 'id'")
+    elif file_name == "world.json":
+        for room_id, room in document.items():
+            if not isinstance(room, dict) or "name" not in room:
+                errors.append(f"{file_name}:{room_id}: sala sem 'name'")
+    return errors
+
+
+def _sha1(path: Path) -> bytes:
+    import hashlib  # só na compilação e na verificação do pacote, fora do caminho da inicialização
+    return hashlib.sha1(path.read_bytes()).digest()
+
+
+def build_pack(data_dir: Path, output: Optional[Path] = None) -> Path:
+    """
+    Compila todos os *.json de `data_dir` em um pacote binário.
+    Levanta ContentPackError com todos os problemas encontrados.
+    """
+    data_dir = Path(data_dir)
+    output = Path(output) if output else data_dir / PACK_NAME
+
+    sections: List[Tuple[str, bytes, Any]] = []
+    errors = []
+    for path in sorted(data_dir.glob("*.json")):
+        try:
+            document = json.loads(path.read_text(encoding='utf-8'))
+        except json.JSONDecodeError as e:
+            errors.append(f"{path.name}: JSON inválido ({e})")
+            continue
+        errors.extend(_validate(path.name, document))
+        stat = path.stat()
+        sections.append((path.name, marshal.dumps(_intern(document)), (stat.st_mtime_ns, stat.st_size, _sha1(path))))
+
+    documents = {name: marshal.loads(blob) for name, blob, _ in sections}
+    if not errors and {"world.json", "quizzes.json", "puzzles.json"} <= documents.keys():
+        from core.content import ContentRegistry
+        errors.extend(ContentRegistry(documents["world.json"], documents["quizzes.json"],
+                                      documents["puzzles.json"]).errors)
+
+    if errors:
+        raise ContentPackError("Conteúdo inválido:\n  " + "\n  ".join(errors))
+
+    # Os offsets dependem do tamanho do índice, que depende dos offsets: calcula em duas passadas
+    index: Dict[str, tuple] = {}
+    for _ in range(2):
+        offset = _HEADER.size + len(marshal.dumps(index))
+        new_index = {}
+        for name, blob, (mtime_ns, size, digest) in sections:
+            new_index[name] = (offset, len(blob), mtime_ns, size, digest)
+            offset += len(blob)
+        index = new_index
+    index_blob = marshal.dumps(index)
+
+    tmp = output.with_suffix(output.suffix + ".tmp")
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, marshal.version, *sys.version_info[:2], len(index_blob)))
+        f.write(index_blob)
+        for _, blob, _ in sections:
+            f.write(blob)
+    tmp.replace(output)
+    return output
+
+
+class ContentPack:
+    """Leitor de um pacote de conteúdo via mmap; cada seção é decodificada só quando pedida."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, marshal_version, major, minor, index_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ContentPackError(f"{self.path}: formato de pacote desconhecido")
+        if marshal_version != marshal.version or (major, minor) != sys.version_info[:2]:
+            raise ContentPackError(f"{self.path}: compilado por outra versão do Python")
+        self.index = marshal.loads(self._mm[_HEADER.size:_HEADER.size + index_len])
+
+    def is_fresh(self, file_name: str, source: Path) -> bool:
+        """Confere se a seção corresponde ao arquivo-fonte (mtime/tamanho; em dúvida, sha1)."""
+        entry = self.index.get(file_name)
+        if entry is None:
+            return False
+        _, _, mtime_ns, size, digest = entry
+        try:
+            stat = source.stat()
+        except FileNotFoundError:
+            return True  # Só o pacote foi distribuído
+        if stat.st_size != size:
+            return False
+        return stat.st_mtime_ns == mtime_ns or _sha1(source) == digest
+
+    def load(self, file_name: str) -> Any:
+        offset, length, _, _, _ = self.index[file_name]
+        return marshal.loads(self._mm[offset:offset + length])
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+if __name__ == "__main__":
+    from core.utils import DATA_DIR
+    try:
+        print(f"Pacote gerado em {build_pack(DATA_DIR)}")
+    except ContentPackError as e:
+        print(e)
+        sys.exit(1)
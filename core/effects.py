@@ -0,0 +1,183 @@
+"""
+Efeitos compilados.
+
+Todo efeito citado no conteúdo (recompensas e penalidades de quizzes,
+recompensas de puzzles, efeitos de eventos e de itens) é compilado uma vez,
+na carga, em um Effect: listas de operações prontas para executar (variação
+de atributos já com o limite do GAME_CONFIG, itens concedidos, passagens
+desbloqueadas e flags). Efeitos desconhecidos são rejeitados na carga, não
+no meio da partida.
+
+Um efeito pode ser:
+  - um nome simbólico (ver SYMBOLIC_EFFECTS), ex.: "reduce_fear";
+  - um dicionário de variações de atributos, ex.: {"fear": 15, "sanity": -5}.
+"""
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from core import rules
+from core.items import Item
+
+# Nome simbólico -> operações primitivas: ("stat", atributo, variação) ou ("flag", nome, valor)
+SYMBOLIC_EFFECTS: Dict[str, Tuple[Tuple[str, str, Any], ...]] = {
+    "reduce_fear": (("stat", "fear", -20),),
+    "unlock_secret_room": (("flag", "secret_room_unlocked", True),),
+    "reveal_secret": (("flag", "secret_revealed", True),),
+    "unlock_new_area": (("flag", "new_area_unlocked", True),),
+    "reveal_map": (("flag", "map_revealed", True),),
+}
+
+
+class EffectError(ValueError):
+    """Efeitos inválidos encontrados ao compilar o conteúdo."""
+
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__(f"{len(errors)} efeito(s) inválido(s): " + "; ".join(errors))
+
+
+def spec_errors(spec: Any) -> List[str]:
+    """Problemas de um efeito (vazio se ele for válido)."""
+    if spec is None:
+        return []
+    if isinstance(spec, str):
+        return [] if spec in SYMBOLIC_EFFECTS else [f"efeito desconhecido '{spec}'"]
+    if isinstance(spec, Mapping):
+        errors = [f"atributo desconhecido '{stat}'" for stat in spec if stat not in rules.STAT_LIMITS]
+        errors += [f"variação de '{stat}' não é um número" for stat, delta in spec.items()
+                   if stat in rules.STAT_LIMITS and not isinstance(delta, (int, float))]
+        return errors
+    return [f"efeito em formato inválido: {spec!r}"]
+
+
+class Effect:
+    """Operações de um efeito, já validadas e resolvidas."""
+
+    __slots__ = ('source', 'stats', 'grants', 'unlocks', 'flags')
+
+    def __init__(self, source: str, stats: Tuple[Tuple[str, int, int], ...] = (),
+                 grants: Tuple[Tuple[str, str], ...] = (), unlocks: Tuple[Tuple[str, str], ...] = (),
+                 flags: Tuple[Tuple[str, Any], ...] = ()):
+        self.source = source
+        self.stats = stats      # (atributo, variação, máximo)
+        self.grants = grants    # (item, descrição)
+        self.unlocks = unlocks  # (sala, direção)
+        self.flags = flags      # (flag, valor)
+
+    def __bool__(self) -> bool:
+        return bool(self.stats or self.grants or self.unlocks or self.flags)
+
+    def __repr__(self) -> str:
+        return f"<Effect {self.source}>"
+
+    def apply(self, game) -> Dict[str, Any]:
+        """Executa o efeito sobre um GameState; retorna o que aconteceu (itens, passagens)."""
+        for stat, delta, limit in self.stats:
+            # Mesmo resultado de rules.clamp, sem o teste de array (caminho quente)
+            value = getattr(game, stat) + delta
+            setattr(game, stat, 0 if value < 0 else limit if value > limit else value)
+        result: Dict[str, Any] = {}
+        if not (self.grants or self.unlocks or self.flags):
+            return result
+        for name, description in self.grants:
+            result['item'] = name
+            result['item_added'] = game.inventory.add_item(Item(name=name, description=description))
+        for target, direction in self.unlocks:
+            result['unlocks'] = target
+            result['direction'] = direction
+            result['unlocked'] = game.world.unlock(game.current_room, direction, target) if game.world else False
+        for flag, value in self.flags:
+            game.set_flag(flag, value)
+        return result
+
+
+def compile_effect(spec: Any, config: Mapping[str, Any], source: str = "efeito",
+                   grant: Optional[Tuple[str, str]] = None, unlock: Optional[Tuple[str, str]] = None) -> Effect:
+    """
+    Compila um efeito (nome simbólico ou dicionário de atributos), com o item e a
+    passagem da recompensa, se houver. Levanta EffectError se o efeito for inválido.
+    """
+    errors = spec_errors(spec)
+    if errors:
+        raise EffectError([f"{source}: {error}" for error in errors])
+    if isinstance(spec, str):
+        ops = SYMBOLIC_EFFECTS[spec]
+    elif spec:
+        ops = tuple(("stat", stat, delta) for stat, delta in spec.items())
+    else:
+        ops = ()
+    stats = tuple((key, value, config[rules.STAT_LIMITS[key]]) for kind, key, value in ops if kind == "stat")
+    flags = tuple((key, value) for kind, key, value in ops if kind == "flag")
+    return Effect(source, stats, (grant,) if grant else (), (unlock,) if unlock else (), flags)
+
+
+# Efeitos avulsos (itens, apply_effects) guardados já compilados por biblioteca
+MAX_COMPILED = 1024
+
+
+class EffectLibrary:
+    """Todos os efeitos do conteúdo, compilados na carga e indexados por (tipo, id)."""
+
+    _cache: Dict[tuple, 'EffectLibrary'] = {}
+
+    def __init__(self, registry, events, config: Mapping[str, Any]):
+        self.config = config
+        self._sources = (registry, events)  # mantém vivos os objetos usados como chave do cache
+        self.effects: Dict[Tuple[str, str], Effect] = {}
+        self._compiled: Dict[tuple, Effect] = {}
+        errors: List[str] = []
+
+        def add(key: Tuple[str, str], spec: Any, **extra) -> None:
+            try:
+                self.effects[key] = compile_effect(spec, config, ":".join(key), **extra)
+            except EffectError as e:
+                errors.extend(e.errors)
+
+        for quiz_id, quiz in registry.quizzes.items():
+            reward = quiz.get('reward_item')
+            add(("quiz", quiz_id), quiz.get('reward_effect'),
+                grant=(reward, f"Recompensa do desafio '{quiz_id}'.") if reward else None)
+            penalty = quiz.get('penalty') or {}
+            unknown = [stat for stat in penalty if stat not in rules.PENALTY_SIGNS]
+            if unknown:
+                errors.append(f"quiz:{quiz_id}:penalty: atributo desconhecido {unknown}")
+            else:
+                add(("penalty", quiz_id), rules.penalty_effects(penalty))
+        for puzzle_id, puzzle in registry.puzzles.items():
+            reward = puzzle.get('reward_item')
+            target = puzzle.get('unlocks')
+            add(("puzzle", puzzle_id), puzzle.get('reward_effect'),
+                grant=(reward, f"Recompensa de '{puzzle.get('name', puzzle_id)}'.") if reward else None,
+                unlock=(target, puzzle.get('direction', target)) if target else None)
+        for event in events.events:
+            add(("event", event['id']), event.get('effect', {}))
+        if errors:
+            raise EffectError(errors)
+
+    def get(self, kind: str, entry_id: str) -> Optional[Effect]:
+        return self.effects.get((kind, entry_id))
+
+    def compile(self, spec: Any, source: str = "efeito") -> Effect:
+        """
+        Efeito avulso (ex.: Item.effects) compilado com os limites desta biblioteca.
+        Cada especificação é compilada uma vez; as seguintes vêm do cache.
+        """
+        try:
+            key = (source, spec if isinstance(spec, str) or spec is None else tuple(spec.items()))
+            effect = self._compiled.get(key)
+        except (AttributeError, TypeError):  # formato inválido: compile_effect explica o erro
+            return compile_effect(spec, self.config, source)
+        if effect is None:
+            if len(self._compiled) >= MAX_COMPILED:
+                self._compiled.clear()
+            effect = self._compiled[key] = compile_effect(spec, self.config, source)
+        return effect
+
+    @classmethod
+    def load(cls, registry, events, config: Mapping[str, Any]) -> 'EffectLibrary':
+        """Biblioteca do conteúdo carregado, compilada uma vez por versão dos arquivos."""
+        key = (id(registry), id(events), tuple(sorted(config.items())))
+        library = cls._cache.get(key)
+        if library is None:
+            library = cls(registry, events, config)
+            cls._cache.clear()
+            cls._cache[key] = library
+        return library
@@ -0,0 +1,502 @@
+from functools import lru_cache
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Any
+from core.game_state import GameState
+from core.command_system import CommandSystem
+from core.history import HISTORY_LIMIT, History
+from core.colors import GameColors as C
+from core import metrics
+from core.items import Item
+from core.utils import strip_ansi
+
+
+# Tabela de despacho: ação -> função(engine, comando interpretado) -> continua rodando?
+Handler = Callable[['GameEngine', Dict[str, Any]], bool]
+HANDLERS: Dict[str, Handler] = {}
+
+# Ações que navegam no histórico: não viram turnos do histórico nem sorteiam eventos
+HISTORY_ACTIONS = frozenset({'undo', 'redo'})
+
+
+@lru_cache(maxsize=None)
+def _action_labels(action: Optional[str]) -> metrics.Labels:
+    return (("action", action or "invalid"),)
+
+
+def handles(*actions: str):
+    """Registra a função decorada como tratador das ações indicadas."""
+    def decorator(func: Handler) -> Handler:
+        for action in actions:
+            HANDLERS[action] = func
+        return func
+    return decorator
+
+
+# Resultados como NamedTuple (e não dataclass) para não pesar na inicialização a frio
+class TurnResult(NamedTuple):
+    """Resultado estruturado de um turno executado pelo motor"""
+    command: str
+    action: Optional[str]
+    messages: List[str]
+    room_before: str
+    room_after: str
+    stats: Dict[str, Any]
+    running: bool = True
+    ending: Optional[str] = None
+    cues: Tuple[str, ...] = ()  # sinais sonoros do turno (core.audio)
+    outcome: Optional[Dict[str, Any]] = None  # quiz ou enigma tentado: {"kind", "id", "ok"}
+
+    @property
+    def text(self) -> str:
+        """Saída do turno sem códigos de cor"""
+        return strip_ansi("\n".join(self.messages))
+
+
+class ReplayResult(NamedTuple):
+    """Resultado da execução de um roteiro completo de comandos"""
+    name: str
+    turns: List[TurnResult]
+    seed: Optional[int] = None
+
+    @property
+    def ending(self) -> Optional[str]:
+        return self.turns[-1].ending if self.turns else None
+
+    def transcript(self) -> str:
+        """Transcrição legível (sem cores) do roteiro: comando seguido da resposta"""
+        lines = [f"# semente: {self.seed}"] if self.seed is not None else []
+        for turn in self.turns:
+            lines.append(f"> {turn.command}")
+            if turn.messages:
+                lines.append(turn.text)
+        return "\n".join(lines)
+
+
+class GameEngine:
+    """
+    Motor de jogo sem interface (headless).
+    Interpreta comandos sobre um GameState e devolve as mensagens em vez de
+    imprimi-las, permitindo reproduzir roteiros em lote sem bloquear em input().
+
+    Cada ação é tratada por uma função registrada em HANDLERS; novos verbos
+    entram com CommandSystem.add_verb + GameEngine.register, sem mexer no motor.
+
+    Depois de cada ação, o GameState pode sortear um evento aleatório
+    (data/events.json) com o gerador da própria sessão: a mesma semente e os
+    mesmos comandos reproduzem a partida exatamente.
+
+    Os turnos entram no histórico da sessão (core.history), que atende
+    'desfazer' e 'refazer' e só monta snapshots a partir do primeiro desfazer;
+    fork() cria outra sessão a partir do estado atual em tempo constante (ex.:
+    bots explorando ramos da partida).
+    """
+
+    handlers = HANDLERS
+
+    def __init__(self, game: Optional[GameState] = None, seed: Optional[int] = None, audio=None,
+                 telemetry=None, source: str = "local", history_limit: Optional[int] = HISTORY_LIMIT):
+        self.game = game if game is not None else GameState(seed=seed)
+        # core.audio.AudioSystem que toca os sinais de cada turno (None: sem som)
+        self.audio = audio
+        self.commands = CommandSystem()
+        self.running = self.game.world is not None
+        self._out: List[str] = []
+        self._outcome: Optional[Dict[str, Any]] = None
+        # core.telemetry.TelemetryWriter que recebe um evento por turno (None: sem telemetria)
+        self.telemetry = telemetry
+        self.session_id: Optional[str] = None
+        if telemetry is not None and self.running:
+            self.session_id = telemetry.start_session(self.game.seed, self.game.current_room, self._stats(), source)
+        # Latência por ação e contadores desta sessão (o processo todo fica em metrics.REGISTRY)
+        self.metrics = metrics.MetricsRegistry()
+        self._latency: Dict[Optional[str], metrics.Latency] = {}
+        # Estados anteriores para desfazer (history_limit=0: sem histórico)
+        self.history_limit = history_limit
+        self.history = History(self.game, history_limit, self._replayer) if self.running and history_limit != 0 else None
+
+    @staticmethod
+    def register(*actions: str):
+        """Decorador para registrar o tratador de uma ação nova (ou substituir um existente)."""
+        return handles(*actions)
+
+    def _say(self, message: str) -> None:
+        self._out.append(message)
+
+    def _stats(self) -> Dict[str, Any]:
+        return {
+            "health": self.game.health,
+            "fear": self.game.fear,
+            "sanity": self.game.sanity,
+            "game_time": self.game.game_time,
+            "is_night": self.game.is_night,
+        }
+
+    def _play(self, cmd: str) -> Optional[str]:
+        """Aplica um comando ao estado (tratador, evento aleatório, histórico); retorna a ação."""
+        parsed = self.commands.parse(cmd)
+        self.running = self._dispatch(parsed)
+        action = parsed.get('action') if parsed else None
+        if self.running and parsed and action not in HISTORY_ACTIONS:
+            self._random_event(action)
+            if self.history is not None:
+                self.history.record(cmd)
+        return action
+
+    @staticmethod
+    def _replayer(game: GameState) -> Callable[[str], Any]:
+        """Executor de turnos sobre outro estado, sem som, telemetria nem métricas (History.activate)."""
+        return GameEngine(game, history_limit=0)._play
+
+    def execute(self, cmd: str) -> TurnResult:
+        """Executa um comando e retorna o resultado estruturado do turno"""
+        start = perf_counter()
+        self._out = []
+        self._outcome = None
+        room_before = self.game.current_room
+        action = self._play(cmd)
+        cues = self.game.take_cues()
+        if cues and self.audio is not None:
+            self.audio.play_all(cues)
+        result = TurnResult(
+            command=cmd,
+            action=action,
+            messages=self._out,
+            room_before=room_before,
+            room_after=self.game.current_room,
+            stats=self._stats(),
+            running=self.running,
+            ending=self.game.check_ending_conditions(),
+            cues=tuple(cues),
+            outcome=self._outcome,
+        )
+        elapsed = perf_counter() - start
+        latency = self._latency.get(action)
+        if latency is None:
+            latency = self._latency[action] = metrics.Latency("casa_command_seconds", _action_labels(action),
+                                                              self.metrics)
+        latency.observe(elapsed)
+        if self.session_id is not None:
+            self.telemetry.record(self.session_id, result, elapsed)
+            if result.ending or not result.running:
+                self.close("final:" + result.ending if result.ending else "quit")
+        return result
+
+    def close(self, reason: str = "closed") -> None:
+        """Encerra a sessão de telemetria (se houver uma aberta); chamadas seguintes não fazem nada."""
+        if self.session_id is not None:
+            self.telemetry.end_session(self.session_id, reason)
+            self.session_id = None
+
+    def fork(self, telemetry=None, source: str = "fork") -> 'GameEngine':
+        """
+        Outra sessão no estado atual desta (GameState.fork, tempo constante), sem
+        som e com o histórico vazio: os turnos de um ramo não afetam o outro.
+        """
+        return GameEngine(self.game.fork(), telemetry=telemetry, source=source, history_limit=self.history_limit)
+
+    def execute_line(self, line: str) -> List[TurnResult]:
+        """Executa uma linha com um ou mais comandos separados por ';' (um turno por comando)"""
+        results = []
+        for cmd in self.commands.split_line(line):
+            result = self.execute(cmd)
+            results.append(result)
+            if not result.running or result.ending:
+                break
+        return results
+
+    def replay(self, commands: Iterable[str], name: str = "<roteiro>") -> ReplayResult:
+        """
+        Executa uma sequência de comandos até o fim, um 'sair' ou um final de jogo.
+        Linhas vazias e comentários (#) são ignorados.
+        """
+        result = ReplayResult(name=name, turns=[], seed=self.game.seed)
+        for line in commands:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            turns = self.execute_line(line)
+            result.turns.extend(turns)
+            if not turns[-1].running or turns[-1].ending:
+                break
+        return result
+
+    def _random_event(self, action: str) -> None:
+        event_desc = self.game.trigger_random_event(action)
+        if event_desc:
+            self._say(f"{C.FEAR}Você sente uma presença fria por perto...")
+            self._say(f"{C.WARNING}{event_desc}{C.RESET}")
+
+    def _dispatch(self, parsed: Optional[Dict[str, Any]]) -> bool:
+        if not parsed:
+            self._say(f"\n{C.WARNING}Comando inválido. Tente 'ajuda' para ver os comandos disponíveis.{C.RESET}")
+            return True
+        handler = self.handlers.get(parsed['action'], _unknown)
+        return handler(self, parsed)
+
+
+def _unknown(engine: GameEngine, parsed: Dict[str, Any]) -> bool:
+    engine._say(f"{C.WARNING}Comando '{parsed.get('action')}' não reconhecido. Tente 'ajuda'.{C.RESET}")
+    return True
+
+
+@handles('move')
+def _move(engine: GameEngine, parsed: Dict[str, Any]) -> bool:
+    target = parsed.get('target')
+    if target and target.startswith('para '):
+        return _travel(engine, target[len('para '):])
+    if engine.game.move_to_room(target):
+        engine._say(f"\nVocê se move para o {target}.")
+    else:
+        engine._say(f"{C.WARNING}Não é possível ir para lá!{C.RESET}")
+    return True
+
+
+def _travel(engine: GameEngine, destination: str) -> bool:
+    game = engine.game
+    path = game.travel_to(destination)
+    if path is None:
+        engine._say(f"{C.WARNING}Você não conhece um caminho até '{destination}'.{C.RESET}")
+    elif not path:
+        engine._say(f"{C.INFO}Você já está em {game.get_current_room_data().name}.{C.RESET}")
+    else:
+        steps = ", ".join(path)
+        engine._say(f"\nVocê caminha até {game.get_current_room_data().name} ({len(path)} passo(s): {steps}).")
+    return True
+
+
+@handles('look')
+def _look(engine: GameEngine, parsed: Dict[str, Any]) -> bool:
+    engine._say("\nVocê olha ao redor e percebe que as sombras dançam na periferia de sua visão.")
+    return True
+
+
+def _find_item(engine: GameEngine, target: str, present: List[str]) -> Optional[str]:
+    """Item presente que corresponde ao alvo digitado (sem acentos, '_' ou erros de digitação)."""
+    return engine.game.content.item_matcher.resolve(target, present)
+
+
+def _did_you_mean(engine: GameEngine, target: str, present: List[str]) -> str:
+    """Sugestão para um alvo não encontrado ("" se nenhuma); só calculada quando a falha é mostrada."""
+    suggestions = engine.game.content.item_matcher.suggest(target, allowed=present)
+    if not suggestions:
+        return ""
+    return " Você quis dizer " + " ou ".join(f"'{option}'" for option in suggestions) + "?"
+
+
+@handles('examine')
+def _examine(engine: GameEngine, parsed: Dict[str, Any]) -> bool:
+    target = parsed.get('target')
+    if not target:
+        engine._say(f"{C.WARNING}O que você quer examinar? Por favor, especifique um item ou objeto.{C.RESET}")
+        return True
+    current_room = engine.game.get_current_room_data()
+    name = _find_item(engine, target, [item.name for item in engine.game.inventory])
+    item_in_inventory = engine.game.inventory.get_item(name) if name else None
+    room_item = _find_item(engine, target, current_room.items) if not item_in_inventory else None
+    if item_in_inventory:
+        engine._say(f"\n{C.INFO}Você examina o {item_in_inventory.name}. {item_in_inventory.description}{C.RESET}")
+    elif room_item:
+        engine._say(f"\n{C.INFO}Você examina o {room_item}. É um item comum.{C.RESET}")
+    else:
+        hint = _did_you_mean(engine, target, current_room.items)
+        engine._say(f"{C.WARNING}Não há {target} para examinar aqui.{hint}{C.RESET}")
+    return True
+
+
+@handles('take')
+def _take(engine: GameEngine, parsed: Dict[str, Any]) -> bool:
+    target = parsed.get('target')
+    if not target:
+        engine._say(f"{C.WARNING}O que você quer pegar? Por favor, especifique um item.{C.RESET}")
+        return True
+    game = engine.game
+    current_room = game.get_current_room_data()
+    name = _find_item(engine, target, current_room.items)
+    if name:
+        if game.inventory.add_item(Item(name=name, description=f"A {name} que você pegou.")):
+            game.world.take_item(game.current_room, name)
+            engine._say(f"{C.SUCCESS}Você pegou a {name} e a colocou no seu inventário.{C.RESET}")
+        else:
+            engine._say(f"{C.WARNING}O seu inventário está cheio. Não pode pegar a {name}.{C.RESET}")
+    else:
+        hint = _did_you_mean(engine, target, current_room.items)
+        engine._say(f"{C.WARNING}Não há {target} aqui para pegar.{hint}{C.RESET}")
+    return True
+
+
+@handles('use')
+def _use(engine: GameEngine, parsed: Dict[str, Any]) -> bool:
+    target = parsed.get('target')
+    game = engine.game
+    carried = [item.name for item in game.inventory]
+    name = _find_item(engine, target, carried) if target else None
+    item = game.inventory.get_item(name) if name else None
+    if not target:
+        engine._say(f"{C.WARNING}O que você quer usar? Por favor, especifique um item.{C.RESET}")
+    elif item is None:
+        hint = _did_you_mean(engine, target, carried)
+        engine._say(f"{C.WARNING}Você não tem {target} no seu inventário.{hint}{C.RESET}")
+    elif item.effects:
+        # Itens com efeitos são consumidos ao usar
+        game.effects.compile(item.effects, f"item:{item.name}").apply(game)
+        game.inventory.remove_item(item.name)
+        engine._say(f"{C.SUCCESS}{item.use_message or f'Você usou o {item.name}.'}{C.RESET}")
+    else:
+        engine._say(f"{C.INFO}Você tentou usar o {item.name}, mas nada aconteceu... ainda.{C.RESET}")
+    return True
+
+
+@handles('solve')
+def _solve(engine: GameEngine, parsed: Dict[str, Any]) -> bool:
+    game = engine.game
+    room = game.get_current_room_data()
+    puzzle = game.puzzle_system.get_puzzle(room.puzzle_id) if room.puzzle_id else None
+    target = parsed.get('target')
+    if not puzzle:
+        engine._say(f"{C.WARNING}Não há nenhum enigma aqui.{C.RESET}")
+    elif puzzle['id'] in game.completed_events:
+        engine._say(f"{C.INFO}Você já resolveu este enigma.{C.RESET}")
+    elif not target:
+        engine._say(f"\n{C.TITLE}{puzzle['name']}{C.RESET}")
+        engine._say(f"{C.DESCRIPTION}{puzzle['description']}{C.RESET}")
+        engine._say(f"{C.INFO}Dica: {puzzle['hint']}{C.RESET}")
+    elif game.puzzle_system.check_solution(puzzle['id'], target):
+        engine._outcome = {"kind": "puzzle", "id": puzzle['id'], "ok": True}
+        reward = game.complete_puzzle(puzzle['id'])
+        engine._say(f"{C.SUCCESS}Você resolveu o enigma!{C.RESET}")
+        if reward.get('item_added'):
+            engine._say(f"{C.SUCCESS}Você recebeu: {reward['item']}.{C.RESET}")
+        if reward.get('unlocked'):
+            engine._say(f"{C.SUCCESS}Uma passagem se abre ({reward['direction']}).{C.RESET}")
+    elif game.puzzle_system.is_partial(puzzle['id'], target):
+        engine._outcome = {"kind": "puzzle", "id": puzzle['id'], "ok": False, "partial": True}
+        parts = game.puzzle_system.solution_parts(puzzle['id'])
+        engine._say(f"{C.INFO}Isso é só parte da resposta: diga as {parts} partes, na ordem, "
+                    f"separadas por vírgulas.{C.RESET}")
+    else:
+        engine._outcome = {"kind": "puzzle", "id": puzzle['id'], "ok": False}
+        engine._say(f"{C.WARNING}Nada acontece. Essa não parece ser a resposta.{C.RESET}")
+    return True
+
+
+@handles('answer')
+def _answer(engine: GameEngine, parsed: Dict[str, Any]) -> bool:
+    game = engine.game
+    room = game.get_current_room_data()
+    quiz = game.quiz_system.get_quiz(room.quiz_id) if room.quiz_id else None
+    target = parsed.get('target')
+    if not quiz:
+        engine._say(f"{C.WARNING}Não há nenhuma pergunta aqui.{C.RESET}")
+        return True
+    if quiz['id'] in game.completed_events:
+        engine._say(f"{C.INFO}Você já respondeu a esta pergunta.{C.RESET}")
+        return True
+    options = quiz['options']
+    if not target:
+        engine._say(f"\n{C.TITLE}{quiz['question']}{C.RESET}")
+        for number, option in enumerate(options, 1):
+            engine._say(f"  {number}. {option}")
+        engine._say(f"{C.INFO}Responda com 'responder [número]'.{C.RESET}")
+        return True
+    # Aceita o número da opção ou o próprio texto; um texto que não é opção não conta como erro
+    index = game.quiz_system.option_index(quiz['id'], target)
+    if not 0 <= index < len(options):
+        engine._say(f"{C.WARNING}'{target}' não é uma das opções. Responda com o número ou o texto "
+                    f"de uma delas ({', '.join(options)}).{C.RESET}")
+        return True
+    result = game.answer_quiz(quiz['id'], index)
+    engine._outcome = {"kind": "quiz", "id": quiz['id'], "ok": result['correct']}
+    if result['correct']:
+        engine._say(f"{C.SUCCESS}Resposta correta!{C.RESET}")
+        if result.get('item_added'):
+            engine._say(f"{C.SUCCESS}Você recebeu: {result['item']}.{C.RESET}")
+    else:
+        engine._say(f"{C.DANGER}Resposta errada. A casa reage à sua falha...{C.RESET}")
+    return True
+
+
+@handles('combine')
+def _combine(engine: GameEngine, parsed: Dict[str, Any]) -> bool:
+    engine._say(f"{C.INFO}A funcionalidade de combinar itens ainda não está disponível.{C.RESET}")
+    return True
+
+
+@handles('inventory')
+def _inventory(engine: GameEngine, parsed: Dict[str, Any]) -> bool:
+    inventory = engine.game.inventory
+    if len(inventory):
+        engine._say(f"\n{C.ITEM}Seu inventário:")
+        for item in inventory:
+            count = inventory.count(item.name)
+            engine._say(f" - {item.name}" + (f" (x{count})" if count > 1 else ""))
+    else:
+        engine._say("\nSeu inventário está vazio.")
+    return True
+
+
+@handles('quit')
+def _quit(engine: GameEngine, parsed: Dict[str, Any]) -> bool:
+    return False
+
+
+def _history_steps(engine: GameEngine, parsed: Dict[str, Any], verb: str) -> Optional[int]:
+    """Quantos passos pedir ao histórico ('desfazer', 'desfazer 3'); None se não der."""
+    if engine.history is None:
+        engine._say(f"{C.WARNING}Não é possível {verb} nesta sessão.{C.RESET}")
+        return None
+    target = parsed.get('target')
+    if target is None:
+        return 1
+    if not target.isdigit() or int(target) < 1:
+        engine._say(f"{C.WARNING}Use '{verb}' ou '{verb} [número de ações]'.{C.RESET}")
+        return None
+    return int(target)
+
+
+def _after_history(engine: GameEngine, done: int, verb: str) -> None:
+    room = engine.game.get_current_room_data()
+    where = f" Você está em {room.name}." if room is not None else ""
+    engine._say(f"\n{C.INFO}O tempo se dobra: {done} ação(ões) {verb}(s).{where}{C.RESET}")
+
+
+@handles('undo')
+def _undo(engine: GameEngine, parsed: Dict[str, Any]) -> bool:
+    steps = _history_steps(engine, parsed, 'desfazer')
+    if steps is not None:
+        done = engine.history.undo(steps)
+        if done:
+            _after_history(engine, done, 'desfeita')
+        else:
+            engine._say(f"{C.WARNING}Não há nada para desfazer.{C.RESET}")
+    return True
+
+
+@handles('redo')
+def _redo(engine: GameEngine, parsed: Dict[str, Any]) -> bool:
+    steps = _history_steps(engine, parsed, 'refazer')
+    if steps is not None:
+        done = engine.history.redo(steps)
+        if done:
+            _after_history(engine, done, 'refeita')
+        else:
+            engine._say(f"{C.WARNING}Não há nada para refazer.{C.RESET}")
+    return True
+
+
+@handles('help')
+def _help(engine: GameEngine, parsed: Dict[str, Any]) -> bool:
+    engine._say(f"\n{C.INFO}Comandos disponíveis:{C.RESET}")
+    engine._say(f"- {C.BRIGHT}mover [direção]{C.NORMAL} (ex: 'mover norte' para mudar de sala)")
+    engine._say(f"- {C.BRIGHT}ir para [sala]{C.NORMAL} (ex: 'ir para biblioteca' para viajar pelo caminho mais curto)")
+    engine._say(f"- {C.BRIGHT}olhar{C.NORMAL} (para inspecionar a sala)")
+    engine._say(f"- {C.BRIGHT}examinar [item]{C.NORMAL} (ex: 'examinar chave')")
+    engine._say(f"- {C.BRIGHT}pegar [item]{C.NORMAL} (ex: 'pegar chave' para adicionar ao inventário)")
+    engine._say(f"- {C.BRIGHT}usar [item]{C.NORMAL} (para usar um item do inventário)")
+    engine._say(f"- {C.BRIGHT}resolver [resposta]{C.NORMAL} (para ver ou responder o enigma da sala; partes em ordem separadas por vírgulas)")
+    engine._say(f"- {C.BRIGHT}responder [número]{C.NORMAL} (para ver ou responder a pergunta da sala)")
+    engine._say(f"- {C.BRIGHT}inventario{C.NORMAL} (para ver o que você tem)")
+    engine._say(f"- {C.BRIGHT}desfazer [n]{C.NORMAL} / {C.BRIGHT}refazer [n]{C.NORMAL} (volta ou avança uma ou n ações)")
+    engine._say(f"- {C.BRIGHT}combinar [item1] com [item2]{C.NORMAL} (placeholder)")
+    engine._say(f"- {C.BRIGHT}sair{C.NORMAL} (para fechar o jogo)")
+    engine._say(f"Verbos podem ser abreviados (ex: 'exa', 'peg') e vários comandos separados por ';'.")
+    return True
@@ -0,0 +1,157 @@
+"""
+Eventos aleatórios definidos em data/events.json.
+
+    {
+      "triggers": {"look": 1.0, "move": 0.5},      ação -> multiplicador da chance
+      "events": [
+        {"id": ..., "desc": ..., "weight": 3, "effect": {"fear": 15},
+         "triggers": ["look"],                          (padrão: ["look"])
+         "conditions": {"rooms": [...], "night": true, "min_fear": 40, "max_fear": 80}}
+      ]
+    }
+
+A cada ação listada em "triggers" um evento acontece com chance
+medo/100 x multiplicador. O evento é sorteado entre os elegíveis naquele
+momento (ação, sala, noite, faixa de medo) pelo método alias: as tabelas de
+cada combinação são montadas na carga e cada sorteio custa O(1).
+"""
+from bisect import bisect_right
+from random import Random
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from core.effects import spec_errors
+from core.utils import load_json_data
+
+DEFAULT_TRIGGERS = ("look",)
+
+
+class AliasTable:
+    """Amostragem ponderada em O(1) (método alias de Vose)."""
+
+    __slots__ = ('values', 'weights', '_prob', '_alias')
+
+    def __init__(self, values: List[Any], weights: List[float]):
+        n = len(values)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        self.values = values
+        self.weights = weights
+        self._prob = [1.0] * n
+        self._alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # O que sobra (erros de arredondamento) fica com probabilidade 1
+
+    def sample(self, rng: Random) -> Any:
+        i = int(rng.random() * len(self.values))
+        return self.values[i] if rng.random() < self._prob[i] else self.values[self._alias[i]]
+
+
+class EventTable:
+    """Eventos carregados e suas tabelas de sorteio por condição."""
+
+    _cache: Dict[int, 'EventTable'] = {}
+
+    def __init__(self, data: Optional[Dict[str, Any]]):
+        data = data or {}
+        self.errors: List[str] = []
+        self.triggers: Dict[str, float] = dict(data.get("triggers", {action: 1.0 for action in DEFAULT_TRIGGERS}))
+        self.events: List[Dict[str, Any]] = []
+        for position, event in enumerate(data.get("events", [])):
+            error = self._check(position, event)
+            if error:
+                self.errors.append(error)
+            else:
+                self.events.append(event)
+        self._source = data  # mantém vivo o objeto usado como chave do cache
+
+        # Salas citadas em alguma condição; as demais compartilham a tabela "sem sala"
+        self._rooms = {room for event in self.events for room in event.get("conditions", {}).get("rooms", ())}
+        # Limites das faixas de medo: dentro de uma faixa os eventos elegíveis não mudam
+        bounds = set()
+        for event in self.events:
+            conditions = event.get("conditions", {})
+            if "min_fear" in conditions:
+                bounds.add(conditions["min_fear"])
+            if "max_fear" in conditions:
+                bounds.add(conditions["max_fear"] + 1)
+        self.fear_bounds = sorted(bounds)
+
+        # (ação, sala ou None, noite, faixa de medo) -> AliasTable (ausente se nada for elegível)
+        self._tables: Dict[Tuple[str, Optional[str], bool, int], AliasTable] = {}
+        bands = [(lower, index) for index, lower in enumerate([0] + self.fear_bounds)]
+        for trigger in self.triggers:
+            for room in [None, *sorted(self._rooms)]:
+                for night in (False, True):
+                    for fear, band in bands:
+                        eligible = [e for e in self.events if self._eligible(e, trigger, room, night, fear)]
+                        if eligible:
+                            self._tables[(trigger, room, night, band)] = AliasTable(
+                                eligible, [e.get("weight", 1) for e in eligible])
+
+    @staticmethod
+    def _check(position: int, event: Any) -> Optional[str]:
+        if not isinstance(event, dict) or not event.get("id") or not event.get("desc"):
+            return f"evento #{position}: precisa de 'id' e 'desc'"
+        if not isinstance(event.get("weight", 1), (int, float)) or event.get("weight", 1) <= 0:
+            return f"evento '{event['id']}': peso deve ser positivo"
+        errors = spec_errors(event.get("effect", {}))
+        if errors:
+            return f"evento '{event['id']}': " + "; ".join(errors)
+        return None
+
+    @staticmethod
+    def _eligible(event: Dict[str, Any], trigger: str, room: Optional[str], night: bool, fear: int) -> bool:
+        if trigger not in event.get("triggers", DEFAULT_TRIGGERS):
+            return False
+        conditions = event.get("conditions", {})
+        if "rooms" in conditions and room not in conditions["rooms"]:
+            return False
+        if "night" in conditions and conditions["night"] != night:
+            return False
+        if fear < conditions.get("min_fear", fear) or fear > conditions.get("max_fear", fear):
+            return False
+        return True
+
+    def pick(self, rng: Random, trigger: str, room: str, night: bool, fear: int) -> Optional[Dict[str, Any]]:
+        """Sorteia se algum evento acontece nesta ação e qual; None se nada acontecer."""
+        chance = self.triggers.get(trigger)
+        if not chance or rng.random() * 100 >= fear * chance:
+            return None
+        table = self.table(trigger, room, night, bisect_right(self.fear_bounds, fear))
+        return table.sample(rng) if table is not None else None
+
+    @property
+    def rooms(self) -> List[str]:
+        """Salas citadas em condições de eventos; as demais usam as tabelas sem sala (room=None)."""
+        return sorted(self._rooms)
+
+    def table(self, trigger: str, room: Optional[str], night: bool, band: int) -> Optional[AliasTable]:
+        """Tabela de sorteio de uma combinação; `band` é a posição do medo em fear_bounds (bisect_right)."""
+        return self._tables.get((trigger, room if room in self._rooms else None, night, band))
+
+    @classmethod
+    def load(cls, data_dir=None) -> 'EventTable':
+        """
+        Tabela de events.json, reconstruída só quando o arquivo muda. Diretórios de
+        dados sem events.json (ex.: mansões geradas) usam os eventos de data/.
+        """
+        if data_dir is not None and not (Path(data_dir) / "events.json").exists():
+            data_dir = None
+        data = load_json_data("events.json", data_dir=data_dir)
+        table = cls._cache.get(id(data))
+        if table is None:
+            table = cls(data)
+            cls._cache.clear()
+            cls._cache[id(data)] = table
+            if table.errors:
+                from core.colors import GameColors as C
+                for error in table.errors:
+                    print(f"{C.DANGER}  - {error}{C.RESET}")
+        return table
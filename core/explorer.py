@@ -0,0 +1,532 @@
+"""
+Explorador do espaço de estados do jogo.
+
+Enumera em largura (BFS) os estados alcançáveis a partir do início da partida,
+executando os comandos de verdade (GameEngine e seus tratadores) a partir de
+cada estado: mover por cada passagem, pegar cada item, resolver o enigma da
+sala com a resposta certa e responder cada opção do quiz. Os estados são
+deduplicados por um hash compacto (8 bytes de blake2b sobre a chave do estado,
+estável entre processos) e cada nível da BFS é dividido em lotes processados
+por um pool de processos.
+
+A chave do estado é (sala, inventário, flags, quizzes e enigmas concluídos).
+Os itens do jogo não têm efeito nenhum (pegar e as recompensas criam itens
+simples), então por padrão o inventário entra na chave só como o número de
+pilhas ocupadas: estados que diferem apenas em *quais* itens foram pegos se
+comportam igual. Com exact_items=True entram os nomes e as salas alteradas.
+Saúde, medo e tempo ficam fora da chave e os eventos aleatórios ficam
+desligados: o explorador verifica o conteúdo, não a sorte.
+
+Relata:
+  - conteúdo inalcançável: salas, enigmas (e as salas que desbloqueiam),
+    quizzes e itens que nenhum estado alcançou. O que também está fora do
+    fecho estático a partir do início é inalcançável com certeza; o resto é
+    'não encontrado' se a exploração parou no limite de estados;
+  - becos sem saída: o inventário cheio (não há como largar itens), as
+    recompensas perdidas por falta de espaço e as passagens sem volta. Se a
+    exploração terminou, também os estados dos quais alguma sala ou desafio já
+    alcançado deixa de ser alcançável;
+  - a menor sequência de comandos encontrada até cada final de
+    GameState.check_ending_conditions. Errar um quiz não muda a chave, então
+    a resposta errada é repetida até a derrota.
+
+As sequências usam ';' entre comandos e podem ser reproduzidas com --batch.
+
+Uso: python -m core.explorer [--data-dir DIR] [--workers 4] [--max-states 1000000] [--max-depth N] [--exact-items] [--json saida.json]
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from core.engine import GameEngine
+from core.game_state import GameState
+from core.items import Inventory, Item
+
+DEFAULT_MAX_STATES = 1_000_000
+CHUNK_SIZE = 256    # estados por tarefa enviada a um processo
+DRAIN_LIMIT = 100   # repetições de uma resposta errada procurando a derrota
+TRAP_BUDGET = 50_000_000  # objetivos x transições da análise exata de armadilhas
+EXAMPLES = 5        # exemplos por categoria no relatório
+
+
+class Node(NamedTuple):
+    """Estado compacto (e serializável) de uma sessão, trocado entre os processos."""
+    room: str
+    inventory: Tuple[Tuple[str, int], ...]
+    completed: Tuple[str, ...]
+    flags: Tuple[Tuple[str, Any], ...]
+    rooms: Tuple[Tuple[str, Tuple[str, ...], Tuple[Tuple[str, str], ...]], ...]  # salas alteradas
+    stats: Tuple[int, int, int, int, bool]  # saúde, medo, sanidade, tempo, noite
+
+
+# Transição calculada por um processo:
+# (estado de origem, comando, estado novo, hash, final, recompensa perdida, repetições até a derrota)
+Transition = Tuple[int, str, Node, int, Optional[str], Optional[str], int]
+
+
+class _ExplorerEngine(GameEngine):
+    """Motor sem eventos aleatórios: os turnos dependem só do estado e do comando."""
+
+    def _random_event(self, action: str) -> None:
+        pass
+
+
+class Expander:
+    """Executa os comandos possíveis a partir de estados (um por processo do pool)."""
+
+    def __init__(self, data_dir: Optional[str] = None, exact_items: bool = False):
+        self.game = GameState(data_dir=data_dir, seed=0)
+        if self.game.world is None:
+            raise RuntimeError("Não foi possível carregar o mundo a explorar.")
+        self.engine = _ExplorerEngine(self.game, history_limit=0)
+        self.exact_items = exact_items
+        self.blank = self.game.snapshot()
+        content = self.game.content
+        self.rewards = {entry_id: entry.get('reward_item')
+                        for index in (content.quizzes, content.puzzles) for entry_id, entry in index.items()}
+        self.answers = {puzzle_id: ", ".join(puzzle['solution']) if isinstance(puzzle['solution'], list)
+                        else str(puzzle['solution'])
+                        for puzzle_id, puzzle in content.puzzles.items() if puzzle.get('solution') is not None}
+
+    def encode(self) -> Node:
+        game = self.game
+        inventory = game.inventory
+        rooms = game.world.export_overlay()
+        return Node(
+            game.current_room,
+            tuple(sorted((item.name, inventory.count(item.name)) for item in inventory)),
+            tuple(sorted(game.completed_events)),
+            tuple(sorted(game.flags.items())),
+            tuple(sorted((room_id, tuple(room["items"]), tuple(sorted(room["connections"].items())))
+                         for room_id, room in rooms.items())),
+            (game.health, game.fear, game.sanity, game.game_time, game.is_night),
+        )
+
+    def load(self, node: Node) -> None:
+        game = self.game
+        game.restore(self.blank)
+        game.current_room = node.room
+        game.health, game.fear, game.sanity, game.game_time, game.is_night = node.stats
+        game.inventory.restore({Inventory._key(name): (Item(name=name, description=f"A {name} que você pegou."), count)
+                                for name, count in node.inventory})
+        game.completed_events = list(node.completed)
+        game.flags = dict(node.flags)
+        if node.rooms:
+            game.world.apply_overlay({room_id: {"items": list(items), "connections": dict(connections)}
+                                      for room_id, items, connections in node.rooms})
+
+    def key(self, node: Node) -> int:
+        """Hash compacto do estado (o mesmo em qualquer processo, ao contrário de hash())."""
+        if self.exact_items:
+            parts = (node.room, node.inventory, node.completed, node.flags, node.rooms)
+        else:
+            parts = (node.room, len(node.inventory), node.completed, node.flags)
+        return int.from_bytes(hashlib.blake2b(repr(parts).encode(), digest_size=8).digest(), "little")
+
+    def actions(self) -> List[str]:
+        """Comandos que podem mudar o estado na sala atual."""
+        game = self.game
+        room = game.get_current_room_data()
+        if room is None:
+            return []
+        commands = [f"mover {direction}" for direction in room.connections]
+        commands += [f"pegar {item}" for item in dict.fromkeys(room.items)]
+        if room.puzzle_id and room.puzzle_id not in game.completed_events and room.puzzle_id in self.answers:
+            commands.append(f"resolver {self.answers[room.puzzle_id]}")
+        quiz = game.content.quizzes.get(room.quiz_id) if room.quiz_id else None
+        if quiz and room.quiz_id not in game.completed_events:
+            commands += [f"responder {number}" for number in range(1, len(quiz.get('options') or []) + 1)]
+        return commands
+
+    def expand(self, batch: Iterable[Tuple[int, Node]]) -> List[Transition]:
+        game, engine = self.game, self.engine
+        transitions = []
+        for index, node in batch:
+            self.load(node)
+            start = game.snapshot()
+            parent_key = self.key(node)
+            for cmd in self.actions():
+                game.restore(start)
+                result = engine.execute(cmd)
+                successor = self.encode()
+                key = self.key(successor)
+                lost = None
+                outcome = result.outcome
+                if outcome and outcome["ok"]:
+                    reward = self.rewards.get(outcome["id"])
+                    if reward and reward not in game.inventory:
+                        lost = reward
+                ending, drain = result.ending, 0
+                if key == parent_key and not ending and outcome and not outcome["ok"]:
+                    drain, ending = self._drain(cmd)
+                if key != parent_key or ending or lost:
+                    transitions.append((index, cmd, successor, key, ending, lost, drain))
+        return transitions
+
+    def _drain(self, cmd: str) -> Tuple[int, Optional[str]]:
+        """Repete uma resposta errada: (repetições a mais, final alcançado) ou (0, None)."""
+        game = self.game
+        for repeat in range(1, DRAIN_LIMIT + 1):
+            before = (game.health, game.sanity)
+            result = self.engine.execute(cmd)
+            if result.ending:
+                return repeat, result.ending
+            if (game.health, game.sanity) == before:
+                break
+        return 0, None
+
+
+_EXPANDER: Optional[Expander] = None
+
+
+def _init_worker(data_dir: Optional[str], exact_items: bool) -> None:
+    global _EXPANDER
+    _EXPANDER = Expander(data_dir, exact_items)
+
+
+def _expand_task(batch: List[Tuple[int, Node]]) -> List[Transition]:
+    return _EXPANDER.expand(batch)
+
+
+def _content_map(game: GameState) -> Dict[str, Any]:
+    """Salas (também em mundos em shards), passagens e desafios, para as análises estáticas."""
+    world = game.world
+    rooms = {room_id: world.get_room(room_id) for room_id, _, _ in world.iter_links()}
+    content = game.content
+    puzzles = content.puzzles
+    quizzes = content.quizzes
+    placed = {room.puzzle_id: room_id for room_id, room in rooms.items() if room.puzzle_id in puzzles}
+    quiz_rooms = {room.quiz_id: room_id for room_id, room in rooms.items() if room.quiz_id in quizzes}
+    # Passagens: as do mundo e as que cada enigma abre (a partir da sala onde ele está)
+    edges = [(room_id, direction, target) for room_id, room in rooms.items()
+             for direction, target in room.connections.items()]
+    for puzzle_id, room_id in placed.items():
+        target = puzzles[puzzle_id].get('unlocks')
+        if target in rooms:
+            edges.append((room_id, puzzles[puzzle_id].get('direction', target), target))
+    return {"rooms": rooms, "puzzle_rooms": placed, "quiz_rooms": quiz_rooms, "edges": edges}
+
+
+def _static_closure(start: str, content: Dict[str, Any]) -> Set[str]:
+    """Salas alcançáveis supondo todos os enigmas resolvidos (fecho que contém qualquer partida)."""
+    neighbours: Dict[str, List[str]] = {}
+    for room_id, _, target in content["edges"]:
+        neighbours.setdefault(room_id, []).append(target)
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        for target in neighbours.get(queue.popleft(), ()):
+            if target in content["rooms"] and target not in seen:
+                seen.add(target)
+                queue.append(target)
+    return seen
+
+
+def _one_way(content: Dict[str, Any], closure: Set[str]) -> List[Tuple[str, str, str]]:
+    """Passagens sem nenhuma volta direta, entre salas alcançáveis."""
+    linked = {(room_id, target) for room_id, _, target in content["edges"]}
+    return [(room_id, direction, target) for room_id, direction, target in content["edges"]
+            if room_id in closure and target in closure and (target, room_id) not in linked]
+
+
+class _Graph:
+    """Estados descobertos: pai e comando de cada um (para refazer os caminhos) e as transições."""
+
+    def __init__(self):
+        self.parents = array('l', [-1])
+        self.commands = array('l', [-1])
+        self._command_ids: Dict[str, int] = {}
+        self.command_list: List[str] = []
+        self.sources = array('l')
+        self.targets = array('l')
+
+    def add(self, parent: int, cmd: str) -> int:
+        command = self._command_ids.get(cmd)
+        if command is None:
+            command = self._command_ids[cmd] = len(self.command_list)
+            self.command_list.append(cmd)
+        self.parents.append(parent)
+        self.commands.append(command)
+        return len(self.parents) - 1
+
+    def path(self, index: int) -> List[str]:
+        commands = []
+        while index > 0:
+            commands.append(self.command_list[self.commands[index]])
+            index = self.parents[index]
+        commands.reverse()
+        return commands
+
+
+def _traps(graph: _Graph, goals: Dict[str, List[int]], states: int) -> Dict[str, Tuple[int, int]]:
+    """
+    Análise exata (exploração completa): para cada objetivo, os estados que não
+    alcançam mais nenhum estado em que ele está cumprido. Retorna
+    objetivo -> (número de estados presos, primeiro deles na BFS).
+    """
+    reverse: List[List[int]] = [[] for _ in range(states)]
+    for source, target in zip(graph.sources, graph.targets):
+        reverse[target].append(source)
+    traps = {}
+    for goal, satisfied in goals.items():
+        reached = bytearray(states)
+        queue = deque(satisfied)
+        for index in satisfied:
+            reached[index] = 1
+        while queue:
+            for source in reverse[queue.popleft()]:
+                if not reached[source]:
+                    reached[source] = 1
+                    queue.append(source)
+        stuck = states - sum(reached)
+        if stuck:
+            traps[goal] = (stuck, reached.index(0))
+    return traps
+
+
+def _ending_path(graph: _Graph, witness: Optional[Tuple[int, int, str, int]]) -> Optional[Dict[str, Any]]:
+    if witness is None:
+        return None
+    length, parent, cmd, drain = witness
+    return {"length": length, "path": graph.path(parent) + [cmd] * (1 + drain)}
+
+
+def explore(data_dir: Optional[str] = None, workers: Optional[int] = None, max_states: int = DEFAULT_MAX_STATES,
+            max_depth: Optional[int] = None, exact_items: bool = False) -> Dict[str, Any]:
+    """Explora os estados a partir do início da partida e retorna o relatório (ver o módulo)."""
+    started = time.perf_counter()
+    expander = Expander(data_dir, exact_items)
+    game = expander.game
+    content = _content_map(game)
+    start_room = game.current_room
+    closure = _static_closure(start_room, content)
+    limit = game.inventory.limit
+    endings_known = list(game.ending_flags)
+
+    start = expander.encode()
+    graph = _Graph()
+    seen = {expander.key(start): 0}
+    first_room: Dict[str, int] = {start_room: 0}
+    first_item: Dict[str, int] = {}
+    first_event: Dict[str, int] = {}
+    event_states: Dict[str, List[int]] = {}
+    room_states: Dict[str, List[int]] = {start_room: [0]}
+    endings: Dict[str, Tuple[int, int, str, int]] = {}  # final -> (comprimento, origem, comando, repetições)
+    lost: Dict[str, Tuple[int, str]] = {}                # recompensa -> (origem, comando)
+    full_states = 0
+    first_full: Optional[int] = None
+    transitions = 0
+    frontier = [(0, start)]
+    depth = 0
+    truncated = False
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(data_dir, exact_items)) if workers > 1 else None
+    try:
+        while frontier:
+            if max_depth is not None and depth >= max_depth:
+                truncated = True
+                break
+            batches = [frontier[i:i + CHUNK_SIZE] for i in range(0, len(frontier), CHUNK_SIZE)]
+            results = pool.map(_expand_task, batches) if pool is not None else map(expander.expand, batches)
+            frontier = []
+            depth += 1
+            for batch in results:
+                for parent, cmd, node, key, ending, reward_lost, drain in batch:
+                    transitions += 1
+                    if ending:
+                        length = depth + drain
+                        if ending not in endings or length < endings[ending][0]:
+                            endings[ending] = (length, parent, cmd, drain)
+                        continue  # estados finais não são expandidos (nem ocupam a chave)
+                    if reward_lost and reward_lost not in lost:
+                        lost[reward_lost] = (parent, cmd)
+                    index = seen.get(key)
+                    if index is None:
+                        if len(seen) >= max_states:
+                            truncated = True
+                            continue
+                        index = seen[key] = graph.add(parent, cmd)
+                        frontier.append((index, node))
+                        if node.room not in first_room:
+                            first_room[node.room] = index
+                        room_states.setdefault(node.room, []).append(index)
+                        for name, _ in node.inventory:
+                            first_item.setdefault(name, index)
+                        for event in node.completed:
+                            first_event.setdefault(event, index)
+                            event_states.setdefault(event, []).append(index)
+                        if len(node.inventory) >= limit:
+                            full_states += 1
+                            if first_full is None:
+                                first_full = index
+                    graph.sources.append(parent)
+                    graph.targets.append(index)
+            if truncated:
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    registry = game.content
+    rooms = content["rooms"]
+    complete = not truncated
+
+    def missing(found: Iterable[str], everything: Iterable[str], possible) -> List[Dict[str, Any]]:
+        # 'certeza': fora do fecho estático; 'não encontrado': a exploração parou antes
+        found = set(found)
+        return [{"id": entry, "proved": complete or not possible(entry)}
+                for entry in everything if entry not in found]
+
+    def event_possible(kind: str):
+        placed = content["puzzle_rooms"] if kind == "puzzle" else content["quiz_rooms"]
+        return lambda entry: placed.get(entry) in closure
+
+    def item_possible(item: str) -> bool:
+        for source in registry.item_sources(item):
+            kind, _, entry = source.partition(":")
+            if kind == "sala" and entry in closure:
+                return True
+            if kind in ("quiz", "puzzle") and event_possible(kind)(entry):
+                return True
+        return any(item in room.items for room_id, room in rooms.items() if room_id in closure)
+
+    items = set(registry.items)
+    for room in rooms.values():
+        items.update(room.items)
+    unlocks = {}
+    for puzzle_id, puzzle in registry.puzzles.items():
+        target = puzzle.get('unlocks')
+        if target:
+            unlocks[target] = {"puzzle": puzzle_id, "exists": target in rooms,
+                               "opened": target in rooms and puzzle_id in first_event,
+                               "path": graph.path(first_event[puzzle_id]) if puzzle_id in first_event else None}
+
+    trap_report = None
+    one_way = _one_way(content, closure)
+    if one_way and complete:
+        goals = {f"sala:{room}": states for room, states in room_states.items()}
+        goals.update({f"desafio:{event}": states for event, states in event_states.items()})
+        if len(goals) * max(1, len(graph.sources)) <= TRAP_BUDGET:
+            trap_report = {goal: {"states": stuck, "path": graph.path(first)}
+                           for goal, (stuck, first) in _traps(graph, goals, len(graph.parents)).items()}
+
+    return {
+        "data_dir": data_dir,
+        "states": len(seen),
+        "transitions": transitions,
+        "depth": depth,
+        "complete": complete,
+        "exact_items": exact_items,
+        "workers": workers,
+        "seconds": time.perf_counter() - started,
+        "rooms": {"total": len(rooms), "reached": len(first_room),
+                  "unreached": missing(first_room, rooms, lambda room: room in closure)},
+        "puzzles": {"total": len(registry.puzzles), "solved": sum(p in first_event for p in registry.puzzles),
+                    "unsolved": missing((p for p in first_event if p in registry.puzzles), registry.puzzles,
+                                        event_possible("puzzle"))},
+        "quizzes": {"total": len(registry.quizzes), "answered": sum(q in first_event for q in registry.quizzes),
+                    "unanswered": missing((q for q in first_event if q in registry.quizzes), registry.quizzes,
+                                          event_possible("quiz"))},
+        "items": {"total": len(items), "obtained": len(first_item),
+                  "unobtained": missing(first_item, sorted(items), item_possible)},
+        "unlocks": unlocks,
+        "endings": {name: _ending_path(graph, endings.get(name)) for name in dict.fromkeys(endings_known + list(endings))},
+        "dead_ends": {
+            "inventory_limit": limit,
+            "full_inventory_states": full_states,
+            "full_inventory_path": graph.path(first_full) if first_full is not None else None,
+            "lost_rewards": {item: graph.path(parent) + [cmd] for item, (parent, cmd) in lost.items()},
+            "one_way": [list(edge) for edge in one_way],
+            "traps": trap_report,
+        },
+    }
+
+
+def _sequence(path: List[str]) -> str:
+    return "; ".join(path) if path else "(estado inicial)"
+
+
+def report_lines(report: Dict[str, Any]) -> List[str]:
+    """Relatório legível do resultado de explore()."""
+    lines = [f"{report['states']:,} estados, {report['transitions']:,} transições, profundidade {report['depth']}, "
+             f"{report['seconds']:.1f}s com {report['workers']} processo(s)"
+             + ("" if report['complete'] else " -- exploração interrompida no limite (resultados parciais)")]
+    if not report['exact_items']:
+        lines.append("Itens contados por pilhas ocupadas (use --exact-items para distinguir quais itens)")
+
+    lines.append("\nConteúdo:")
+    for label, key, done, missing in (("salas", "rooms", "reached", "unreached"),
+                                      ("enigmas", "puzzles", "solved", "unsolved"),
+                                      ("quizzes", "quizzes", "answered", "unanswered"),
+                                      ("itens", "items", "obtained", "unobtained")):
+        section = report[key]
+        lines.append(f"  {label:<8} {section[done]:>6}/{section['total']:<6}")
+        for entry in section[missing][:EXAMPLES]:
+            why = "inalcançável" if entry["proved"] else "não encontrado"
+            lines.append(f"    - {entry['id']} ({why})")
+        if len(section[missing]) > EXAMPLES:
+            lines.append(f"    ... e mais {len(section[missing]) - EXAMPLES}")
+    for target, unlock in report["unlocks"].items():
+        if not unlock["exists"]:
+            lines.append(f"  enigma '{unlock['puzzle']}' desbloqueia '{target}', que não existe")
+        elif not unlock["opened"]:
+            lines.append(f"  '{target}' (enigma '{unlock['puzzle']}') nunca foi aberta")
+
+    lines.append("\nFinais (menor sequência encontrada):")
+    for name, ending in report["endings"].items():
+        if ending is None:
+            lines.append(f"  {name}: nunca alcançado")
+        else:
+            lines.append(f"  {name}: {ending['length']} comando(s): {_sequence(ending['path'])}")
+
+    dead = report["dead_ends"]
+    lines.append("\nBecos sem saída:")
+    if dead["full_inventory_states"]:
+        lines.append(f"  inventário cheio ({dead['inventory_limit']} pilhas, sem como largar itens) em "
+                     f"{dead['full_inventory_states']:,} estado(s); os itens restantes ficam inalcançáveis. "
+                     f"Mais curto: {_sequence(dead['full_inventory_path'])}")
+    for item, path in list(dead["lost_rewards"].items())[:EXAMPLES]:
+        lines.append(f"  recompensa '{item}' perdida (inventário cheio): {_sequence(path)}")
+    if len(dead["lost_rewards"]) > EXAMPLES:
+        lines.append(f"  ... e mais {len(dead['lost_rewards']) - EXAMPLES} recompensa(s) que podem ser perdidas")
+    if not dead["one_way"]:
+        lines.append("  todas as passagens têm volta: nenhum estado fica preso longe do conteúdo")
+    else:
+        for room_id, direction, target in dead["one_way"][:EXAMPLES]:
+            lines.append(f"  passagem sem volta: {room_id} --{direction}--> {target}")
+        if dead["traps"] is None:
+            lines.append("  (armadilhas não verificadas: exploração incompleta ou grande demais)")
+        elif not dead["traps"]:
+            lines.append("  nenhum estado fica preso: o conteúdo continua alcançável")
+        for goal, trap in list((dead["traps"] or {}).items())[:EXAMPLES]:
+            lines.append(f"  {trap['states']:,} estado(s) não alcançam mais {goal}: {_sequence(trap['path'])}")
+    return lines
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Explorador do espaço de estados (alcançabilidade, becos sem saída e finais)")
+    parser.add_argument("--data-dir", help="diretório de conteúdo (padrão: data/)")
+    parser.add_argument("--workers", type=int, help="processos (padrão: um por núcleo)")
+    parser.add_argument("--max-states", type=int, default=DEFAULT_MAX_STATES)
+    parser.add_argument("--max-depth", type=int, help="profundidade máxima da BFS (comandos)")
+    parser.add_argument("--exact-items", action="store_true", help="distingue quais itens estão no inventário")
+    parser.add_argument("--json", help="grava o relatório completo neste arquivo")
+    args = parser.parse_args(argv)
+
+    report = explore(args.data_dir, args.workers, args.max_states, args.max_depth, args.exact_items)
+    print("\n".join(report_lines(report)))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
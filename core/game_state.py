@@ -1,15 +1,27 @@
+import copy
 import json
 import random
-from typing import Dict, List, Optional, Any
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
+from core.effects import EffectError
+from core.history import Snapshot
 from core.items import Item, Inventory
+from core.persistent import EMPTY
 from core.world import World, Room
 from core.character import Character
-from core.quizzes import QuizSystem
-from core.puzzles import PuzzleSystem
+from core import rules
+from core.metrics import timed
 from core.colors import GameColors as C
-from core.utils import load_json_data
+from core.utils import SAVES_DIR, load_json_data
 from pathlib import Path
 
+if TYPE_CHECKING:
+    from core.content import ContentRegistry
+    from core.effects import EffectLibrary
+    from core.events import EventTable
+    from core.puzzles import PuzzleSystem
+    from core.quizzes import QuizSystem
+
 # Configurações do jogo - podem ser movidas para um arquivo de configuração
 GAME_CONFIG = {
     "start_room": "hall_entrada",
@@ -24,7 +36,11 @@ GAME_CONFIG = {
 class GameState:
     """Classe principal que gerencia todo o estado do jogo"""
     
-    def __init__(self):
+    def __init__(self, data_dir: Optional[Path] = None, seed: Optional[int] = None):
+        # Cada sessão tem seu próprio gerador: a semente e os comandos reproduzem a partida
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = random.Random(self.seed)
+
         # Configuração básica do jogo
         self.player = Character(
             name="Investigador",
@@ -34,27 +50,61 @@ class GameState:
         
         self.inventory = Inventory(limit=GAME_CONFIG["inventory_limit"])
         
-        # O mundo é carregado usando o novo método estático
-        self.world = World.load_from_json()
-        
-        self.quiz_system = QuizSystem()
-        self.puzzle_system = PuzzleSystem()
+        # O mundo é apoiado no modelo compartilhado; a sessão guarda só o que alterar
+        self.data_dir = data_dir
+        self.world = World.load_from_json(data_dir=data_dir)
+        # Quizzes, puzzles, eventos e efeitos são carregados no primeiro uso (ver propriedades abaixo)
         
         # Estado do jogo
         self.current_room = GAME_CONFIG["start_room"]
-        self.health = GAME_CONFIG["max_health"]
-        self.fear = 0
-        self.sanity = GAME_CONFIG["max_sanity"]
-        self.luck = random.randint(1, 100)  # Atributo de sorte
+        stats = rules.initial_stats(GAME_CONFIG)
+        self.health = stats["health"]
+        self.fear = stats["fear"]
+        self.sanity = stats["sanity"]
+        self.luck = self.rng.randint(1, 100)  # Atributo de sorte
         self.is_night = False
         self.game_time = 0
         
         # Progresso
         self.completed_events = []
+        # Sinais sonoros do turno (core.audio); não fazem parte do save
+        self.cues: List[str] = []
+        self.flags: Dict[str, Any] = {}  # marcadas por efeitos (ex.: 'map_revealed'), via set_flag
         self.ending_flags = {
             "good": False,
             "bad": False
         }
+        # Muda a cada alteração de flags ou ending_flags (ver state_key)
+        self.flags_version = 0
+
+    # Subsistemas carregados sob demanda: uma sessão que só abre o menu e sai,
+    # ou que nunca chega a um enigma, não lê nem valida esses arquivos.
+
+    @cached_property
+    def content(self) -> 'ContentRegistry':
+        from core.content import ContentRegistry
+        return ContentRegistry.load(GAME_CONFIG["start_room"], data_dir=self.data_dir)
+
+    @cached_property
+    def quiz_system(self) -> 'QuizSystem':
+        from core.quizzes import QuizSystem
+        return QuizSystem(self.content)
+
+    @cached_property
+    def puzzle_system(self) -> 'PuzzleSystem':
+        from core.puzzles import PuzzleSystem
+        return PuzzleSystem(self.content)
+
+    @cached_property
+    def events(self) -> 'EventTable':
+        from core.events import EventTable
+        return EventTable.load(self.data_dir)
+
+    @cached_property
+    def effects(self) -> 'EffectLibrary':
+        """Todos os efeitos do conteúdo, compilados juntos (efeitos inválidos impedem a carga)."""
+        from core.effects import EffectLibrary
+        return EffectLibrary.load(self.content, self.events, GAME_CONFIG)
 
     def get_current_room_data(self) -> Optional[Room]:
         """Retorna a instância da sala atual"""
@@ -78,6 +128,61 @@ class GameState:
             return True
         return False
         
+    def travel_to(self, room_name: str) -> Optional[List[str]]:
+        """
+        Viaja até uma sala (id ou nome) pelo caminho mais curto, um passo por vez,
+        avançando o tempo a cada passo. Retorna as direções percorridas, ou None
+        se a sala for desconhecida ou inalcançável.
+        """
+        if not self.world:
+            return None
+        graph = self.world.graph
+        room_id = graph.resolve_room(room_name)
+        if room_id is None:
+            return None
+        path = graph.shortest_path(self.current_room, room_id)
+        if path is None:
+            return None
+        taken = []
+        for direction in path:
+            if not self.move_to_room(direction):
+                break
+            taken.append(direction)
+            if self.check_ending_conditions():
+                break
+        return taken
+
+    def complete_puzzle(self, puzzle_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Marca o puzzle como resolvido e entrega a recompensa: o item vai para o
+        inventário e a sala desbloqueada ganha uma passagem a partir da sala atual.
+        """
+        reward = self.puzzle_system.get_puzzle_reward(puzzle_id)
+        effect = self.effects.get("puzzle", puzzle_id)
+        if not reward or effect is None:
+            return None
+        self.completed_events.append(puzzle_id)
+        reward.update(effect.apply(self))
+        return reward
+
+    def answer_quiz(self, quiz_id: str, answer_index: int) -> Optional[Dict[str, Any]]:
+        """
+        Responde ao quiz: acerto entrega a recompensa (e conclui o quiz), erro aplica
+        a penalidade. Retorna o resultado, ou None se o quiz não existir.
+        """
+        quiz = self.quiz_system.get_quiz(quiz_id)
+        if not quiz:
+            return None
+        if self.quiz_system.validate_answer(quiz_id, answer_index):
+            self.completed_events.append(quiz_id)
+            result = self.quiz_system.get_quiz_reward(quiz_id)
+            result.update(self.effects.get("quiz", quiz_id).apply(self))
+            result['correct'] = True
+            return result
+        self.effects.get("penalty", quiz_id).apply(self)
+        self.cues.append("quiz_penalty")
+        return {'correct': False, 'penalty': self.quiz_system.get_quiz_penalty(quiz_id)}
+
     def get_current_room_connections(self) -> List[str]:
         """Retorna uma lista de direções possíveis da sala atual"""
         current_room_obj = self.get_current_room_data()
@@ -85,43 +190,38 @@ class GameState:
             return []
         return list(current_room_obj.connections.keys())
 
-    def trigger_random_event(self):
-        """Gatilho para eventos aleatórios baseados no medo e sorte"""
-        if random.randint(1, 100) > (100 - self.fear):
-            print(f"{C.FEAR}Você sente uma presença fria por perto...")
-            events = [
-                {"desc": "Uma sombra se move rapidamente no canto do olho.", "effect": {"fear": 15}},
-                {"desc": "Sussurros ininteligíveis ecoam pelas paredes.", "effect": {"fear": 20, "sanity": -5}}
-            ]
-            event = random.choice(events)
-            self.apply_effects(event["effect"])
-            return event["desc"]
-        return None
+    def trigger_random_event(self, trigger: str = "look") -> Optional[str]:
+        """
+        Sorteia um evento aleatório (data/events.json) para a ação indicada.
+        A chance cresce com o medo; retorna a descrição do evento ou None.
+        """
+        event = self.events.pick(self.rng, trigger, self.current_room, self.is_night, self.fear)
+        if event is None:
+            return None
+        self.effects.get("event", event["id"]).apply(self)
+        self.cues.append("random_event")
+        return event["desc"]
 
     def apply_effects(self, effects: Dict[str, int]):
-        """Aplica múltiplos efeitos ao jogador"""
-        if "health" in effects:
-            self.health = max(0, min(100, self.health + effects["health"]))
-        if "fear" in effects:
-            self.fear = max(0, min(100, self.fear + effects["fear"]))
-        if "sanity" in effects:
-            self.sanity = max(0, min(100, self.sanity + effects["sanity"]))
+        """Aplica múltiplos efeitos ao jogador (limitados pelos máximos do GAME_CONFIG)"""
+        self.effects.compile(effects, "apply_effects").apply(self)
 
     def update_game_time(self):
         """Avança o tempo do jogo e controla ciclo dia/noite"""
-        self.game_time += 1
-        
-        # A cada 10 ciclos troca entre dia e noite
-        if self.game_time % GAME_CONFIG["time_per_cycle"] == 0:
-            self.is_night = not self.is_night
-            if self.is_night:
-                self.fear = min(100, self.fear + GAME_CONFIG["fear_night_increase"])
+        was_night = self.is_night
+        self.game_time, self.is_night, self.fear = rules.advance_time(
+            self.game_time, self.is_night, self.fear, GAME_CONFIG)
+        if self.is_night and not was_night:
+            self.cues.append("nightfall")
+
+    def take_cues(self) -> List[str]:
+        """Retorna e esvazia os sinais sonoros acumulados desde a última chamada."""
+        cues, self.cues = self.cues, []
+        return cues
 
     def check_ending_conditions(self) -> Optional[str]:
         """Verifica se alguma condição de final foi atingida"""
-        if self.health <= 0:
-            return "bad"
-        if self.sanity <= 0:
+        if rules.is_defeated(self.health, self.sanity):
             return "bad"
         
         # Condições de final bom (exemplo: ter um item específico)
@@ -130,11 +230,11 @@ class GameState:
             
         return None
 
-    def save_game(self, file_name: str = "save_game.json"):
-        """Salva o estado atual do jogo em um arquivo"""
-        save_data = {
-            "player": self.player.__dict__,
-            "inventory": [item.__dict__ for item in self.inventory.items],
+    def to_dict(self) -> Dict[str, Any]:
+        """Estado serializável da sessão (cópias independentes do estado vivo)."""
+        return {
+            "player": self.player._asdict(),
+            "inventory": self.inventory.to_list(),
             "current_room": self.current_room,
             "health": self.health,
             "fear": self.fear,
@@ -142,38 +242,137 @@ class GameState:
             "luck": self.luck,
             "is_night": self.is_night,
             "game_time": self.game_time,
-            "completed_events": self.completed_events,
-            "ending_flags": self.ending_flags
+            "completed_events": list(self.completed_events),
+            "ending_flags": dict(self.ending_flags),
+            "flags": dict(self.flags),
+            "seed": self.seed,
+            "world": self.world.export_overlay() if self.world else {}
         }
-        path = Path(__file__).parent.parent / "saves" / file_name
+
+    def apply_dict(self, save_data: Dict[str, Any]) -> None:
+        """
+        Restaura o estado produzido por to_dict. Levanta KeyError se faltar alguma
+        chave e EffectError se algum item do inventário tiver efeitos inválidos.
+        """
+        self.player = Character(**save_data["player"])
+        self.inventory.load_list(save_data["inventory"])
+        self.current_room = save_data["current_room"]
+        self.health = save_data["health"]
+        self.fear = save_data["fear"]
+        self.sanity = save_data["sanity"]
+        self.luck = save_data["luck"]
+        self.is_night = save_data["is_night"]
+        self.game_time = save_data["game_time"]
+        self.completed_events = list(save_data["completed_events"])
+        self.ending_flags = dict(save_data["ending_flags"])
+        self.flags = dict(save_data.get("flags", {}))
+        self.flags_version += 1
+        # Saves antigos não têm semente; a sequência continua determinística a partir de semente + turno
+        self.seed = save_data.get("seed", self.seed)
+        self.rng = random.Random(f"{self.seed}:{self.game_time}")
+        if self.world:
+            self.world.apply_overlay(save_data.get("world", {}))
+
+    def set_flag(self, flag: str, value: Any) -> None:
+        """Marca uma flag do jogo (sempre por aqui: o histórico percebe a mudança pela versão)."""
+        self.flags[flag] = value
+        self.flags_version += 1
+
+    def state_key(self) -> tuple:
+        """
+        Assinatura barata do estado para core.history, sem copiar conteúdo: os
+        valores simples, na ordem dos primeiros campos de Snapshot, seguidos das
+        versões do inventário, do mundo, dos eventos concluídos e das flags. Se
+        ela não mudou, snapshot() também não mudaria.
+        """
+        return (self.current_room, self.health, self.fear, self.sanity, self.luck, self.is_night,
+                self.game_time, self.player, self.inventory.version, self.world.version if self.world else 0,
+                len(self.completed_events), self.flags_version)
+
+    def snapshot(self, previous: Optional[Snapshot] = None) -> Snapshot:
+        """
+        Estado da sessão como valor imutável (core.history). As partes iguais às
+        de `previous` são reaproveitadas (e, se nada mudou, `previous` é devolvido);
+        o mundo entra como o mapa persistente das salas alteradas.
+        """
+        rooms, edges = self.world.snapshot() if self.world else (EMPTY, ())
+        inventory = self.inventory.snapshot()
+        completed_events = tuple(self.completed_events)
+        flags = tuple(self.flags.items())
+        ending_flags = tuple(self.ending_flags.items())
+        if previous is not None:
+            if inventory is not previous.inventory and inventory == previous.inventory:
+                inventory = previous.inventory
+            if completed_events == previous.completed_events:
+                completed_events = previous.completed_events
+            if flags == previous.flags:
+                flags = previous.flags
+            if ending_flags == previous.ending_flags:
+                ending_flags = previous.ending_flags
+        snapshot = Snapshot(self.current_room, self.health, self.fear, self.sanity, self.luck, self.is_night,
+                            self.game_time, self.player, inventory, completed_events, flags, ending_flags,
+                            rooms, edges)
+        return previous if snapshot == previous else snapshot
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """Volta ao estado de um snapshot(); o gerador aleatório segue de onde está."""
+        self.current_room = snapshot.current_room
+        self.health = snapshot.health
+        self.fear = snapshot.fear
+        self.sanity = snapshot.sanity
+        self.luck = snapshot.luck
+        self.is_night = snapshot.is_night
+        self.game_time = snapshot.game_time
+        self.player = snapshot.player
+        self.inventory.restore(snapshot.inventory)
+        self.completed_events = list(snapshot.completed_events)
+        self.flags = dict(snapshot.flags)
+        self.ending_flags = dict(snapshot.ending_flags)
+        self.flags_version += 1
+        if self.world:
+            self.world.restore(snapshot.rooms, snapshot.edges)
+
+    def fork(self) -> 'GameState':
+        """
+        Cópia independente da sessão no estado atual, em tempo constante: divide
+        com esta as salas congeladas, o modelo do mundo e os subsistemas carregados.
+        O gerador aleatório é copiado, então os dois ramos sorteiam o mesmo futuro.
+        """
+        snapshot = self.snapshot()
+        clone = copy.copy(self)
+        clone.rng = random.Random()
+        clone.rng.setstate(self.rng.getstate())
+        clone.inventory = Inventory(limit=self.inventory.limit)
+        clone.world = World(self.world.template) if self.world else None
+        clone.cues = []
+        clone.restore(snapshot)
+        return clone
+
+    @classmethod
+    def from_dict(cls, save_data: Dict[str, Any], data_dir: Optional[Path] = None) -> 'GameState':
+        game = cls(data_dir=data_dir)
+        game.apply_dict(save_data)
+        return game
+
+    @timed("casa_save_game_seconds")
+    def save_game(self, file_name: str = "save_game.json", saves_dir: Optional[Path] = None):
+        """Salva o estado atual do jogo em um arquivo"""
+        path = Path(saves_dir or SAVES_DIR) / file_name
         path.parent.mkdir(parents=True, exist_ok=True) # Garante que o diretório 'saves' exista
         with open(path, 'w', encoding='utf-8') as f:
-            json.dump(save_data, f, indent=4)
+            json.dump(self.to_dict(), f, indent=4)
         return f"Jogo salvo com sucesso em {path}"
 
     @classmethod
-    def load_game(cls, file_name: str = "save_game.json"):
+    @timed("casa_load_game_seconds")
+    def load_game(cls, file_name: str = "save_game.json", saves_dir: Optional[Path] = None):
         """Carrega um estado de jogo de um arquivo"""
-        path = Path(__file__).parent.parent / "saves" / file_name
+        path = Path(saves_dir or SAVES_DIR) / file_name
         try:
             with open(path, 'r', encoding='utf-8') as f:
                 save_data = json.load(f)
             
-            game = cls() # Cria uma nova instância e sobrescreve o estado
-            
-            game.player = Character(**save_data["player"])
-            game.inventory.items = [Item(**item_data) for item_data in save_data["inventory"]]
-            game.current_room = save_data["current_room"]
-            game.health = save_data["health"]
-            game.fear = save_data["fear"]
-            game.sanity = save_data["sanity"]
-            game.luck = save_data["luck"]
-            game.is_night = save_data["is_night"]
-            game.game_time = save_data["game_time"]
-            game.completed_events = save_data["completed_events"]
-            game.ending_flags = save_data["ending_flags"]
-            
-            return game
+            return cls.from_dict(save_data) # Cria uma nova instância e sobrescreve o estado
         except FileNotFoundError:
             print(f"Erro: Arquivo de save '{file_name}' não encontrado.")
             return None
@@ -183,3 +382,6 @@ class GameState:
         except KeyError as e:
             print(f"Erro: Arquivo de save '{file_name}' está faltando uma chave: {e}")
             return None
+        except EffectError as e:
+            print(f"Erro: Arquivo de save '{file_name}' tem itens inválidos: {e}")
+            return None
@@ -0,0 +1,216 @@
+"""
+Gerador procedural de mansões.
+
+Produz um conjunto válido de world.json, quizzes.json e puzzles.json com o
+número de salas desejado. A saída depende apenas dos parâmetros e da
+semente, para que benchmarks sejam comparáveis entre execuções.
+
+A casa é uma árvore a partir de 'hall_entrada' (cada sala tem até
+`branching` filhas, sempre com passagem de volta), com atalhos extras
+(`loop_ratio`). Algumas salas ficam trancadas (`locked_ratio`): só são
+alcançadas resolvendo o puzzle da sala-mãe, que as desbloqueia.
+
+Com --format shards o mundo é gravado em world.shards/ (NDJSON por região,
+lido sob demanda pelo jogo; ver core.world_stream) em vez de world.json.
+
+Uso: python -m core.generator --rooms 10000 --seed 42 --out /tmp/mansao [--format shards]
+"""
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from core.world_stream import SHARDS_DIR, write_shards
+
+START_ROOM = "hall_entrada"
+
+DIRECTION_PAIRS = [
+    ("norte", "sul"), ("leste", "oeste"), ("nordeste", "sudoeste"),
+    ("noroeste", "sudeste"), ("cima", "baixo"),
+]
+
+ROOM_KINDS = [
+    "Quarto", "Corredor", "Sótão", "Porão", "Capela", "Cozinha", "Despensa",
+    "Galeria", "Escritório", "Adega", "Estufa", "Banheiro", "Salão", "Torre",
+]
+ADJECTIVES = [
+    "Empoeirado", "Sombrio", "Esquecido", "Úmido", "Silencioso", "Gelado",
+    "Abandonado", "Estreito", "Escuro", "Antigo",
+]
+ITEM_NOUNS = [
+    "chave", "vela", "retrato", "faca", "relógio", "boneca", "carta",
+    "crucifixo", "espelho", "lanterna", "diário", "anel",
+]
+ITEM_ADJECTIVES = ["enferrujada", "quebrada", "antiga", "manchada", "dourada", "rachada"]
+
+
+def _direction_pair(index: int) -> Tuple[str, str]:
+    if index < len(DIRECTION_PAIRS):
+        return DIRECTION_PAIRS[index]
+    return f"passagem_{index}", f"retorno_{index}"
+
+
+class MansionGenerator:
+    """Gera o conteúdo de uma mansão de forma determinística a partir de uma semente."""
+
+    def __init__(self, rooms: int, seed: int = 0, branching: int = 3, item_density: float = 0.5,
+                 locked_ratio: float = 0.05, loop_ratio: float = 0.05, quiz_ratio: float = 0.02):
+        if rooms < 1:
+            raise ValueError("A mansão precisa de pelo menos uma sala")
+        self.rooms = rooms
+        self.seed = seed
+        self.branching = max(1, branching)
+        self.item_density = item_density
+        self.locked_ratio = locked_ratio
+        self.loop_ratio = loop_ratio
+        self.quiz_ratio = quiz_ratio
+
+    @staticmethod
+    def room_id(index: int) -> str:
+        return START_ROOM if index == 0 else f"sala_{index:07d}"
+
+    def generate(self) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Retorna (world, quizzes, puzzles) prontos para serem gravados como JSON."""
+        rng = random.Random(self.seed)
+        world: Dict[str, Dict[str, Any]] = {}
+        used_pairs: List[int] = []  # próximo par de direções livre em cada sala
+        quizzes: List[Dict[str, Any]] = []
+        puzzles: List[Dict[str, Any]] = []
+        item_counter = 0
+
+        for index in range(self.rooms):
+            room_id = self.room_id(index)
+            kind = rng.choice(ROOM_KINDS)
+            adjective = rng.choice(ADJECTIVES)
+            room: Dict[str, Any] = {
+                "name": f"{kind} {adjective} {index}" if index else "Hall de Entrada",
+                "description": f"Um {kind.lower()} {adjective.lower()}. O silêncio aqui pesa como chumbo.",
+                "items": [],
+                "connections": {},
+            }
+            # Quantidade de itens: parte inteira da densidade + um extra com a parte fracionária
+            count = int(self.item_density) + (rng.random() < self.item_density % 1)
+            for _ in range(count):
+                item_counter += 1
+                room["items"].append(f"{rng.choice(ITEM_NOUNS)}_{rng.choice(ITEM_ADJECTIVES)}_{item_counter}")
+            world[room_id] = room
+            used_pairs.append(0)
+
+            if index == 0:
+                continue
+            parent_index = (index - 1) // self.branching
+            parent_id = self.room_id(parent_index)
+            parent = world[parent_id]
+            forward, back = _direction_pair(used_pairs[parent_index])
+            used_pairs[parent_index] += 1
+            room["connections"][back] = parent_id
+
+            if parent_index and "puzzle_id" not in parent and rng.random() < self.locked_ratio:
+                puzzle_id = f"enigma_{len(puzzles) + 1}"
+                answer = rng.choice(ITEM_NOUNS)
+                puzzles.append({
+                    "id": puzzle_id,
+                    "name": f"O Enigma de {parent['name']}",
+                    "description": "Uma inscrição na parede pede uma única palavra.",
+                    "solution": answer,
+                    "hint": f"A palavra começa com '{answer[0]}'.",
+                    "reward_item": f"selo_{len(puzzles) + 1}",
+                    "reward_effect": "reduce_fear",
+                    "unlocks": room_id,
+                    "direction": forward,
+                })
+                parent["puzzle_id"] = puzzle_id
+            else:
+                parent["connections"][forward] = room_id
+
+            if rng.random() < self.quiz_ratio:
+                quiz_id = f"quiz_{len(quizzes) + 1}"
+                correct = rng.randrange(4)
+                quizzes.append({
+                    "id": quiz_id,
+                    "question": f"Uma voz pergunta: 'Quantas velas ardem no {kind.lower()}?'",
+                    "options": [str(n) for n in range(1, 5)],
+                    "correct": correct,
+                    "reward_item": f"amuleto_{len(quizzes) + 1}",
+                    "reward_effect": "reduce_fear",
+                    "penalty": {"fear": 10 + rng.randrange(30), "sanity": rng.randrange(15)},
+                })
+                room["quiz_id"] = quiz_id
+
+        # Atalhos entre salas já existentes (sempre com volta, para não criar becos sem saída)
+        for _ in range(int(self.rooms * self.loop_ratio)):
+            a, b = rng.randrange(self.rooms), rng.randrange(self.rooms)
+            if a == b:
+                continue
+            room_a, room_b = world[self.room_id(a)], world[self.room_id(b)]
+            pair = max(used_pairs[a], used_pairs[b])
+            forward, back = _direction_pair(pair)
+            while forward in room_a["connections"] or back in room_b["connections"]:
+                pair += 1
+                forward, back = _direction_pair(pair)
+            used_pairs[a] = used_pairs[b] = pair + 1
+            room_a["connections"][forward] = self.room_id(b)
+            room_b["connections"][back] = self.room_id(a)
+
+        return world, quizzes, puzzles
+
+    def write(self, out_dir: Path, shards: bool = False, rooms_per_shard: int = 10000) -> Path:
+        """
+        Gera e grava os três arquivos em `out_dir` (o mundo é escrito sala a sala).
+        Com shards=True o mundo vai para world.shards/, com as salas em pré-ordem
+        da árvore: cada shard guarda uma região contígua da casa (uma sala e seus descendentes).
+        """
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        world, quizzes, puzzles = self.generate()
+        if shards:
+            rooms = ((self.room_id(index), world[self.room_id(index)]) for index in self._region_order())
+            write_shards(rooms, out_dir / SHARDS_DIR, rooms_per_shard)
+        else:
+            self._write_world(world, out_dir)
+        for name, document in (("quizzes.json", quizzes), ("puzzles.json", puzzles)):
+            with open(out_dir / name, 'w', encoding='utf-8') as f:
+                json.dump(document, f, ensure_ascii=False, indent=2)
+        return out_dir
+
+    def _region_order(self):
+        """Índices das salas em pré-ordem da árvore (as filhas de i são branching*i+1 ...)."""
+        stack = [0]
+        while stack:
+            index = stack.pop()
+            yield index
+            first = index * self.branching + 1
+            stack.extend(reversed(range(first, min(first + self.branching, self.rooms))))
+
+    @staticmethod
+    def _write_world(world: Dict[str, Any], out_dir: Path) -> None:
+        with open(out_dir / "world.json", 'w', encoding='utf-8') as f:
+            f.write("{\n")
+            last = len(world) - 1
+            for position, (room_id, room) in enumerate(world.items()):
+                separator = "," if position < last else ""
+                f.write(f"{json.dumps(room_id)}: {json.dumps(room, ensure_ascii=False)}{separator}\n")
+            f.write("}\n")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Gera uma mansão procedural (world/quizzes/puzzles.json)")
+    parser.add_argument("--rooms", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--branching", type=int, default=3)
+    parser.add_argument("--item-density", type=float, default=0.5, help="itens por sala (média)")
+    parser.add_argument("--locked-ratio", type=float, default=0.05, help="fração de salas trancadas por puzzle")
+    parser.add_argument("--loop-ratio", type=float, default=0.05, help="atalhos extras por sala")
+    parser.add_argument("--quiz-ratio", type=float, default=0.02, help="fração de salas com quiz")
+    parser.add_argument("--out", required=True, help="diretório de saída")
+    parser.add_argument("--format", choices=("json", "shards"), default="json", help="formato do mundo")
+    parser.add_argument("--rooms-per-shard", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    generator = MansionGenerator(args.rooms, args.seed, args.branching, args.item_density,
+                                 args.locked_ratio, args.loop_ratio, args.quiz_ratio)
+    print(f"Mansão com {args.rooms} salas gravada em {generator.write(args.out, args.format == 'shards', args.rooms_per_shard)}")
+
+
+if __name__ == "__main__":
+    main()
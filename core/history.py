@@ -0,0 +1,152 @@
+"""
+Histórico da sessão para desfazer/refazer e ramificar partidas.
+
+Cada turno que altera o estado vira um Snapshot imutável. As partes que não
+mudaram são o mesmo objeto do snapshot anterior, e o mundo entra como o
+PersistentMap das salas alteradas (core.persistent). Por isso cada snapshot
+custa só o que o turno mudou, e restaurar um deles só troca referências.
+
+O gerador aleatório da sessão fica de fora. Copiar o estado dele a cada turno
+custaria uns 22 KB, e a partida continua reproduzível sem isso: a semente e os
+comandos, incluindo 'desfazer', sempre levam ao mesmo resultado.
+
+É essa reprodutibilidade que deixa o histórico sair de graça para quem nunca
+desfaz nada: até o primeiro 'desfazer', cada turno só anota o comando, e os
+snapshots são montados então, refazendo os comandos sobre uma cópia do estado
+inicial (History.activate).
+"""
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+from core.character import Character
+from core.items import Item
+from core.persistent import PersistentMap
+
+if TYPE_CHECKING:
+    from core.game_state import GameState
+
+# Quantos estados anteriores cada sessão guarda para desfazer (None: sem limite)
+HISTORY_LIMIT = 1000
+# Valores simples no início de Snapshot e de GameState.state_key(); o resto da assinatura são versões
+VALUES = 8
+
+
+class Snapshot(NamedTuple):
+    """Estado da sessão num turno (ver GameState.snapshot)."""
+    current_room: str
+    health: int
+    fear: int
+    sanity: int
+    luck: int
+    is_night: bool
+    game_time: int
+    player: Character
+    inventory: Dict[str, Tuple[Item, int]]  # Inventory.snapshot(), compartilhado enquanto não mudar
+    completed_events: Tuple[str, ...]
+    flags: Tuple[Tuple[str, Any], ...]
+    ending_flags: Tuple[Tuple[str, bool], ...]
+    rooms: PersistentMap  # salas alteradas na sessão, congeladas
+    edges: Tuple[Tuple[str, str, str], ...]  # passagens abertas na sessão
+
+
+class History:
+    """
+    Pilhas de desfazer/refazer de uma sessão.
+
+    record() é chamado depois de cada turno e só empilha o estado se algo mudou
+    (um 'olhar' sem evento não ocupa o histórico). A mudança é vista pela
+    assinatura do estado (GameState.state_key), então um turno que não mudou
+    nada nem chega a montar o snapshot, e um que só mudou valores simples
+    (andar, o relógio) reaproveita o resto do snapshot anterior. Um turno novo
+    depois de desfazer descarta os estados refeitáveis.
+
+    Com `replay`, uma função que devolve o executor de turnos de outro
+    GameState, o histórico começa só anotando os comandos e é ativado no
+    primeiro desfazer (ou em stats()). Se o estado refeito não bater
+    com o atual (o jogo foi alterado fora dos turnos), o passado é descartado.
+    """
+
+    def __init__(self, game: 'GameState', limit: Optional[int] = HISTORY_LIMIT,
+                 replay: Optional[Callable[['GameState'], Callable[[str], Any]]] = None):
+        self.game = game
+        self.current = game.snapshot()
+        self._key = game.state_key()
+        self._undo: Deque[Snapshot] = deque(maxlen=limit)
+        self._redo: List[Snapshot] = []
+        # Até ser ativado: o executor, o gerador no início e os comandos desde então
+        self._replay = replay
+        self._rng_state = game.rng.getstate() if replay is not None else None
+        self._commands: Optional[List[str]] = [] if replay is not None else None
+
+    def record(self, command: str) -> bool:
+        """
+        Registra o estado depois do turno `command`; False se ele não mudou desde
+        o último registro (ou se o histórico ainda só anota os comandos).
+        """
+        if self._commands is not None:
+            self._commands.append(command)
+            return False
+        key = self.game.state_key()
+        if key == self._key:
+            return False
+        if key[VALUES:] == self._key[VALUES:]:
+            # Só valores simples mudaram (andar, o relógio): o resto vem do snapshot anterior
+            snapshot = Snapshot._make(key[:VALUES] + self.current[VALUES:])
+        else:
+            snapshot = self.game.snapshot(self.current)
+        self._key = key
+        if snapshot is self.current:
+            return False
+        self._undo.append(self.current)
+        self.current = snapshot
+        self._redo.clear()
+        return True
+
+    def activate(self) -> None:
+        """Passa a montar os snapshots a cada turno, refazendo os turnos anotados até aqui."""
+        commands, self._commands = self._commands, None
+        rng_state, self._rng_state = self._rng_state, None
+        if not commands:
+            return
+        game = self.game.fork()
+        game.restore(self.current)
+        game.rng.setstate(rng_state)
+        replayed = History(game, self._undo.maxlen)
+        play = self._replay(game)
+        for command in commands:
+            play(command)
+            replayed.record(command)
+        self.current = self.game.snapshot()
+        self._key = self.game.state_key()
+        if game.to_dict() == self.game.to_dict():
+            self._undo = replayed._undo
+
+    def undo(self, steps: int = 1) -> int:
+        """Volta até `steps` estados; retorna quantos foram desfeitos."""
+        if self._commands is not None:
+            self.activate()
+        done = 0
+        while done < steps and self._undo:
+            self._redo.append(self.current)
+            self.current = self._undo.pop()
+            done += 1
+        if done:
+            self.game.restore(self.current)
+            self._key = self.game.state_key()
+        return done
+
+    def redo(self, steps: int = 1) -> int:
+        """Avança até `steps` estados desfeitos; retorna quantos foram refeitos."""
+        done = 0
+        while done < steps and self._redo:
+            self._undo.append(self.current)
+            self.current = self._redo.pop()
+            done += 1
+        if done:
+            self.game.restore(self.current)
+            self._key = self.game.state_key()
+        return done
+
+    def stats(self) -> Dict[str, int]:
+        if self._commands is not None:
+            self.activate()
+        return {"undo": len(self._undo), "redo": len(self._redo)}
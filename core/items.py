@@ -1,10 +1,23 @@
-from typing import List, Optional, Dict, Any
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+
+# Efeitos vazios compartilhados: a maioria dos itens não tem efeitos
+_NO_EFFECTS = MappingProxyType({})
 
 class Item:
+    __slots__ = ('name', 'description', 'effects', 'use_message')
+
     def __init__(self, name: str, description: str, effects: Optional[Dict[str, Any]] = None, use_message: Optional[str] = None):
+        if effects:
+            # Efeitos inválidos são rejeitados ao criar o item (inclusive os de um save),
+            # não quando ele for usado. Import tardio: core.effects importa este módulo.
+            from core.effects import EffectError, spec_errors
+            errors = spec_errors(effects)
+            if errors:
+                raise EffectError([f"item:{name}: {error}" for error in errors])
         self.name = name
         self.description = description
-        self.effects = effects if effects is not None else {}
+        self.effects = effects if effects else _NO_EFFECTS
         self.use_message = use_message
 
     def use(self):
@@ -12,26 +25,121 @@ class Item:
             return self.use_message
         return f"Você não pode usar o item {self.name} aqui."
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "effects": dict(self.effects),
+            "use_message": self.use_message
+        }
+
 class Inventory:
+    """
+    Inventário indexado pelo nome do item (sem diferenciar maiúsculas).
+    Itens com o mesmo nome são empilhados em um único espaço com um contador;
+    o limite vale para o número de espaços (pilhas). A ordem de inserção é mantida.
+    """
+
     def __init__(self, limit: int = 5):
-        self.items: List[Item] = []
+        # nome normalizado -> (item, quantidade); as pilhas são trocadas, nunca alteradas
+        self._slots: Dict[str, Tuple[Item, int]] = {}
         self.limit = limit
-    
-    def add_item(self, item: Item) -> bool:
-        if len(self.items) < self.limit:
-            self.items.append(item)
+        # Cópia congelada das pilhas para os snapshots, refeita só depois de uma alteração
+        self._frozen: Optional[Dict[str, Tuple[Item, int]]] = None
+        # Muda a cada alteração (as interfaces guardam o que montaram para uma versão)
+        self.version = 0
+
+    @staticmethod
+    def _key(item_name: str) -> str:
+        return item_name.casefold()
+
+    @property
+    def items(self) -> List[Item]:
+        """Um item por pilha, na ordem em que foram pegos."""
+        return [slot[0] for slot in self._slots.values()]
+
+    @items.setter
+    def items(self, items: List[Item]) -> None:
+        self._slots = {}
+        self._frozen = None
+        self.version += 1
+        for item in items:
+            self._stack(item, 1)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __iter__(self) -> Iterator[Item]:
+        return (slot[0] for slot in self._slots.values())
+
+    def __contains__(self, item_name: str) -> bool:
+        return self._key(item_name) in self._slots
+
+    def _stack(self, item: Item, count: int) -> None:
+        key = self._key(item.name)
+        slot = self._slots.get(key)
+        self._slots[key] = (item, count) if slot is None else (slot[0], slot[1] + count)
+        self._frozen = None
+        self.version += 1
+
+    def add_item(self, item: Item, count: int = 1) -> bool:
+        if self._key(item.name) in self._slots or len(self._slots) < self.limit:
+            self._stack(item, count)
             return True
         return False
-    
-    def remove_item(self, item_name: str) -> Optional[Item]:
-        item_to_remove = next((item for item in self.items if item.name.lower() == item_name.lower()), None)
-        if item_to_remove:
-            self.items.remove(item_to_remove)
-            return item_to_remove
-        return None
-    
+
+    def remove_item(self, item_name: str, count: int = 1) -> Optional[Item]:
+        key = self._key(item_name)
+        slot = self._slots.get(key)
+        if slot is None:
+            return None
+        if slot[1] > count:
+            self._slots[key] = (slot[0], slot[1] - count)
+        else:
+            del self._slots[key]
+        self._frozen = None
+        self.version += 1
+        return slot[0]
+
     def has_item(self, item_name: str) -> bool:
-        return any(item.name.lower() == item_name.lower() for item in self.items)
+        return self._key(item_name) in self._slots
 
     def get_item(self, item_name: str) -> Optional[Item]:
-        return next((item for item in self.items if item.name.lower() == item_name.lower()), None)
+        slot = self._slots.get(self._key(item_name))
+        return slot[0] if slot is not None else None
+
+    def count(self, item_name: str) -> int:
+        slot = self._slots.get(self._key(item_name))
+        return slot[1] if slot is not None else 0
+
+    def snapshot(self) -> Dict[str, Tuple[Item, int]]:
+        """
+        Cópia das pilhas para core.history. Não deve ser alterada: enquanto o
+        inventário não mudar, snapshots seguidos recebem o mesmo objeto.
+        """
+        if self._frozen is None:
+            self._frozen = self._slots.copy()
+        return self._frozen
+
+    def restore(self, slots: Dict[str, Tuple[Item, int]]) -> None:
+        """Volta ao conteúdo de um snapshot()."""
+        self._slots = slots.copy()
+        self._frozen = slots
+        self.version += 1
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Representação serializável (para salvar o jogo)."""
+        return [dict(item.to_dict(), count=count) for item, count in self._slots.values()]
+
+    def load_list(self, data: List[Dict[str, Any]]) -> None:
+        """
+        Restaura o inventário a partir de to_list (aceita saves antigos, sem 'count').
+        Levanta core.effects.EffectError se algum item tiver efeitos inválidos.
+        """
+        self._slots = {}
+        self._frozen = None
+        self.version += 1
+        for item_data in data:
+            item_data = dict(item_data)
+            count = item_data.pop("count", 1)
+            self._stack(Item(**item_data), count)
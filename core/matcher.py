@@ -0,0 +1,311 @@
+"""
+Comparação tolerante de respostas e alvos de comandos.
+
+Jogadores erram acentos, maiúsculas, '_' e pequenas letras ("po estranho",
+"Chave Enferrujada", "respiracao"). Aqui o texto é normalizado uma vez na
+carga do conteúdo (minúsculas, sem acentos, '_' e '-' viram espaço) e a
+comparação usa essa forma:
+
+  - Matcher: nomes conhecidos (ids de itens, opções de quiz) com busca exata
+    O(1) pela forma normalizada e sugestões por distância de edição limitada
+    em uma BK-tree, que não percorre o vocabulário inteiro;
+  - Solution: solução de enigma, inclusive ordenada em várias partes
+    ("O Livro dos Mortos, Rituais Antigos, Histórias de Terror").
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+_SEPARATORS_RE = re.compile(r"[\s_\-]+")
+_PUNCTUATION_RE = re.compile(r"[\"'.!?:]")
+# Partes de uma resposta ordenada: vírgulas, ">" ou um "e" antes da última
+_PARTS_RE = re.compile(r"\s*(?:[,>]|\s+e\s+|\s+depois\s+)\s*")
+# Até quantos nomes permitidos (itens da sala, do inventário) comparar um a um em vez de usar a BK-tree
+LINEAR_LIMIT = 64
+# Sugestões guardadas por Matcher (o mesmo engano na mesma sala não é recalculado)
+MAX_SUGGESTIONS = 1024
+# Menor prefixo digitado aceito como abreviação de um nome presente ("cha" -> "chave_enferrujada")
+MIN_PREFIX = 3
+
+
+@lru_cache(maxsize=4096)
+def normalize(text: str) -> str:
+    """Forma de comparação: minúsculas, sem acentos nem pontuação, '_'/'-'/espaços unificados."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _SEPARATORS_RE.sub(" ", _PUNCTUATION_RE.sub("", text)).strip()
+
+
+def tolerance(text: str) -> int:
+    """Quantos erros de digitação aceitar: nenhum em palavras curtas (e números), até 2 nas longas."""
+    if len(text) <= 4 or text.isdigit():
+        return 0
+    return 1 if len(text) <= 8 else 2
+
+
+@lru_cache(maxsize=1024)
+def _pattern(word: str) -> Tuple[Dict[str, int], int]:
+    """Máscaras de bits por caractere de `word` (pré-processamento do algoritmo de Myers); não alterar o resultado."""
+    masks: Dict[str, int] = {}
+    for position, char in enumerate(word):
+        masks[char] = masks.get(char, 0) | (1 << position)
+    return masks, len(word)
+
+
+def _distance(pattern: Tuple[Dict[str, int], int], text: str) -> int:
+    """
+    Distância de Levenshtein entre a palavra de `pattern` e `text` pelo algoritmo
+    bit-paralelo de Myers (Hyyrö): uma coluna inteira da tabela por caractere de
+    `text`, com poucas operações sobre inteiros.
+    """
+    masks, length = pattern
+    if not length:
+        return len(text)
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    positive, negative, score = full, 0, length
+    for char in text:
+        eq = masks.get(char, 0)
+        xv = eq | negative
+        xh = (((eq & positive) + positive) ^ positive) | eq
+        up = negative | (~(xh | positive) & full)
+        down = positive & xh
+        if up & last:
+            score += 1
+        elif down & last:
+            score -= 1
+        up = ((up << 1) | 1) & full
+        down = (down << 1) & full
+        positive = down | (~(xv | up) & full)
+        negative = up & xv
+    return score
+
+
+def edit_distance(a: str, b: str, limit: Optional[int] = None) -> int:
+    """
+    Distância de Levenshtein. Com `limit`, o resultado é no máximo limit + 1 e
+    palavras com diferença de tamanho maior que o limite nem são comparadas.
+    """
+    if a == b:
+        return 0
+    if limit is not None and abs(len(a) - len(b)) > limit:
+        return limit + 1
+    distance = _distance(_pattern(a), b)
+    return distance if limit is None else min(distance, limit + 1)
+
+
+class BKTree:
+    """
+    Árvore de Burkhard-Keller sobre a distância de edição: a busca por palavras
+    a até `d` edições só desce nas arestas com rótulo em [dist - d, dist + d].
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        # Cada nó: (palavra, {distância: filho})
+        self._root: Optional[Tuple[str, Dict[int, tuple]]] = None
+        self._size = 0
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, word: str) -> None:
+        if self._root is None:
+            self._root = (word, {})
+            self._size = 1
+            return
+        pattern = _pattern(word)
+        node = self._root
+        while True:
+            distance = _distance(pattern, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                self._size += 1
+                return
+            node = child
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[int, str]]:
+        """Palavras a até `max_distance` edições, como (distância, palavra), das mais próximas às mais distantes."""
+        if self._root is None:
+            return []
+        pattern = _pattern(word)
+        found = []
+        pending = [self._root]
+        while pending:
+            node_word, children = pending.pop()
+            distance = _distance(pattern, node_word)
+            if distance <= max_distance:
+                found.append((distance, node_word))
+            for edge, child in children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    pending.append(child)
+        found.sort()
+        return found
+
+
+class Matcher:
+    """
+    Nomes conhecidos indexados pela forma normalizada. `resolve` devolve o nome
+    original correspondente a um texto digitado, tolerando acentos, '_' e
+    erros de digitação, opcionalmente restrito aos nomes presentes (`allowed`).
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._names: Dict[str, str] = {}  # forma normalizada -> primeiro nome original
+        self._tree: Optional[BKTree] = None  # montada na primeira busca aproximada
+        self._suggested: Dict[tuple, List[str]] = {}  # (texto, permitidos, distância, limite) -> sugestões
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str) -> None:
+        key = normalize(name)
+        if key not in self._names:
+            self._names[key] = name
+            self._suggested.clear()
+            if self._tree is not None:
+                self._tree.add(key)
+
+    def _scan(self, key: str, allowed: Optional[Sequence[str]],
+              max_distance: int) -> Tuple[List[str], List[Tuple[int, str]]]:
+        """
+        Nomes permitidos cujas palavras começam pelas digitadas e (distância, nome)
+        a até `max_distance` edições, dos mais próximos aos mais distantes. Com
+        poucos nomes permitidos, uma única passada compara cada um só uma vez.
+        """
+        prefixed: List[str] = []
+        close: List[Tuple[int, str]] = []
+        linear = allowed is not None and len(allowed) <= LINEAR_LIMIT
+        if allowed is not None:
+            words = key.split()
+            first, size, pattern = words[0], len(key), None
+            for name in allowed:
+                word = normalize(name)
+                if word.startswith(first) and _starts_words(word.split(), words):
+                    prefixed.append(name)
+                if linear and max_distance and abs(len(word) - size) <= max_distance:
+                    if pattern is None:
+                        pattern = _pattern(key)
+                    distance = _distance(pattern, word)
+                    if distance <= max_distance:
+                        close.append((distance, name))
+            close.sort()
+        if not linear and max_distance:
+            if self._tree is None:
+                self._tree = BKTree(self._names)
+            close = [(distance, self._names[word]) for distance, word in self._tree.search(key, max_distance)]
+            if allowed is not None:
+                allowed_set = set(allowed)
+                close = [(distance, name) for distance, name in close if name in allowed_set]
+        return prefixed, close
+
+    def exact(self, text: str) -> Optional[str]:
+        """Nome com a mesma forma normalizada, ou None."""
+        return self._names.get(normalize(text))
+
+    def suggest(self, text: str, max_distance: Optional[int] = None,
+                allowed: Optional[Iterable[str]] = None, limit: int = 3) -> List[str]:
+        """
+        Nomes parecidos com `text` para sugerir ao jogador: com `allowed`, primeiro
+        os presentes cujas palavras começam pelas digitadas; depois os nomes a até
+        `max_distance` edições (padrão: a tolerância, no mínimo 1), dos mais próximos aos mais distantes.
+        """
+        allowed = None if allowed is None else tuple(allowed)
+        cache_key = (text, allowed, max_distance, limit)
+        suggestions = self._suggested.get(cache_key)
+        if suggestions is not None:
+            return list(suggestions)
+        key = normalize(text)
+        if not key:
+            return []
+        if max_distance is None:
+            max_distance = max(tolerance(key), 1)
+        prefixed, close = self._scan(key, allowed, max_distance)
+        suggestions = (prefixed + [name for _, name in close if name not in prefixed])[:limit]
+        if len(self._suggested) >= MAX_SUGGESTIONS:
+            self._suggested.clear()
+        self._suggested[cache_key] = suggestions
+        return list(suggestions)
+
+    def resolve(self, text: str, allowed: Optional[Iterable[str]] = None) -> Optional[str]:
+        """
+        Nome correspondente a `text`, ou None se não houver um ou se for ambíguo.
+        A correspondência é a forma normalizada exata; senão, com `allowed`, o
+        único presente cujas palavras começam pelas digitadas ("chave" ->
+        "chave_enferrujada", ao menos MIN_PREFIX letras); senão o único mais
+        próximo dentro da tolerância. Uma falha não monta sugestões: quem mostra
+        a falha ao jogador chama `suggest`.
+        """
+        allowed = None if allowed is None else list(allowed)
+        if allowed is not None and not allowed:
+            return None
+        name = self.exact(text)
+        if name is not None and (allowed is None or name in allowed):
+            return name
+        key = normalize(text)
+        if not key:
+            return None
+        if allowed is not None:
+            # Nomes presentes que não estão no índice (ex.: itens de saves antigos)
+            for candidate in allowed:
+                if normalize(candidate) == key:
+                    return candidate
+        prefixed, close = self._scan(key, allowed, tolerance(key))
+        if len(prefixed) == 1 and len(key) >= MIN_PREFIX:
+            return prefixed[0]
+        if close and (len(close) == 1 or close[1][0] > close[0][0]):
+            return close[0][1]
+        return None
+
+
+def _starts_words(name_words: List[str], typed: List[str]) -> bool:
+    """Cada palavra digitada é início da palavra correspondente do nome, na ordem ("po estr" ~ "po estranho")."""
+    return len(typed) <= len(name_words) and all(name.startswith(word) for name, word in zip(name_words, typed))
+
+
+def split_parts(answer: str) -> List[str]:
+    """Partes de uma resposta ordenada ("coração, olho e cruz" -> ["coração", "olho", "cruz"])."""
+    return [part for part in _PARTS_RE.split(answer.strip()) if part]
+
+
+class Solution:
+    """
+    Solução de enigma pré-normalizada. Uma lista na definição do puzzle é uma
+    resposta ordenada: todas as partes, na ordem, separadas por vírgulas (ou
+    só por espaços). Cada parte tolera acentos e alguns erros de digitação.
+    """
+
+    __slots__ = ('parts', 'joined')
+
+    def __init__(self, solution):
+        parts = solution if isinstance(solution, list) else [solution]
+        self.parts: Tuple[str, ...] = tuple(normalize(str(part)) for part in parts)
+        self.joined = " ".join(self.parts)
+
+    def __len__(self) -> int:
+        return len(self.parts)
+
+    @staticmethod
+    def _close(typed: str, expected: str) -> bool:
+        return edit_distance(typed, expected, tolerance(expected)) <= tolerance(expected)
+
+    def matches(self, answer: str) -> bool:
+        """A resposta do jogador corresponde à solução (todas as partes, na ordem)?"""
+        typed = [normalize(part) for part in split_parts(answer)]
+        if len(typed) == len(self.parts) and all(map(self._close, typed, self.parts)):
+            return True
+        # Partes sem separador: compara a resposta inteira
+        return len(self.parts) > 1 and self._close(" ".join(typed), self.joined)
+
+    def partial(self, answer: str) -> bool:
+        """A resposta é só algumas das partes (ex.: um dos livros)? Útil para orientar o jogador."""
+        typed = [normalize(part) for part in split_parts(answer)]
+        return 0 < len(typed) < len(self.parts) and all(
+            any(self._close(part, expected) for expected in self.parts) for part in typed)
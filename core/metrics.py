@@ -0,0 +1,305 @@
+"""
+Instrumentação leve dos caminhos quentes do jogo.
+
+Cada medição entra em um histograma de latência (baldes exponenciais em
+segundos) ou em um contador, identificados por nome e rótulos. Há um registro
+global do processo (REGISTRY) e cada GameEngine tem o seu (métricas da
+sessão, em GameEngine.metrics). Os registros podem ser exportados em JSON ou
+no formato texto do Prometheus.
+
+A instrumentação fica sempre ligada. Com CASA_METRICS=0 no ambiente as
+funções decoradas com @timed ficam exatamente como eram (custo zero); desligada
+em tempo de execução (disable()), cada ponto medido custa o teste de uma
+variável global. Onde o caminho quente tem cache, só a falta é medida: o
+acerto custaria menos que a própria medição.
+
+    @lru_cache(maxsize=4096)
+    @timed("casa_parse_seconds")
+    def _parse_cached(cmd): ...
+
+    with timer("casa_command_seconds", (("action", "move"),), session=engine.metrics):
+        ...
+"""
+import json
+import os
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Limites superiores dos baldes: 1µs, 2µs, 4µs ... ~4,2s (mais o balde +Inf)
+BUCKETS: Tuple[float, ...] = tuple(1e-6 * 2 ** k for k in range(23))
+
+_enabled = os.environ.get("CASA_METRICS", "1") != "0"
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(flag: bool = True) -> None:
+    global _enabled
+    _enabled = flag
+
+
+def disable() -> None:
+    enable(False)
+
+
+class Histogram:
+    """Histograma cumulativo de latências (em segundos)."""
+
+    __slots__ = ('counts', 'count', 'sum', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def reset(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimativa do quantil q (limite superior do balde em que ele cai)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return BUCKETS[index] if index < len(BUCKETS) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": {f"{bound:g}": count for bound, count in zip(BUCKETS, self.counts) if count},
+        }
+
+
+class MetricsRegistry:
+    """Histogramas e contadores indexados por (nome, rótulos)."""
+
+    def __init__(self):
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+
+    def observe(self, name: str, value: float, labels: Labels = ()) -> None:
+        try:
+            self.histograms[(name, labels)].observe(value)
+        except KeyError:
+            self.histogram_for(name, labels).observe(value)
+
+    def histogram_for(self, name: str, labels: Labels = ()) -> Histogram:
+        """O histograma (name, labels), criado vazio se ainda não existir."""
+        histogram = self.histograms.get((name, labels))
+        if histogram is None:
+            histogram = self.histograms[(name, labels)] = Histogram()
+        return histogram
+
+    def inc(self, name: str, amount: float = 1, labels: Labels = ()) -> None:
+        key = (name, labels)
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def counter(self, name: str, labels: Labels = ()) -> float:
+        return self.counters.get((name, labels), 0)
+
+    def histogram(self, name: str, labels: Labels = ()) -> Optional[Histogram]:
+        return self.histograms.get((name, labels))
+
+    def total(self, name: str) -> int:
+        """Observações do histograma `name` somando todos os rótulos."""
+        return sum(h.count for (key, _), h in self.histograms.items() if key == name)
+
+    def reset(self) -> None:
+        """Zera as métricas. Os histogramas são zerados no lugar: quem guardou um (Latency) continua valendo."""
+        for histogram in self.histograms.values():
+            histogram.reset()
+        self.counters.clear()
+
+    def _observed(self) -> List[Tuple[Tuple[str, Labels], Histogram]]:
+        return sorted(item for item in self.histograms.items() if item[1].count)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Todas as métricas em um dicionário serializável."""
+        return {
+            "histograms": [{"name": name, "labels": dict(labels), **histogram.to_dict()}
+                           for (name, labels), histogram in self._observed()],
+            "counters": [{"name": name, "labels": dict(labels), "value": value}
+                         for (name, labels), value in sorted(self.counters.items())],
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent, ensure_ascii=False)
+
+    def to_prometheus(self) -> str:
+        """Formato texto de exposição do Prometheus (histogramas cumulativos)."""
+        lines: List[str] = []
+        typed = set()
+        for (name, labels), histogram in self._observed():
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, count in zip(BUCKETS, histogram.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', f'{bound:g}'),))} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum!r}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        for (name, labels), value in sorted(self.counters.items()):
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def summary_lines(self) -> List[str]:
+        """Resumo legível das latências (uma linha por histograma)."""
+        lines = []
+        for (name, labels), h in self._observed():
+            label = name + _format_labels(labels)
+            lines.append(f"{label:<52} n={h.count:<7} média={h.sum / h.count * 1e6:9.1f}µs "
+                         f"p50≤{h.quantile(0.5) * 1e6:8.0f}µs p99≤{h.quantile(0.99) * 1e6:8.0f}µs "
+                         f"máx={h.max * 1e6:9.1f}µs")
+        return lines
+
+    def write(self, path) -> None:
+        """Grava as métricas: formato Prometheus para arquivos .prom/.txt, JSON para os demais."""
+        text = self.to_prometheus() if str(path).endswith((".prom", ".txt")) else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+# Métricas de todo o processo
+REGISTRY = MetricsRegistry()
+
+
+def observe(name: str, seconds: float, labels: Labels = (), session: Optional[MetricsRegistry] = None) -> None:
+    """Registra uma latência no registro do processo (e no da sessão, se houver)."""
+    if not _enabled:
+        return
+    REGISTRY.observe(name, seconds, labels)
+    if session is not None:
+        session.observe(name, seconds, labels)
+
+
+def inc(name: str, amount: float = 1, labels: Labels = (), session: Optional[MetricsRegistry] = None) -> None:
+    """Soma ao contador no registro do processo (e no da sessão, se houver)."""
+    if not _enabled:
+        return
+    REGISTRY.inc(name, amount, labels)
+    if session is not None:
+        session.inc(name, amount, labels)
+
+
+class Latency:
+    """
+    Histograma `name` com rótulos fixos no registro do processo e no da sessão,
+    resolvido uma vez: no caminho mais quente (um por turno) até a busca por
+    (nome, rótulos) em observe() pesa.
+    """
+
+    __slots__ = ('process', 'session')
+
+    def __init__(self, name: str, labels: Labels = (), session: Optional[MetricsRegistry] = None):
+        self.process = REGISTRY.histogram_for(name, labels)
+        self.session = session.histogram_for(name, labels) if session is not None else None
+
+    def observe(self, seconds: float) -> None:
+        if not _enabled:
+            return
+        self.process.observe(seconds)
+        if self.session is not None:
+            self.session.observe(seconds)
+
+
+class timer:
+    """Mede o bloco `with` como uma observação do histograma `name`."""
+
+    __slots__ = ('name', 'labels', 'session', 'start')
+
+    def __init__(self, name: str, labels: Labels = (), session: Optional[MetricsRegistry] = None):
+        self.name = name
+        self.labels = labels
+        self.session = session
+
+    def __enter__(self) -> 'timer':
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        observe(self.name, perf_counter() - self.start, self.labels, self.session)
+
+
+def timed(name: str, labels: Labels = ()) -> Callable[[Callable], Callable]:
+    """Decorador: cada chamada da função vira uma observação do histograma `name`."""
+    def decorator(func: Callable) -> Callable:
+        if not _enabled:
+            return func
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                REGISTRY.observe(name, perf_counter() - start, labels)
+        return wrapper
+    return decorator
+
+
+def run_profiled(func: Callable[[], Any], output: str, top: int = 25) -> Any:
+    """
+    Executa `func` sob o cProfile, grava as estatísticas em `output` (formato
+    pstats) e imprime as funções mais caras com o custo médio por turno, além
+    do resumo dos histogramas do processo.
+    """
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func)
+    finally:
+        profiler.dump_stats(output)
+        turns = REGISTRY.total("casa_command_seconds") or 1
+        stats = pstats.Stats(profiler)
+        print(f"\nPerfil gravado em {output} ({turns} turnos)")
+        print(f"{'ms/turno':>10} {'chamadas/turno':>15}  função")
+        entries = sorted(stats.stats.items(), key=lambda entry: entry[1][3], reverse=True)
+        for (filename, line, function), (_, calls, _, cumulative, _) in entries[:top]:
+            print(f"{cumulative / turns * 1000:10.3f} {calls / turns:15.1f}  "
+                  f"{function} ({os.path.basename(filename)}:{line})")
+        lines = REGISTRY.summary_lines()
+        if lines:
+            print("\nLatências (todo o processo):")
+            for line in lines:
+                print(line)
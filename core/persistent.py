@@ -0,0 +1,189 @@
+"""
+Mapa persistente (imutável) com compartilhamento estrutural.
+
+É uma HAMT (hash array mapped trie): cada nó indexa 5 bits do hash da chave
+com um bitmap e guarda só as entradas presentes. set() copia apenas os nós do
+caminho até a chave (O(log32 n)) e devolve um mapa novo; o mapa antigo
+continua válido e divide todo o resto com o novo. É o que permite guardar um
+snapshot do mundo por turno pagando só pelas salas que mudaram (core.history).
+"""
+from collections.abc import Mapping
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+_MISSING = object()
+
+if hasattr(int, "bit_count"):
+    _popcount = int.bit_count
+else:  # Python < 3.10
+    def _popcount(value: int) -> int:
+        return bin(value).count("1")
+
+
+class _Node:
+    """Nó da trie: bitmap das posições ocupadas e as entradas, em ordem de posição.
+    Uma entrada é uma folha (chave, valor) ou outro _Node. bitmap -1 marca um
+    balde de colisão (hashes iguais em todos os bits): folhas em busca linear."""
+
+    __slots__ = ('bitmap', 'entries')
+
+    def __init__(self, bitmap: int, entries: tuple):
+        self.bitmap = bitmap
+        self.entries = entries
+
+    def __eq__(self, other: object) -> bool:
+        # A comparação das tuplas pula os nós compartilhados (mesmo objeto)
+        return isinstance(other, _Node) and self.bitmap == other.bitmap and self.entries == other.entries
+
+    __hash__ = None
+
+
+_EMPTY_NODE = _Node(0, ())
+
+
+def _hash(key: Any) -> int:
+    return hash(key) & _HASH_MASK
+
+
+def _pair(leaf_a: tuple, hash_a: int, leaf_b: tuple, hash_b: int, shift: int) -> _Node:
+    """Nó com duas folhas de chaves diferentes que caíram na mesma posição do nível anterior."""
+    if shift >= _HASH_BITS:
+        return _Node(-1, (leaf_a, leaf_b))
+    index_a = (hash_a >> shift) & _MASK
+    index_b = (hash_b >> shift) & _MASK
+    if index_a == index_b:
+        return _Node(1 << index_a, (_pair(leaf_a, hash_a, leaf_b, hash_b, shift + _BITS),))
+    entries = (leaf_a, leaf_b) if index_a < index_b else (leaf_b, leaf_a)
+    return _Node((1 << index_a) | (1 << index_b), entries)
+
+
+def _assoc(node: _Node, key: Any, value: Any, key_hash: int, shift: int) -> Tuple[_Node, bool]:
+    """Nó novo com key -> value e se a chave é nova; devolve o próprio nó se nada mudou."""
+    entries = node.entries
+    if node.bitmap < 0:
+        kept = tuple(leaf for leaf in entries if leaf[0] != key)
+        if len(kept) < len(entries) and any(leaf[0] == key and leaf[1] is value for leaf in entries):
+            return node, False
+        return _Node(-1, kept + ((key, value),)), len(kept) == len(entries)
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    index = _popcount(node.bitmap & (bit - 1))
+    if not node.bitmap & bit:
+        return _Node(node.bitmap | bit, entries[:index] + ((key, value),) + entries[index:]), True
+    entry = entries[index]
+    if isinstance(entry, _Node):
+        child, added = _assoc(entry, key, value, key_hash, shift + _BITS)
+        if child is entry:
+            return node, False
+    elif entry[0] == key:
+        if entry[1] is value:
+            return node, False
+        child, added = (key, value), False
+    else:
+        child, added = _pair(entry, _hash(entry[0]), (key, value), key_hash, shift + _BITS), True
+    return _Node(node.bitmap, entries[:index] + (child,) + entries[index + 1:]), added
+
+
+def _leaves(node: _Node) -> Iterator[tuple]:
+    for entry in node.entries:
+        if isinstance(entry, _Node):
+            yield from _leaves(entry)
+        else:
+            yield entry
+
+
+class PersistentMap(Mapping):
+    """
+    Mapa imutável: set()/update() devolvem um mapa novo que compartilha com este
+    tudo o que não mudou. Leitura em O(log32 n); len() em O(1).
+
+    items() devolve um iterador de pares (não uma view). A igualdade compara
+    as tries e pula os ramos compartilhados, então dois snapshots vizinhos se
+    comparam no custo do que mudou entre eles.
+    """
+
+    __slots__ = ('_root', '_len')
+
+    def __init__(self, items: Optional[Iterable[Tuple[Any, Any]]] = None):
+        self._root = _EMPTY_NODE
+        self._len = 0
+        if items is not None:
+            for key, value in (items.items() if isinstance(items, Mapping) else items):
+                self._root, added = _assoc(self._root, key, value, _hash(key), 0)
+                self._len += added
+
+    @classmethod
+    def _make(cls, root: _Node, length: int) -> 'PersistentMap':
+        result = cls.__new__(cls)
+        result._root = root
+        result._len = length
+        return result
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if not self._len:
+            return default
+        node = self._root
+        key_hash = _hash(key)
+        shift = 0
+        while True:
+            if node.bitmap < 0:
+                for leaf in node.entries:
+                    if leaf[0] == key:
+                        return leaf[1]
+                return default
+            bit = 1 << ((key_hash >> shift) & _MASK)
+            if not node.bitmap & bit:
+                return default
+            entry = node.entries[_popcount(node.bitmap & (bit - 1))]
+            if not isinstance(entry, _Node):
+                return entry[1] if entry[0] == key else default
+            node = entry
+            shift += _BITS
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[Any]:
+        return (leaf[0] for leaf in _leaves(self._root))
+
+    def __len__(self) -> int:
+        return self._len
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        return iter(_leaves(self._root))
+
+    def set(self, key: Any, value: Any) -> 'PersistentMap':
+        """Mapa com key -> value (o próprio mapa, se o valor já for esse objeto)."""
+        root, added = _assoc(self._root, key, value, _hash(key), 0)
+        if root is self._root:
+            return self
+        return self._make(root, self._len + added)
+
+    def update(self, items: Iterable[Tuple[Any, Any]]) -> 'PersistentMap':
+        """Mapa com todos os pares aplicados (um caminho copiado por chave)."""
+        root, length = self._root, self._len
+        for key, value in (items.items() if isinstance(items, Mapping) else items):
+            root, added = _assoc(root, key, value, _hash(key), 0)
+            length += added
+        return self if root is self._root else self._make(root, length)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PersistentMap):
+            return self is other or (self._len == other._len and self._root == other._root)
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"PersistentMap({dict(self.items())!r})"
+
+
+EMPTY = PersistentMap()
@@ -1,26 +1,38 @@
 import json
 from typing import Dict, Any, List, Optional
-from core.utils import load_json_data # Importação da nova função
+from core.content import ContentRegistry
+from core.matcher import Solution
 
 class PuzzleSystem:
-    def __init__(self):
-        # Utiliza a função auxiliar centralizada para carregar
-        self.puzzles: Dict[str, Dict[str, Any]] = load_json_data("puzzles.json") or {}
+    def __init__(self, registry: Optional[ContentRegistry] = None):
+        # Índice por id montado pelo registro central de conteúdo
+        registry = registry if registry is not None else ContentRegistry.load()
+        self.puzzles: Dict[str, Dict[str, Any]] = registry.puzzles
+        # Soluções normalizadas uma vez por carga do conteúdo (core.matcher)
+        self.solutions: Dict[str, Solution] = registry.solutions
     
     def get_puzzle(self, puzzle_id: str) -> Optional[Dict[str, Any]]:
         """Obtém um puzzle pelo ID"""
         return self.puzzles.get(puzzle_id)
 
     def check_solution(self, puzzle_id: str, player_solution: str) -> bool:
-        """Verifica se a solução do jogador está correta"""
-        puzzle = self.get_puzzle(puzzle_id)
-        if not puzzle:
-            return False
-            
-        correct_solution = puzzle['solution']
-        if isinstance(correct_solution, list):
-            return player_solution.lower() in [s.lower() for s in correct_solution]
-        return player_solution.lower() == correct_solution.lower()
+        """
+        Verifica se a solução do jogador está correta, sem diferenciar acentos,
+        maiúsculas e pequenos erros de digitação. Soluções em lista são ordenadas:
+        todas as partes, na ordem ("coração, olho, cruz").
+        """
+        solution = self.solutions.get(puzzle_id)
+        return solution is not None and solution.matches(player_solution)
+
+    def is_partial(self, puzzle_id: str, player_solution: str) -> bool:
+        """A resposta traz só parte de uma solução ordenada?"""
+        solution = self.solutions.get(puzzle_id)
+        return solution is not None and solution.partial(player_solution)
+
+    def solution_parts(self, puzzle_id: str) -> int:
+        """Número de partes da solução (1 para respostas simples)."""
+        solution = self.solutions.get(puzzle_id)
+        return len(solution) if solution is not None else 0
 
     def get_puzzle_reward(self, puzzle_id: str) -> Optional[Dict[str, Any]]:
         """Retorna a recompensa do puzzle"""
@@ -30,5 +42,6 @@ class PuzzleSystem:
         return {
             'item': puzzle.get('reward_item'),
             'effect': puzzle.get('reward_effect'),
-            'unlocks': puzzle.get('unlocks')
+            'unlocks': puzzle.get('unlocks'),
+            'direction': puzzle.get('direction')
         }
\ No newline at end of file
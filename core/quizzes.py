@@ -1,16 +1,32 @@
 import json
 from typing import Dict, Any, List, Optional
-from core.utils import load_json_data # Importação da nova função
+from core.content import ContentRegistry
 
 class QuizSystem:
-    def __init__(self):
-        # Utiliza a função auxiliar centralizada para carregar
-        self.quizzes: Dict[str, Dict[str, Any]] = load_json_data("quizzes.json") or {}
+    def __init__(self, registry: Optional[ContentRegistry] = None):
+        # Índice por id montado pelo registro central de conteúdo
+        registry = registry if registry is not None else ContentRegistry.load()
+        self.quizzes: Dict[str, Dict[str, Any]] = registry.quizzes
+        self._registry = registry
     
     def get_quiz(self, quiz_id: str) -> Optional[Dict[str, Any]]:
         """Obtém um quiz pelo ID"""
         return self.quizzes.get(quiz_id)
 
+    def option_index(self, quiz_id: str, answer: str) -> int:
+        """
+        Índice da opção escolhida pelo número ("2") ou pelo texto, sem diferenciar
+        acentos e pequenos erros de digitação; -1 se nenhuma corresponder.
+        """
+        quiz = self.get_quiz(quiz_id)
+        if not quiz:
+            return -1
+        if answer.strip().isdigit():
+            index = int(answer) - 1
+            return index if 0 <= index < len(quiz['options']) else -1
+        option = self._registry.option_matcher(quiz_id).resolve(answer)
+        return quiz['options'].index(option) if option is not None else -1
+
     def validate_answer(self, quiz_id: str, answer_index: int) -> bool:
         """Valida a resposta do jogador"""
         quiz = self.get_quiz(quiz_id)
@@ -0,0 +1,55 @@
+"""
+Regras numéricas do jogo: limites dos atributos, passagem do tempo e fim de jogo.
+
+São usadas tanto pelo GameState (valores escalares) quanto pelo simulador de
+balanceamento (core.simulator, arrays NumPy com uma partida por posição), para
+que os resultados do balanceamento reflitam exatamente as regras do jogo. Por
+isso só usam operações que valem para os dois casos: aritmética, comparações,
+`&`, `|`, `^` e `clamp`.
+"""
+from typing import Any, Dict, Mapping, Tuple
+
+# Atributo -> chave do GAME_CONFIG com o valor máximo
+STAT_LIMITS = {"health": "max_health", "fear": "max_fear", "sanity": "max_sanity"}
+
+# Penalidades de quiz são dadas em magnitudes: medo sobe, saúde e sanidade caem
+PENALTY_SIGNS = {"fear": 1, "health": -1, "sanity": -1}
+
+
+def initial_stats(config: Mapping[str, Any]) -> Dict[str, Any]:
+    """Atributos no início de uma partida."""
+    return {"health": config["max_health"], "fear": 0, "sanity": config["max_sanity"]}
+
+
+def clamp(value: Any, upper: Any, lower: Any = 0) -> Any:
+    """Limita um valor (ou array) ao intervalo [lower, upper]."""
+    if hasattr(value, "clip"):
+        return value.clip(lower, upper)
+    return max(lower, min(upper, value))
+
+
+def apply_stat(stat: str, value: Any, delta: Any, config: Mapping[str, Any]) -> Any:
+    """Novo valor de um atributo depois de somar `delta`, dentro dos limites do config."""
+    return clamp(value + delta, config[STAT_LIMITS[stat]])
+
+
+def penalty_effects(penalty: Mapping[str, Any]) -> Dict[str, Any]:
+    """Converte a penalidade de um quiz ({'fear': 30, 'sanity': 10}) em variações dos atributos."""
+    return {stat: PENALTY_SIGNS[stat] * amount for stat, amount in penalty.items() if stat in PENALTY_SIGNS}
+
+
+def advance_time(game_time: Any, is_night: Any, fear: Any, config: Mapping[str, Any]) -> Tuple[Any, Any, Any]:
+    """
+    Avança um turno do relógio: a cada `time_per_cycle` turnos alterna dia e
+    noite, e o cair da noite aumenta o medo. Retorna (game_time, is_night, fear).
+    """
+    game_time = game_time + 1
+    flip = game_time % config["time_per_cycle"] == 0
+    is_night = is_night ^ flip
+    fear = clamp(fear + (flip & is_night) * config["fear_night_increase"], config["max_fear"])
+    return game_time, is_night, fear
+
+
+def is_defeated(health: Any, sanity: Any) -> Any:
+    """Final ruim: sem saúde ou sem sanidade."""
+    return (health <= 0) | (sanity <= 0)
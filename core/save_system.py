@@ -0,0 +1,276 @@
+"""
+Salvamento em slots com diário (journal) e snapshots compactos.
+
+Cada slot é um diretório em saves/:
+
+    saves/index.json               metadados de todos os slots (para listar sem abrir os saves)
+    saves/<slot>/snapshot.json     estado completo compacto: {"seq": n, "state": {...}}
+    saves/<slot>/journal.ndjson    uma linha por alteração depois do snapshot: {"seq": n, "set": {...}, "world": {...}}
+
+Cada alteração só grava o que mudou desde a anterior (campos de GameState.to_dict
+e salas modificadas do mundo). A cada `snapshot_every` entradas o estado é
+compactado em um novo snapshot e o diário recomeça. Snapshot e índice são
+gravados em um arquivo temporário e renomeados (os.replace), então um save nunca
+fica pela metade; entradas do diário já cobertas pelo snapshot (seq menor ou
+igual) e uma última linha truncada são ignoradas ao carregar.
+"""
+import copy
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from core.effects import EffectError
+from core.metrics import timed
+from core.utils import SAVES_DIR
+
+INDEX_FILE = "index.json"
+SNAPSHOT_FILE = "snapshot.json"
+JOURNAL_FILE = "journal.ndjson"
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def atomic_write(path: Path, text: str) -> None:
+    """Grava o arquivo inteiro ou nada: escreve em um temporário e renomeia por cima."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def state_delta(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Diferença entre dois estados de GameState.to_dict (vazia se nada mudou)."""
+    delta: Dict[str, Any] = {}
+    changed = {key: value for key, value in new.items() if key != "world" and old.get(key) != value}
+    if changed:
+        delta["set"] = changed
+    old_world = old.get("world", {})
+    rooms = {room: data for room, data in new.get("world", {}).items() if old_world.get(room) != data}
+    if rooms:
+        delta["world"] = rooms
+    return delta
+
+
+def apply_delta(state: Dict[str, Any], delta: Dict[str, Any]) -> None:
+    state.update(delta.get("set", {}))
+    if "world" in delta:
+        state["world"] = dict(state.get("world", {}), **delta["world"])
+
+
+class SaveManager:
+    """Gerencia os slots de save de um diretório."""
+
+    def __init__(self, directory: Optional[Path] = None, snapshot_every: int = 50):
+        self.directory = Path(directory or SAVES_DIR)
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        # slot -> (último estado gravado, seq, entradas no diário desde o snapshot)
+        self._sessions: Dict[str, List[Any]] = {}
+
+    def _slot_dir(self, slot: str) -> Path:
+        return self.directory / slot
+
+    # --- índice ---
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.directory / INDEX_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _update_index(self, slot: str, state: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            index = self._read_index()
+            if state is None:
+                index.pop(slot, None)
+            else:
+                index[slot] = {
+                    "room": state["current_room"],
+                    "turn": state["game_time"],
+                    "health": state["health"],
+                    "fear": state["fear"],
+                    "sanity": state["sanity"],
+                    "updated": time.time(),
+                }
+            self.directory.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.directory / INDEX_FILE, _dumps(index))
+
+    def list_slots(self) -> List[Dict[str, Any]]:
+        """Slots ordenados do mais recente para o mais antigo (lê só o índice)."""
+        index = self._read_index()
+        slots = [dict(meta, slot=slot) for slot, meta in index.items()]
+        slots.sort(key=lambda meta: meta.get("updated", 0), reverse=True)
+        return slots
+
+    # --- escrita ---
+
+    def save(self, slot: str, state: Dict[str, Any]) -> None:
+        """
+        Grava um snapshot completo do estado e recomeça o diário do slot. A
+        sequência continua a do slot em disco, para que entradas antigas do
+        diário nunca pareçam mais novas que o snapshot.
+        """
+        session = self._sessions.get(slot)
+        if session is None:
+            stored = self._read(slot)
+            seq = stored[1] + 1 if stored else 1
+        else:
+            seq = session[1] + 1
+        slot_dir = self._slot_dir(slot)
+        slot_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write(slot_dir / SNAPSHOT_FILE, _dumps({"seq": seq, "state": state}))
+        atomic_write(slot_dir / JOURNAL_FILE, "")
+        self._sessions[slot] = [state, seq, 0]
+        self._update_index(slot, state)
+
+    @timed("casa_save_append_seconds")
+    def append(self, slot: str, state: Dict[str, Any]) -> bool:
+        """
+        Registra no diário o que mudou desde o último estado gravado.
+        Retorna False se nada mudou. Compacta em um snapshot quando o diário enche.
+        """
+        session = self._sessions.get(slot)
+        if session is None:
+            self.save(slot, state)
+            return True
+        last, seq, entries = session
+        delta = state_delta(last, state)
+        if not delta:
+            return False
+        if entries + 1 >= self.snapshot_every:
+            self.save(slot, state)
+            return True
+        delta["seq"] = seq + 1
+        with open(self._slot_dir(slot) / JOURNAL_FILE, 'a', encoding='utf-8') as f:
+            f.write(_dumps(delta) + "\n")
+        self._sessions[slot] = [state, seq + 1, entries + 1]
+        return True
+
+    def refresh_index(self, slot: str) -> None:
+        """Atualiza os metadados do slot no índice com o último estado gravado."""
+        session = self._sessions.get(slot)
+        if session is not None:
+            self._update_index(slot, session[0])
+
+    def delete(self, slot: str) -> None:
+        self._sessions.pop(slot, None)
+        shutil.rmtree(self._slot_dir(slot), ignore_errors=True)
+        self._update_index(slot, None)
+
+    # --- leitura ---
+
+    def _read(self, slot: str) -> Optional[List[Any]]:
+        """(estado, última seq, entradas no diário) do slot em disco; None se não houver snapshot."""
+        slot_dir = self._slot_dir(slot)
+        try:
+            with open(slot_dir / SNAPSHOT_FILE, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        state, seq = snapshot["state"], snapshot["seq"]
+        entries = 0
+        try:
+            with open(slot_dir / JOURNAL_FILE, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        delta = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Última linha interrompida no meio da gravação
+                    if delta["seq"] <= seq:
+                        continue
+                    apply_delta(state, delta)
+                    seq = delta["seq"]
+                    entries += 1
+        except FileNotFoundError:
+            pass
+        return [state, seq, entries]
+
+    def load_state(self, slot: str) -> Optional[Dict[str, Any]]:
+        """
+        Estado do slot: snapshot mais as entradas do diário posteriores a ele. A
+        sessão do slot continua dali: o próximo append() grava só a diferença,
+        com a sequência seguinte à do disco.
+        """
+        stored = self._read(slot)
+        if stored is None:
+            return None
+        state = stored[0]
+        self._sessions[slot] = [copy.deepcopy(state), stored[1], stored[2]]
+        return state
+
+    @timed("casa_save_load_seconds")
+    def load(self, slot: str, data_dir: Optional[Path] = None):
+        """
+        Cria um GameState a partir do slot (None se o slot não existir ou estiver
+        corrompido, inclusive com itens de efeitos inválidos).
+        """
+        from core.game_state import GameState
+        state = self.load_state(slot)
+        if state is None:
+            return None
+        try:
+            return GameState.from_dict(state, data_dir=data_dir)
+        except (KeyError, EffectError):
+            return None
+
+
+class AutoSaver:
+    """
+    Salvamento automático em segundo plano.
+
+    submit() só copia o estado (GameState.to_dict) e o coloca em uma fila; a
+    comparação e a gravação acontecem em uma thread separada, sem bloquear o
+    turno. Se a thread atrasar, os estados pendentes são agrupados e só o mais
+    recente é gravado.
+    """
+
+    def __init__(self, manager: SaveManager, slot: str, game):
+        self.manager = manager
+        self.slot = slot
+        self.game = game
+        self.writes = 0
+        self.errors = 0
+        self._queue: 'queue.Queue[Optional[Dict[str, Any]]]' = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"autosave-{slot}", daemon=True)
+        self._thread.start()
+
+    def submit(self) -> None:
+        self._queue.put(self.game.to_dict())
+
+    def _run(self) -> None:
+        running = True
+        while running:
+            state = self._queue.get()
+            # Agrupa o que chegou enquanto a última gravação acontecia
+            while True:
+                try:
+                    newer = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if newer is None:
+                    running = False
+                    break
+                state = newer
+            if state is None:
+                break
+            try:
+                if self.manager.append(self.slot, state):
+                    self.writes += 1
+            except OSError:
+                self.errors += 1
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Grava o que estiver pendente, atualiza o índice e encerra a thread."""
+        self.submit()
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self.manager.refresh_index(self.slot)
@@ -0,0 +1,330 @@
+"""
+Simulador de balanceamento (Monte Carlo) das dinâmicas de saúde, medo e sanidade.
+
+Roda milhões de partidas sintéticas como operações vetorizadas do NumPy: cada
+posição dos arrays é uma partida. A cada turno o jogador sintético se move
+(o tempo avança), olha ao redor ou responde a um quiz; eventos aleatórios
+(data/events.json) e penalidades de quiz (data/quizzes.json) são aplicados
+com as mesmas regras do jogo (core.rules), então os resultados valem para o
+GAME_CONFIG e o conteúdo atuais. Os lotes são distribuídos entre processos.
+
+O jogador sintético anda pelo mundo: cada movimento segue uma passagem
+sorteada da sala atual (passeio aleatório a partir da sala inicial, sem as
+passagens que enigmas abrem). Assim os eventos restritos a salas (ex.:
+livro_cai na biblioteca) disparam na proporção das visitas. Se o mundo não
+puder ser carregado, esses eventos ficam de fora e o relatório avisa.
+
+Relata a probabilidade de cada final dentro do horizonte, o histograma de
+turnos até a derrota e, com --sensitivity, o efeito de variar cada parâmetro
+numérico do GAME_CONFIG.
+
+O NumPy é uma dependência opcional, necessária só para este módulo.
+
+Uso: python -m core.simulator --runs 1000000 --turns 300 [--workers 4] [--sensitivity] [--json resultado.json]
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # dependência opcional
+    np = None
+
+from core import rules
+from core.content import ContentRegistry
+from core.events import EventTable
+from core.game_state import GAME_CONFIG
+from core.world import World
+
+# Comportamento do jogador sintético (probabilidades por turno)
+DEFAULT_POLICY = {
+    "move_ratio": 0.6,   # move-se (avança o tempo e pode disparar eventos de 'move')
+    "quiz_ratio": 0.05,  # responde a um quiz
+    "quiz_fail": 0.5,    # chance de errar a resposta (recebe a penalidade)
+}
+
+# Parâmetros do GAME_CONFIG variados na análise de sensibilidade
+SENSITIVITY_KNOBS = ("time_per_cycle", "fear_night_increase", "max_health", "max_fear", "max_sanity")
+SENSITIVITY_FACTORS = (0.5, 1.5)
+CHUNK_SIZE = 100_000
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("O simulador precisa do NumPy (pip install numpy).")
+
+
+def _effect_matrix(effects: List[Dict[str, int]]) -> Dict[str, Any]:
+    """Efeitos de uma lista de eventos/penalidades como um vetor por atributo."""
+    return {stat: np.array([effect.get(stat, 0) for effect in effects], dtype=np.int32)
+            for stat in rules.STAT_LIMITS}
+
+
+def _apply(stats: Dict[str, Any], selected: Any, choice: Any, matrix: Dict[str, Any], config: Dict[str, Any]) -> None:
+    # selected: máscara ou índices das partidas afetadas
+    for stat, values in matrix.items():
+        if not values.any():
+            continue
+        delta = np.zeros_like(stats[stat])
+        delta[selected] = values[choice]
+        stats[stat] = rules.apply_stat(stat, stats[stat], delta, config)
+
+
+def _cell(room_class: Any, night: Any, band: Any, bands: int) -> Any:
+    """Índice da tabela de eventos de (classe da sala, noite, faixa de medo); aceita escalares ou arrays."""
+    return (room_class * 2 + night) * bands + band
+
+
+def _room_walk(data_dir: Optional[str], room_keys: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Passagens do mundo em forma compacta (CSR) para o passeio aleatório: as
+    saídas da sala i são targets[offsets[i]:offsets[i + 1]]. `classes` diz qual
+    das salas de room_keys cada sala é (0: nenhuma). None se não houver mundo.
+    """
+    template = World.load_template(data_dir=data_dir)
+    if template is None:
+        return None
+    links = [(room_id, list(connections.values())) for room_id, _, connections in template.iter_links()]
+    index = {room_id: position for position, (room_id, _) in enumerate(links)}
+    if GAME_CONFIG["start_room"] not in index:
+        return None
+    keys = {room: position for position, room in enumerate(room_keys, 1)}
+    targets = [index[target] for _, exits in links for target in exits if target in index]
+    degrees = [sum(target in index for target in exits) for _, exits in links]
+    return {
+        "start": index[GAME_CONFIG["start_room"]],
+        "offsets": np.concatenate(([0], np.cumsum(degrees)[:-1])).astype(np.int64),
+        "degrees": np.array(degrees, dtype=np.int64),
+        "targets": np.array(targets, dtype=np.int64),
+        "classes": np.array([keys.get(room_id, 0) for room_id, _ in links], dtype=np.int32),
+    }
+
+
+def simulate_chunk(runs: int, turns: int, config: Dict[str, Any], policy: Dict[str, float],
+                   seed: Any, data_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Simula `runs` partidas de até `turns` turnos; retorna contagens agregadas."""
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    events = EventTable.load(data_dir)
+    penalties = [rules.penalty_effects(quiz.get("penalty", {}))
+                 for quiz in ContentRegistry.load(data_dir=data_dir).quizzes.values()]
+    penalty_matrix = _effect_matrix(penalties) if penalties else None
+    bands = len(events.fear_bounds) + 1
+    walk = _room_walk(data_dir, events.rooms)
+    # Salas com eventos próprios: classe 1.. (0 são as demais, que usam as tabelas sem sala)
+    room_keys = [None] + (events.rooms if walk is not None else [])
+    # ação -> célula (classe da sala, noite, faixa; ver _cell) -> (probabilidades, matriz de efeitos)
+    tables: Dict[str, Dict[int, Any]] = {trigger: {} for trigger in events.triggers}
+    for trigger in events.triggers:
+        for room_class, room in enumerate(room_keys):
+            for night in (False, True):
+                for band in range(bands):
+                    table = events.table(trigger, room, night, band)
+                    if table is not None:
+                        weights = np.array(table.weights, dtype=float)
+                        tables[trigger][_cell(room_class, night, band, bands)] = (
+                            weights / weights.sum(), _effect_matrix([e.get("effect", {}) for e in table.values]))
+
+    start = rules.initial_stats(config)
+    stats = {stat: np.full(runs, value, dtype=np.int32) for stat, value in start.items()}
+    game_time = np.zeros(runs, dtype=np.int32)
+    is_night = np.zeros(runs, dtype=bool)
+    alive = np.ones(runs, dtype=bool)
+    death_turn = np.full(runs, -1, dtype=np.int32)
+    fear_bounds = np.array(events.fear_bounds, dtype=np.int32)
+    position = np.full(runs, walk["start"] if walk is not None else 0, dtype=np.int64)
+    room_turns = np.zeros(len(room_keys), dtype=np.int64)
+
+    for turn in range(1, turns + 1):
+        roll = rng.random(runs)
+        moving = alive & (roll < policy["move_ratio"])
+        answering = alive & (roll >= policy["move_ratio"]) & (roll < policy["move_ratio"] + policy["quiz_ratio"])
+        looking = alive & ~moving & ~answering
+
+        if moving.any():
+            new_time, new_night, new_fear = rules.advance_time(game_time, is_night, stats["fear"], config)
+            game_time = np.where(moving, new_time, game_time)
+            is_night = np.where(moving, new_night, is_night)
+            stats["fear"] = np.where(moving, new_fear, stats["fear"])
+            if walk is not None:
+                leaving = np.flatnonzero(moving)
+                leaving = leaving[walk["degrees"][position[leaving]] > 0]
+                rooms = position[leaving]
+                exits = walk["offsets"][rooms] + (rng.random(len(leaving)) * walk["degrees"][rooms]).astype(np.int64)
+                position[leaving] = walk["targets"][exits]
+
+        if penalty_matrix is not None:
+            failed = answering & (rng.random(runs) < policy["quiz_fail"])
+            count = int(failed.sum())
+            if count:
+                _apply(stats, failed, rng.integers(len(penalties), size=count), penalty_matrix, config)
+
+        room_class = walk["classes"][position] if walk is not None else np.zeros(runs, dtype=np.int32)
+        room_turns += np.bincount(room_class[alive], minlength=len(room_keys))
+        for trigger, acting in (("move", moving), ("look", looking)):
+            chance = events.triggers.get(trigger)
+            if not chance:
+                continue
+            fired = np.flatnonzero(acting & (rng.random(runs) * 100 < stats["fear"] * chance))
+            if not len(fired):
+                continue
+            # Só as partidas em que algo aconteceu, agrupadas pela tabela que vale para cada uma
+            band = np.searchsorted(fear_bounds, stats["fear"][fired], side='right')
+            cells = _cell(room_class[fired], is_night[fired], band, bands)
+            for cell in np.unique(cells):
+                entry = tables[trigger].get(int(cell))
+                if entry is None:
+                    continue
+                probabilities, matrix = entry
+                selected = fired[cells == cell]
+                _apply(stats, selected, rng.choice(len(probabilities), size=len(selected), p=probabilities), matrix, config)
+
+        defeated = alive & rules.is_defeated(stats["health"], stats["sanity"])
+        death_turn[defeated] = turn
+        alive &= ~defeated
+        if not alive.any():
+            break
+
+    dead = death_turn > 0
+    return {
+        "runs": runs,
+        "bad": int(dead.sum()),
+        "bad_health": int((dead & (stats["health"] <= 0)).sum()),
+        "bad_sanity": int((dead & (stats["sanity"] <= 0)).sum()),
+        "survived": int((~dead).sum()),
+        "death_turns": np.bincount(death_turn[dead], minlength=turns + 1).tolist(),
+        "final_fear_mean": float(stats["fear"][~dead].mean()) if (~dead).any() else None,
+        "room_events": walk is not None,
+        # Turnos passados em cada sala com eventos próprios (vivos), para conferir o passeio
+        "room_turns": {room: int(count) for room, count in zip(room_keys[1:], room_turns[1:])},
+        "turns_played": int(room_turns.sum()),
+    }
+
+
+def _chunk_task(args):
+    return simulate_chunk(*args)
+
+
+def simulate(runs: int, turns: int, config: Optional[Dict[str, Any]] = None, policy: Optional[Dict[str, float]] = None,
+             seed: int = 0, workers: Optional[int] = None, data_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Distribui as partidas em lotes entre processos e soma os resultados."""
+    _require_numpy()
+    config = dict(GAME_CONFIG, **(config or {}))
+    policy = dict(DEFAULT_POLICY, **(policy or {}))
+    sizes = [min(CHUNK_SIZE, runs - start) for start in range(0, runs, CHUNK_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(size, turns, config, policy, child, data_dir) for size, child in zip(sizes, seeds)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        parts = [_chunk_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_chunk_task, tasks))
+
+    total = {"runs": 0, "bad": 0, "bad_health": 0, "bad_sanity": 0, "survived": 0, "turns_played": 0}
+    death_turns = np.zeros(turns + 1, dtype=np.int64)
+    fear_sum = 0.0
+    room_turns: Dict[str, int] = {}
+    for part in parts:
+        for key in total:
+            total[key] += part[key]
+        for room, count in part["room_turns"].items():
+            room_turns[room] = room_turns.get(room, 0) + count
+        death_turns += np.array(part["death_turns"], dtype=np.int64)
+        if part["final_fear_mean"] is not None:
+            fear_sum += part["final_fear_mean"] * part["survived"]
+    turns_axis = np.arange(turns + 1)
+    deaths = int(death_turns.sum())
+    total.update({
+        "turns": turns,
+        "config": config,
+        "policy": policy,
+        "p_bad": total["bad"] / total["runs"],
+        "p_survived": total["survived"] / total["runs"],
+        "mean_turns_to_death": float((death_turns * turns_axis).sum() / deaths) if deaths else None,
+        "median_turns_to_death": int(np.searchsorted(np.cumsum(death_turns), deaths / 2)) if deaths else None,
+        "final_fear_mean": fear_sum / total["survived"] if total["survived"] else None,
+        "death_turns": death_turns.tolist(),
+        "room_events": all(part["room_events"] for part in parts),
+        "room_share": {room: count / total["turns_played"] for room, count in room_turns.items()}
+                      if total["turns_played"] else {},
+    })
+    return total
+
+
+def sensitivity(runs: int, turns: int, seed: int = 0, workers: Optional[int] = None,
+                data_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Varia cada parâmetro numérico do GAME_CONFIG e mede o efeito na chance de derrota."""
+    rows = []
+    for knob in SENSITIVITY_KNOBS:
+        for factor in SENSITIVITY_FACTORS:
+            value = max(1, round(GAME_CONFIG[knob] * factor))
+            result = simulate(runs, turns, {knob: value}, seed=seed, workers=workers, data_dir=data_dir)
+            rows.append({"knob": knob, "value": value, "p_bad": result["p_bad"],
+                         "median_turns_to_death": result["median_turns_to_death"]})
+    return rows
+
+
+def histogram_lines(death_turns: List[int], bins: int = 20, width: int = 40) -> List[str]:
+    turns = len(death_turns) - 1
+    step = max(1, -(-turns // bins))
+    counts = [sum(death_turns[start:start + step]) for start in range(1, turns + 1, step)]
+    peak = max(counts) or 1
+    lines = []
+    for position, count in enumerate(counts):
+        start = 1 + position * step
+        end = min(turns, start + step - 1)
+        lines.append(f"  {start:>5}-{end:<5} {'█' * round(count / peak * width):<{width}} {count}")
+    return lines
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simulador Monte Carlo do balanceamento de medo/sanidade/saúde")
+    parser.add_argument("--runs", type=int, default=1_000_000)
+    parser.add_argument("--turns", type=int, default=300, help="horizonte de cada partida")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="processos (padrão: um por núcleo)")
+    parser.add_argument("--data-dir", help="diretório de conteúdo (padrão: data/)")
+    parser.add_argument("--sensitivity", action="store_true", help="varia cada parâmetro do GAME_CONFIG")
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args(argv)
+    if np is None:
+        print("O simulador precisa do NumPy: pip install numpy")
+        return 1
+
+    result = simulate(args.runs, args.turns, seed=args.seed, workers=args.workers, data_dir=args.data_dir)
+    print(f"Partidas: {result['runs']:,} | horizonte: {result['turns']} turnos")
+    print(f"Final ruim: {result['p_bad']:.2%} (saúde: {result['bad_health']:,}, sanidade: {result['bad_sanity']:,})")
+    print(f"Sobreviveram ao horizonte: {result['p_survived']:.2%}")
+    if result["room_events"]:
+        shares = ", ".join(f"{room} {share:.1%}" for room, share in result["room_share"].items())
+        print(f"Eventos de sala pelo passeio no mundo ({shares or 'nenhuma sala com eventos próprios'} dos turnos)")
+    else:
+        print("Aviso: mundo não carregado; eventos restritos a salas ficaram de fora (resultado otimista)")
+    if result["median_turns_to_death"] is not None:
+        print(f"Turnos até a derrota: média {result['mean_turns_to_death']:.1f}, mediana {result['median_turns_to_death']}")
+        print("Histograma de turnos até a derrota:")
+        print("\n".join(histogram_lines(result["death_turns"])))
+
+    output = {"base": result}
+    if args.sensitivity:
+        rows = sensitivity(args.runs, args.turns, args.seed, args.workers, args.data_dir)
+        output["sensitivity"] = rows
+        print("\nSensibilidade (chance de final ruim):")
+        print(f"  {'parâmetro':<22} {'valor':>6} {'P(ruim)':>9} {'Δ':>8} {'mediana':>8}")
+        for row in rows:
+            delta = row["p_bad"] - result["p_bad"]
+            median = row["median_turns_to_death"]
+            print(f"  {row['knob']:<22} {row['value']:>6} {row['p_bad']:>9.2%} {delta:>+8.2%} {median if median is not None else '-':>8}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
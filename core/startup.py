@@ -0,0 +1,79 @@
+"""
+Relatório de inicialização a frio.
+
+Mede, em processos novos, o tempo de uma sessão roteirizada curta até estar
+pronta para jogar (importar main e construir MainGame()), descontando o
+interpretador vazio, detalha os módulos mais caros com `python -X importtime`
+e compara o tempo total com um orçamento fixo: acima dele o código de saída é 1.
+
+Uso: python -m core.startup [--budget-ms 50] [--runs 9] [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_MS = 50.0
+STARTUP_CODE = "from main import MainGame; MainGame()"
+
+
+def _run(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *options, "-c", code], cwd=ROOT, check=True,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+
+def wall_time(code: str, runs: int) -> float:
+    """Menor tempo (segundos) de um processo novo executando `code`."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        _run(code)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def import_profile(code: str = STARTUP_CODE) -> List[Tuple[int, int, str]]:
+    """Módulos importados por `code`: (µs próprios, µs acumulados, módulo), do mais caro ao mais barato."""
+    entries = []
+    for line in _run(code, "-X", "importtime").stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        entries.append((int(self_us), int(cumulative_us), module.strip()))
+    return sorted(entries, reverse=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"orçamento do processo completo em ms (padrão {DEFAULT_BUDGET_MS:g})")
+    parser.add_argument("--runs", type=int, default=9)
+    parser.add_argument("--top", type=int, default=15, help="quantos módulos listar")
+    args = parser.parse_args(argv)
+
+    if os.environ.get("PYTHONDONTWRITEBYTECODE") or sys.dont_write_bytecode:
+        print("aviso: PYTHONDONTWRITEBYTECODE ativo; módulos sem .pyc atualizado são recompilados a "
+              "cada execução (rode 'python -m compileall .' antes de medir)\n")
+
+    bare = wall_time("pass", args.runs)
+    total = wall_time(STARTUP_CODE, args.runs)
+    print(f"interpretador vazio:       {bare * 1e3:7.1f} ms")
+    print(f"main + MainGame():         {total * 1e3:7.1f} ms  (jogo: {(total - bare) * 1e3:.1f} ms)")
+
+    profile = import_profile()
+    print(f"\n{len(profile)} módulos importados; os mais caros (tempo próprio):")
+    print(f"{'próprio':>10} {'acumulado':>11}  módulo")
+    for self_us, cumulative_us, module in profile[:args.top]:
+        print(f"{self_us / 1e3:8.2f}ms {cumulative_us / 1e3:9.2f}ms  {module}")
+
+    within = total * 1e3 <= args.budget_ms
+    print(f"\norçamento {args.budget_ms:g} ms: {'ok' if within else 'EXCEDIDO'} ({total * 1e3:.1f} ms)")
+    return 0 if within else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
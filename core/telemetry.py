@@ -0,0 +1,367 @@
+"""
+Telemetria das sessões e relatório agregado.
+
+Cada turno vira um evento estruturado (comando, ação, sala antes e depois,
+variação de saúde/medo/sanidade, resultado de quiz ou enigma, latência),
+entre um evento de início e um de fim de sessão. Os eventos são gravados em
+arquivos NDJSON rotativos (telemetry-<data>-<pid>-<n>.ndjson) por um escritor
+em segundo plano: no turno, record() só anexa uma tupla a uma deque (sem
+trava, sem JSON, sem E/S); a thread de fundo acorda a cada `flush_interval`,
+monta os eventos, serializa e grava o lote de uma vez.
+
+O agregador percorre os arquivos linha a linha, com memória proporcional ao
+número de salas, ações e sessões ainda abertas (não ao número de eventos), e
+produz o mapa de calor das salas, a frequência de comandos, o desempenho em
+quizzes e enigmas e o funil de salas com os pontos de abandono.
+
+Ativação: main.py --telemetry DIR (ou CASA_TELEMETRY=DIR).
+Uso: python -m core.telemetry [DIR] [--top 15] [--json]
+"""
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+from core.metrics import Histogram
+
+TELEMETRY_DIR = Path(__file__).parent.parent / "telemetry"
+FILE_PATTERN = "telemetry-*.ndjson"
+# Atributos do jogador cujas variações entram nos eventos de turno
+TRACKED_STATS = ("health", "fear", "sanity")
+
+_session_ids = itertools.count(1)
+
+
+class TelemetryWriter:
+    """
+    Escritor em segundo plano dos eventos de telemetria.
+
+    Os métodos chamados pelo jogo (start_session, record, end_session) só
+    enfileiram; o estado de cada sessão (turno atual, últimos atributos) fica
+    na thread de fundo. Se a fila passar de `max_pending` eventos (disco lento
+    demais), os novos são descartados e contados em `dropped`: o turno nunca espera.
+    """
+
+    def __init__(self, directory: Path = TELEMETRY_DIR, max_bytes: int = 16 * 1024 * 1024,
+                 flush_interval: float = 0.5, max_pending: int = 100_000, batch_size: int = 256):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self._pending: Deque[tuple] = deque()
+        self._sessions: Dict[str, Dict[str, Any]] = {}  # só a thread de fundo acessa
+        self._file = None
+        self._file_bytes = 0
+        self._files = itertools.count(1)
+        self.files: List[Path] = []
+        self.events = 0
+        self.dropped = 0
+        self.bytes_written = 0
+        self.errors = 0
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self._thread.start()
+
+    # --- Chamados pelo jogo (baratos) ---
+
+    def _put(self, entry: tuple) -> None:
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+        else:
+            self._pending.append(entry)
+
+    def start_session(self, seed: Optional[int], room: str, stats: Dict[str, Any], source: str = "local") -> str:
+        """Abre uma sessão e retorna o id usado nos eventos seguintes."""
+        session = f"{os.getpid():x}-{int(time.time() * 1000):x}-{next(_session_ids)}"
+        self._put(("start", time.time(), session, (seed, room, stats, source)))
+        return session
+
+    def record(self, session: str, result, latency: float) -> None:
+        """Registra um turno (core.engine.TurnResult) e sua latência em segundos."""
+        self._put(("turn", time.time(), session, (result, latency)))
+
+    def end_session(self, session: str, reason: str) -> None:
+        """Fecha a sessão: 'final:<final>', 'quit', 'disconnect' ou 'closed'."""
+        self._put(("end", time.time(), session, reason))
+
+    # --- Thread de fundo ---
+
+    def _event(self, kind: str, timestamp: float, session: str, payload) -> Dict[str, Any]:
+        if kind == "turn":
+            result, latency = payload
+            state = self._sessions.get(session)
+            if state is None:  # sessão sem início registrado (ex.: descartado)
+                state = self._sessions[session] = {"turns": 0, "stats": result.stats}
+            state["turns"] += 1
+            previous = state["stats"]
+            state["stats"] = result.stats
+            event = {"ev": "turn", "t": round(timestamp, 3), "s": session, "n": state["turns"],
+                     "cmd": result.command, "action": result.action,
+                     "from": result.room_before, "room": result.room_after,
+                     "ms": round(latency * 1000, 3)}
+            deltas = {name: result.stats[name] - previous[name] for name in TRACKED_STATS
+                      if name in previous and result.stats[name] != previous[name]}
+            if deltas:
+                event["d"] = deltas
+            if result.outcome:
+                event["out"] = result.outcome
+            if result.ending:
+                event["end"] = result.ending
+            state["room"] = result.room_after
+            return event
+        if kind == "start":
+            seed, room, stats, source = payload
+            self._sessions[session] = {"turns": 0, "stats": stats, "room": room}
+            return {"ev": "start", "t": round(timestamp, 3), "s": session, "seed": seed, "room": room, "src": source}
+        state = self._sessions.pop(session, None) or {"turns": 0}
+        return {"ev": "end", "t": round(timestamp, 3), "s": session, "reason": payload,
+                "turns": state["turns"], "room": state.get("room")}
+
+    def _open(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = self.directory / f"telemetry-{stamp}-{os.getpid()}-{next(self._files)}.ndjson"
+        self._file = open(path, "a", encoding="utf-8")
+        self._file_bytes = 0
+        self.files.append(path)
+
+    def _write(self, lines: List[str]) -> None:
+        data = "\n".join(lines) + "\n"
+        try:
+            if self._file is None or self._file_bytes >= self.max_bytes:
+                if self._file is not None:
+                    self._file.close()
+                self._open()
+            self._file.write(data)
+            self._file.flush()
+        except OSError:
+            self.errors += 1
+            return
+        size = len(data.encode("utf-8"))
+        self._file_bytes += size
+        self.bytes_written += size
+        self.events += len(lines)
+
+    def _flush(self) -> None:
+        pending = self._pending
+        while pending:
+            lines = [json.dumps(self._event(*pending.popleft()), ensure_ascii=False, separators=(",", ":"))
+                     for _ in range(min(len(pending), self.batch_size))]
+            self._write(lines)
+            # Cede o GIL entre lotes: a serialização não segura a thread do jogo
+            time.sleep(0)
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._flush()
+        self._flush()
+        if self._file is not None:
+            self._file.close()
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Grava o que estiver pendente e encerra a thread."""
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"events": self.events, "dropped": self.dropped, "errors": self.errors,
+                "bytes": self.bytes_written, "files": [str(path) for path in self.files]}
+
+
+def telemetry_files(directory: Path = TELEMETRY_DIR) -> List[Path]:
+    """Arquivos de telemetria do diretório, do mais antigo ao mais recente."""
+    return sorted(Path(directory).glob(FILE_PATTERN), key=lambda path: (path.stat().st_mtime, path.name))
+
+
+def iter_events(paths: Iterable[Path]) -> Iterator[Dict[str, Any]]:
+    """Eventos dos arquivos, um por vez; linhas corrompidas (ex.: última linha truncada) são ignoradas."""
+    for path in paths:
+        with open(path, encoding="utf-8") as lines:
+            for line in lines:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+class Aggregator:
+    """Agrega eventos em um passe, sem guardar os eventos."""
+
+    def __init__(self):
+        self.sessions = 0
+        self.turns = 0
+        self.endings: Dict[str, int] = {}        # motivo de fim -> sessões
+        self.room_turns: Dict[str, int] = {}     # sala -> turnos passados nela (mapa de calor)
+        self.room_reached: Dict[str, int] = {}   # sala -> sessões que chegaram nela (funil)
+        self.room_dropped: Dict[str, int] = {}   # sala -> sessões abandonadas nela
+        self.room_failed: Dict[str, int] = {}    # sala -> comandos inválidos ou sem efeito reconhecido
+        self.actions: Dict[str, int] = {}
+        self.unknown_commands: Dict[str, int] = {}
+        self.outcomes: Dict[Tuple[str, str], List[int]] = {}  # (tipo, id) -> [tentativas, acertos]
+        self.latency: Dict[str, Histogram] = {}
+        self._open: Dict[str, Dict[str, Any]] = {}  # sessão -> {"room", "seen"}
+        self.max_unknown = 1000  # comandos desconhecidos distintos guardados
+
+    def _reach(self, state: Dict[str, Any], room: Optional[str]) -> None:
+        if room is not None and room not in state["seen"]:
+            state["seen"].add(room)
+            self.room_reached[room] = self.room_reached.get(room, 0) + 1
+
+    def _close(self, state: Dict[str, Any], reason: str) -> None:
+        self.endings[reason] = self.endings.get(reason, 0) + 1
+        if not reason.startswith("final:") and state.get("room") is not None:
+            self.room_dropped[state["room"]] = self.room_dropped.get(state["room"], 0) + 1
+
+    def feed(self, event: Dict[str, Any]) -> None:
+        kind = event.get("ev")
+        session = event.get("s")
+        if kind == "start":
+            self.sessions += 1
+            state = self._open[session] = {"room": event.get("room"), "seen": set()}
+            self._reach(state, event.get("room"))
+        elif kind == "turn":
+            state = self._open.get(session)
+            if state is None:  # início em um arquivo que não foi lido
+                self.sessions += 1
+                state = self._open[session] = {"room": event.get("from"), "seen": set()}
+            self.turns += 1
+            room = event.get("room")
+            action = event.get("action") or "inválido"
+            self.actions[action] = self.actions.get(action, 0) + 1
+            if room is not None:
+                self.room_turns[room] = self.room_turns.get(room, 0) + 1
+            if action in ("unknown", "inválido"):
+                where = event.get("from") or "?"
+                self.room_failed[where] = self.room_failed.get(where, 0) + 1
+                command = (event.get("cmd") or "").strip().lower()
+                if command in self.unknown_commands or len(self.unknown_commands) < self.max_unknown:
+                    self.unknown_commands[command] = self.unknown_commands.get(command, 0) + 1
+            outcome = event.get("out")
+            if outcome:
+                counts = self.outcomes.setdefault((outcome.get("kind"), outcome.get("id")), [0, 0])
+                counts[0] += 1
+                counts[1] += bool(outcome.get("ok"))
+            if "ms" in event:
+                histogram = self.latency.get(action)
+                if histogram is None:
+                    histogram = self.latency[action] = Histogram()
+                histogram.observe(event["ms"] / 1000)
+            state["room"] = room
+            self._reach(state, room)
+        elif kind == "end":
+            state = self._open.pop(session, None)
+            if state is None:  # sessão inteira em arquivos que não foram lidos
+                self.sessions += 1
+                state = {"room": event.get("room")}
+            self._close(state, event.get("reason") or "desconhecido")
+
+    def report(self) -> Dict[str, Any]:
+        """Relatório agregado; sessões sem evento de fim contam como abandonadas na última sala."""
+        endings = dict(self.endings)
+        dropped = dict(self.room_dropped)
+        for state in self._open.values():
+            endings["sem fim"] = endings.get("sem fim", 0) + 1
+            if state.get("room") is not None:
+                dropped[state["room"]] = dropped.get(state["room"], 0) + 1
+        funnel = []
+        for room, reached in sorted(self.room_reached.items(), key=lambda entry: -entry[1]):
+            funnel.append({"room": room, "reached": reached,
+                           "share": reached / self.sessions if self.sessions else 0.0,
+                           "dropped": dropped.get(room, 0),
+                           "drop_rate": dropped.get(room, 0) / reached,
+                           "turns": self.room_turns.get(room, 0),
+                           "failed_commands": self.room_failed.get(room, 0)})
+        return {
+            "sessions": self.sessions,
+            "turns": self.turns,
+            "endings": endings,
+            "funnel": funnel,
+            "actions": dict(sorted(self.actions.items(), key=lambda entry: -entry[1])),
+            "unknown_commands": dict(sorted(self.unknown_commands.items(), key=lambda entry: -entry[1])),
+            "outcomes": [{"kind": kind, "id": outcome_id, "attempts": attempts, "successes": successes,
+                          "success_rate": successes / attempts}
+                         for (kind, outcome_id), (attempts, successes) in sorted(self.outcomes.items())],
+            "latency_ms": {action: {"count": histogram.count,
+                                    "p50": histogram.quantile(0.5) * 1000,
+                                    "p99": histogram.quantile(0.99) * 1000}
+                           for action, histogram in sorted(self.latency.items())},
+        }
+
+
+def aggregate(paths: Iterable[Path]) -> Dict[str, Any]:
+    """Relatório de todos os eventos dos arquivos (em um único passe)."""
+    aggregator = Aggregator()
+    for event in iter_events(paths):
+        aggregator.feed(event)
+    return aggregator.report()
+
+
+def _bar(value: int, largest: int, width: int = 30) -> str:
+    return "█" * max(1 if value else 0, round(width * value / largest)) if largest else ""
+
+
+def report_lines(report: Dict[str, Any], top: int = 15) -> List[str]:
+    """Relatório em texto: funil de salas com abandono, mapa de calor, comandos, quizzes e enigmas."""
+    lines = [f"{report['sessions']} sessões, {report['turns']} turnos",
+             "fins: " + ", ".join(f"{reason}={count}" for reason, count in sorted(report['endings'].items()))]
+
+    funnel = report["funnel"][:top]
+    lines.append(f"\nfunil de salas (sessões que chegaram / abandonos):")
+    for entry in funnel:
+        lines.append(f"  {entry['room']:<24} {entry['reached']:>7} {entry['share']:>6.0%}  "
+                     f"abandono {entry['dropped']:>6} ({entry['drop_rate']:>4.0%})  "
+                     f"comandos falhos {entry['failed_commands']}")
+
+    heat = sorted(report["funnel"], key=lambda entry: -entry["turns"])[:top]
+    largest = heat[0]["turns"] if heat else 0
+    lines.append("\nmapa de calor (turnos em cada sala):")
+    for entry in heat:
+        lines.append(f"  {entry['room']:<24} {entry['turns']:>8} {_bar(entry['turns'], largest)}")
+
+    lines.append("\ncomandos por ação:")
+    for action, count in list(report["actions"].items())[:top]:
+        latency = report["latency_ms"].get(action)
+        timing = f"  p50 {latency['p50']:.3f} ms  p99 {latency['p99']:.3f} ms" if latency else ""
+        lines.append(f"  {action:<12} {count:>8}{timing}")
+    if report["unknown_commands"]:
+        lines.append("\ncomandos não entendidos mais comuns:")
+        for command, count in list(report["unknown_commands"].items())[:top]:
+            lines.append(f"  {count:>6}  {command or '(vazio)'}")
+
+    if report["outcomes"]:
+        lines.append("\nquizzes e enigmas (tentativas, acertos):")
+        for entry in sorted(report["outcomes"], key=lambda entry: entry["success_rate"])[:top]:
+            lines.append(f"  {entry['kind']:<7} {entry['id']:<24} {entry['attempts']:>6} {entry['successes']:>6} "
+                         f"({entry['success_rate']:.0%})")
+    return lines
+
+
+def main(argv=None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?", default=str(TELEMETRY_DIR), help="diretório dos arquivos NDJSON")
+    parser.add_argument("--top", type=int, default=15, help="linhas por seção")
+    parser.add_argument("--json", action="store_true", help="imprime o relatório completo em JSON")
+    args = parser.parse_args(argv)
+
+    paths = telemetry_files(Path(args.directory))
+    if not paths:
+        print(f"Nenhum arquivo de telemetria em {args.directory}.")
+        return 1
+    report = aggregate(paths)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print("\n".join(report_lines(report, args.top)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,21 +1,95 @@
 import json
+import re
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+from core.metrics import timed
 
-def load_json_data(file_name: str) -> Optional[Dict[str, Any]]:
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+SAVES_DIR = Path(__file__).parent.parent / "saves"
+# Nome do pacote de conteúdo compilado (core.content_pack); aqui para não importar o módulo sem pacote
+PACK_NAME = "content.pack"
+
+# Cache em processo: caminho do arquivo -> ((mtime_ns, tamanho), dados)
+_data_cache: Dict[Path, Tuple[Optional[Tuple[int, int]], Any]] = {}
+# Pacotes de conteúdo abertos: diretório -> (chave de stat do pacote, ContentPack ou None)
+_pack_state: Dict[Path, Tuple[Optional[Tuple[int, int]], Any]] = {}
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def _get_pack(data_dir: Path):
+    """Abre (ou reabre, se foi recompilado) o pacote de conteúdo do diretório; None se não houver um válido."""
+    key = _stat_key(data_dir / PACK_NAME)
+    state = _pack_state.get(data_dir)
+    if state is not None and state[0] == key:
+        return state[1]
+
+    if state is not None and state[1] is not None:
+        state[1].close()
+    pack = None
+    if key is not None:
+        from core.content_pack import ContentPack, ContentPackError
+        try:
+            pack = ContentPack(data_dir / PACK_NAME)
+        except (ContentPackError, ValueError, EOFError, OSError):
+            pack = None
+    _pack_state[data_dir] = (key, pack)
+    return pack
+
+def clear_data_cache() -> None:
+    """Esvazia o cache de dados e fecha os pacotes de conteúdo (útil em benchmarks e ferramentas)."""
+    _data_cache.clear()
+    for _, pack in _pack_state.values():
+        if pack is not None:
+            pack.close()
+    _pack_state.clear()
+
+@timed("casa_load_json_seconds")
+def load_json_data(file_name: str, use_pack: bool = True, data_dir: Optional[Path] = None) -> Optional[Dict[str, Any]]:
     """
     Carrega dados de um arquivo JSON do diretório 'data'.
     Retorna None se o arquivo não for encontrado ou estiver mal formatado.
+
+    O resultado fica em cache até o arquivo mudar (mtime/tamanho) e é
+    compartilhado entre os chamadores, que não devem modificá-lo. Se existir
+    um pacote de conteúdo atualizado (core.content_pack), ele é usado no
+    lugar do JSON.
     """
     from core.colors import GameColors as C
     
-    path = Path(__file__).parent.parent / "data" / file_name
-    try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"{C.DANGER}Erro: Arquivo '{file_name}' não encontrado em {path}.")
-        return None
-    except json.JSONDecodeError:
-        print(f"{C.DANGER}Erro: Arquivo '{file_name}' mal formatado. Por favor, verifique a sintaxe JSON.")
-        return None
+    data_dir = Path(data_dir) if data_dir is not None else DATA_DIR
+    path = data_dir / file_name
+    key = _stat_key(path)
+    cached = _data_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    data = None
+    if use_pack:
+        pack = _get_pack(data_dir)
+        if pack is not None and pack.is_fresh(file_name, path):
+            data = pack.load(file_name)
+
+    if data is None:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            print(f"{C.DANGER}Erro: Arquivo '{file_name}' não encontrado em {path}.")
+            return None
+        except json.JSONDecodeError:
+            print(f"{C.DANGER}Erro: Arquivo '{file_name}' mal formatado. Por favor, verifique a sintaxe JSON.")
+            return None
+
+    _data_cache[path] = (key, data)
+    return data
+
+def strip_ansi(text: str) -> str:
+    """Remove os códigos de cor ANSI de um texto (para transcrições e saída sem terminal)."""
+    return _ANSI_RE.sub('', text)
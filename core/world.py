@@ -1,8 +1,13 @@
 import json
+from collections import ChainMap
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from core.utils import load_json_data
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Tuple
+from core.utils import DATA_DIR, load_json_data
 from core.colors import GameColors as C
+from core.persistent import EMPTY, PersistentMap
+from core.world_graph import WorldGraph
+from core.world_stream import DEFAULT_BUDGET_BYTES, SHARDS_DIR, ShardedRoomStore, has_shards
 
 class Room:
     """
@@ -17,28 +22,81 @@ class Room:
         self.puzzle_id = puzzle_id
         self.connections: Dict[str, str] = {}  # Direções: {'norte': 'sala1', 'sul': 'sala2'}
 
+    def freeze(self) -> 'Room':
+        """Torna a sala imutável para que possa ser compartilhada entre sessões."""
+        self.items = tuple(self.items)
+        self.connections = MappingProxyType(dict(self.connections))
+        return self
+
+    def copy(self) -> 'Room':
+        """Cria uma cópia mutável da sala (usada no copy-on-write das sessões)."""
+        room = Room(self.name, self.description, list(self.items), self.quiz_id, self.puzzle_id)
+        room.connections = dict(self.connections)
+        return room
+
 class World:
     """
     Classe que gerencia todas as salas e conexões do jogo.
     É responsável por carregar a estrutura do mundo a partir de um arquivo JSON.
+
+    O arquivo é lido uma única vez e vira um modelo congelado compartilhado por
+    todas as sessões. Cada sessão guarda apenas as salas que modificou
+    (itens pegos, passagens desbloqueadas), copiadas sob demanda.
+
+    Se o diretório de dados tiver um mundo em shards (world.shards/), o modelo
+    lê as salas sob demanda e descarta as menos usadas (ver core.world_stream);
+    as salas modificadas continuam na camada da sessão.
+
+    Entre a camada da sessão e o modelo fica a camada congelada: as salas
+    alteradas até o último snapshot(), num PersistentMap que os snapshots
+    compartilham. restore() e fork() só trocam essa referência; a próxima
+    alteração copia a sala de novo (copy-on-write).
     """
-    
-    def __init__(self):
-        self.rooms: Dict[str, Room] = {}
-    
-    @staticmethod
-    def load_from_json(file_name: str = "world.json") -> Optional['World']:
+
+    _templates: Dict[tuple, 'World'] = {}
+    # Orçamento de memória (estimado) das salas em cache nos mundos em shards
+    stream_budget_bytes = DEFAULT_BUDGET_BYTES
+
+    def __init__(self, template: Optional['World'] = None):
+        self.template = template
+        self._overlay: Dict[str, Room] = {}
+        self._frozen: PersistentMap = EMPTY
+        self._base: Dict[str, Room] = template.rooms if template is not None else {}
+        # Leitura passa pelas salas modificadas, pelas congeladas e depois pelo modelo;
+        # escrita vai só para a sessão
+        self.rooms = ChainMap(self._overlay, self._frozen, self._base) if template is not None else self._overlay
+        self._graph: Optional[WorldGraph] = None
+        # Passagens abertas nesta sessão (sala, direção, destino), para refazer o grafo após restore()
+        self._edges: Tuple[Tuple[str, str, str], ...] = ()
+        # Versões das salas (ver room_version): um contador que só cresce, carimbado na
+        # sala a cada alteração; restore() carimba todas de uma vez
+        self._stamp = 0
+        self._epoch = 0
+        self._room_stamps: Dict[str, int] = {}
+
+    @classmethod
+    def load_template(cls, file_name: str = "world.json", data_dir: Optional[Path] = None) -> Optional['World']:
         """
-        Carrega as salas e conexões do arquivo JSON e retorna um objeto World.
+        Retorna o modelo congelado do mundo, carregando o arquivo JSON apenas na primeira vez.
         Retorna None se houver um erro.
         """
-        world = World()
-        world_data = load_json_data(file_name)
+        key = (str(data_dir) if data_dir is not None else None, file_name)
+        template = cls._templates.get(key)
+        if template is not None:
+            return template
+
+        directory = Path(data_dir) if data_dir is not None else DATA_DIR
+        if file_name == "world.json" and has_shards(directory):
+            template = cls.load_stream(directory / SHARDS_DIR)
+            cls._templates[key] = template
+            return template
+
+        world_data = load_json_data(file_name, data_dir=data_dir)
         if not world_data:
             print(f"{C.DANGER}Não foi possível carregar os dados do mundo. O jogo não pode continuar.{C.RESET}")
             return None
-            
-        # Carrega cada sala
+
+        template = World()
         for room_name, room_config in world_data.items():
             new_room = Room(
                 name=room_config.get('name'),
@@ -47,24 +105,191 @@ class World:
                 quiz_id=room_config.get('quiz_id'),
                 puzzle_id=room_config.get('puzzle_id')
             )
-            world.rooms[room_name] = new_room
-            
-        # Estabelece as conexões entre as salas
-        for room_name, room_config in world_data.items():
-            current_room = world.get_room(room_name)
-            if current_room:
-                for direction, target_room_name in room_config.get('connections', {}).items():
-                    current_room.connections[direction] = target_room_name
-        
-        return world
+            new_room.connections = room_config.get('connections', {})
+            template.rooms[room_name] = new_room.freeze()
+
+        cls._templates[key] = template
+        return template
+
+    @classmethod
+    def load_stream(cls, shards_dir: Path, budget_bytes: Optional[int] = None) -> 'World':
+        """Modelo apoiado em um mundo em shards: as salas são lidas quando acessadas."""
+        template = World()
+        store = ShardedRoomStore(shards_dir, budget_bytes if budget_bytes is not None else cls.stream_budget_bytes)
+        template.rooms = template._base = store
+        return template
+
+    @classmethod
+    def clear_template_cache(cls) -> None:
+        """Descarta os modelos carregados (ex.: após editar o arquivo do mundo)."""
+        cls._templates.clear()
+
+    @staticmethod
+    def load_from_json(file_name: str = "world.json", data_dir: Optional[Path] = None) -> Optional['World']:
+        """
+        Retorna um mundo para uma nova sessão, apoiado no modelo compartilhado.
+        Retorna None se houver um erro.
+        """
+        template = World.load_template(file_name, data_dir)
+        if template is None:
+            return None
+        return World(template)
+
+    @property
+    def graph(self) -> WorldGraph:
+        """Índice de grafo do mundo; sessões sem passagens novas usam o do modelo."""
+        if self._graph is None:
+            if self.template is None:
+                self._graph = WorldGraph(self)
+            elif not self._edges:
+                return self.template.graph
+            else:
+                self._graph = self.template.graph.fork(self)
+                for edge in self._edges:
+                    self._graph.add_edge(*edge)
+        return self._graph
+
+    @property
+    def store(self) -> Optional[ShardedRoomStore]:
+        """Armazenamento sob demanda das salas, se o mundo estiver em shards."""
+        base = self._base if self.template is not None else self.rooms
+        return base if isinstance(base, ShardedRoomStore) else None
+
+    def cache_stats(self) -> Optional[Dict[str, int]]:
+        """Contadores de acertos/faltas/descartes do cache de salas (None fora do modo em shards)."""
+        store = self.store
+        return store.stats() if store is not None else None
+
+    def iter_links(self):
+        """(id, nome, conexões) de cada sala; em shards, percorre os arquivos sem guardar as salas."""
+        store = self.store
+        if store is not None and self.template is None:
+            return store.iter_links()
+        return ((room_id, room.name, room.connections) for room_id, room in self.rooms.items())
+
+    def _edge_added(self, room_name: str, direction: str, target_room: str) -> None:
+        self._edges += ((room_name, direction, target_room),)
+        # Sem índice ainda, ele será montado já com a aresta quando for pedido
+        if self._graph is not None:
+            self._graph.add_edge(room_name, direction, target_room)
 
     def add_room(self, room: Room) -> None:
         """Adiciona uma sala ao mundo."""
         self.rooms[room.name] = room
+        self._graph = None
+        self._touch(room.name)
     
     def get_room(self, room_name: str) -> Optional[Room]:
         """Retorna uma sala pelo nome."""
-        return self.rooms.get(room_name)
+        room = self._overlay.get(room_name)
+        if room is None:
+            room = self._frozen.get(room_name)
+            if room is None:
+                return self._base.get(room_name)
+        return room
+
+    def edit_room(self, room_name: str) -> Optional[Room]:
+        """Retorna uma versão mutável da sala, copiando-a do modelo na primeira alteração."""
+        room = self._overlay.get(room_name)
+        if room is None:
+            base = self._frozen.get(room_name)
+            if base is None:
+                base = self._base.get(room_name)
+                if base is None:
+                    return None
+            room = self._overlay[room_name] = base.copy()
+        self._touch(room_name)
+        return room
+
+    def _touch(self, room_name: str) -> None:
+        self._stamp += 1
+        self._room_stamps[room_name] = self._stamp
+
+    @property
+    def version(self) -> int:
+        """Versão do mundo da sessão: muda a cada alteração de qualquer sala (e a cada restore)."""
+        return self._stamp
+
+    def room_version(self, room_name: str) -> int:
+        """
+        Versão do estado de uma sala nesta sessão: muda sempre que a sala pode ter
+        sido alterada (edit_room, add_room, restore) e nunca volta a um valor antigo.
+        """
+        return self._room_stamps.get(room_name, self._epoch)
+
+    def take_item(self, room_name: str, item_name: str) -> bool:
+        """Remove um item de uma sala. Retorna False se o item não estiver lá."""
+        room = self.get_room(room_name)
+        if room is None or item_name not in room.items:
+            return False
+        self.edit_room(room_name).items.remove(item_name)
+        return True
+
+    def unlock(self, room_name: str, direction: str, target_room: str) -> bool:
+        """Abre uma nova passagem a partir de uma sala."""
+        if self.get_room(target_room) is None:
+            return False
+        room = self.edit_room(room_name)
+        if room is None:
+            return False
+        if room.connections.get(direction) == target_room:
+            return True
+        room.connections[direction] = target_room
+        self._edge_added(room_name, direction, target_room)
+        return True
+
+    def export_overlay(self) -> Dict[str, Dict[str, Any]]:
+        """Exporta apenas as salas alteradas nesta sessão (para salvar o jogo)."""
+        rooms = dict(self._frozen.items())
+        rooms.update(self._overlay)
+        return {
+            room_name: {"items": list(room.items), "connections": dict(room.connections)}
+            for room_name, room in rooms.items()
+        }
+
+    def snapshot(self) -> Tuple[PersistentMap, Tuple[Tuple[str, str, str], ...]]:
+        """
+        Estado das salas alteradas: (salas congeladas, passagens abertas). As salas
+        alteradas desde o snapshot anterior são congeladas e entram no mapa;
+        o resto é compartilhado com ele. Só vale para mundos de sessão.
+        """
+        if self.template is None:
+            raise ValueError("snapshot() só vale para mundos de sessão (apoiados em um modelo)")
+        if self._overlay:
+            self._set_frozen(self._frozen.update((name, room.freeze()) for name, room in self._overlay.items()))
+            self._overlay.clear()
+        return self._frozen, self._edges
+
+    def restore(self, rooms: PersistentMap, edges: Tuple[Tuple[str, str, str], ...]) -> None:
+        """Volta ao estado de um snapshot() em O(1): as salas são copiadas de novo só quando alteradas."""
+        self._overlay.clear()
+        self._set_frozen(rooms)
+        self._stamp += 1
+        self._epoch = self._stamp
+        self._room_stamps.clear()
+        if edges is not self._edges:
+            self._edges = edges
+            self._graph = None
+
+    def fork(self) -> 'World':
+        """Outro mundo de sessão no mesmo estado deste, dividindo as salas congeladas e o modelo."""
+        world = World(self.template)
+        world.restore(*self.snapshot())
+        return world
+
+    def _set_frozen(self, rooms: PersistentMap) -> None:
+        self._frozen = rooms
+        self.rooms.maps[1] = rooms
+
+    def apply_overlay(self, overlay: Dict[str, Dict[str, Any]]) -> None:
+        """Restaura as alterações exportadas por export_overlay."""
+        for room_name, changes in overlay.items():
+            room = self.edit_room(room_name)
+            if room is None:
+                continue
+            room.items = list(changes.get("items", room.items))
+            for direction, target_room in changes.get("connections", {}).items():
+                self.unlock(room_name, direction, target_room)
     
     def get_connected_room(self, current_room_name: str, direction: str) -> Optional[str]:
         """
@@ -0,0 +1,182 @@
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Set, Tuple
+
+# Árvore de caminhos mínimos a partir de uma sala:
+# (distâncias, predecessor de cada sala -> (sala anterior, direção usada))
+Tree = Tuple[Dict[str, int], Dict[str, Tuple[str, str]]]
+
+
+class WorldGraph:
+    """
+    Índice de grafo sobre as salas de um World.
+
+    As arestas de saída são lidas diretamente de Room.connections; o índice
+    mantém as arestas reversas, os componentes conexos (union-find) e um
+    cache limitado de árvores BFS por sala de origem. Quando uma passagem é
+    aberta (World.unlock), as árvores em cache são corrigidas a partir da nova
+    aresta em vez de recalculadas.
+
+    Um grafo pode ser derivado de outro com fork(): a sessão reaproveita os
+    índices do modelo compartilhado e guarda só as arestas que ela mesma abriu.
+    """
+
+    MAX_TREES = 256
+
+    def __init__(self, world, base: Optional['WorldGraph'] = None):
+        self.world = world
+        self.base = base
+        self._reverse: Dict[str, Set[str]] = {}
+        self._parent: Dict[str, str] = {}
+        self._names: Dict[str, str] = {}
+        self._trees: 'OrderedDict[str, Tree]' = OrderedDict()
+        self._owned: Set[str] = set()  # árvores que podem ser alteradas no lugar
+        if base is None:
+            self._build()
+        else:
+            # Árvores do modelo válidas neste momento; cópia só quando alguma precisar de correção
+            self._trees.update(base._trees)
+
+    def _build(self) -> None:
+        for room_id, room_name, connections in self.world.iter_links():
+            self._parent.setdefault(room_id, room_id)
+            name = room_name.casefold() if room_name else None
+            if name:
+                self._names.setdefault(name, room_id)
+            self._names.setdefault(room_id.casefold(), room_id)
+            self._names.setdefault(room_id.replace('_', ' ').casefold(), room_id)
+            for target in connections.values():
+                self._reverse.setdefault(target, set()).add(room_id)
+                self._union(room_id, target)
+
+    def fork(self, world) -> 'WorldGraph':
+        """Grafo para uma sessão que parte deste (tipicamente o do modelo compartilhado)."""
+        return WorldGraph(world, base=self)
+
+    # --- componentes (union-find) ---
+
+    def _find(self, room_id: str) -> str:
+        parent = self._parent.get(room_id)
+        if parent is None:
+            if self.base is not None:
+                root = self.base._find(room_id)
+                return root if root == room_id else self._find(root)
+            self._parent[room_id] = room_id
+            return room_id
+        if parent != room_id:
+            root = self._find(parent)
+            self._parent[room_id] = root
+            return root
+        return room_id
+
+    def _union(self, a: str, b: str) -> None:
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a != root_b:
+            self._parent[root_b] = root_a
+
+    def component(self, room_id: str) -> str:
+        """Identificador do componente (não direcionado) ao qual a sala pertence."""
+        return self._find(room_id)
+
+    def connected(self, a: str, b: str) -> bool:
+        return self._find(a) == self._find(b)
+
+    # --- consultas ---
+
+    def neighbours(self, room_id: str) -> Dict[str, str]:
+        room = self.world.get_room(room_id)
+        return room.connections if room is not None else {}
+
+    def predecessors(self, room_id: str) -> Set[str]:
+        """Salas com uma passagem que leva a esta sala."""
+        own = self._reverse.get(room_id, set())
+        if self.base is not None:
+            return own | self.base.predecessors(room_id)
+        return set(own)
+
+    def resolve_room(self, name: str) -> Optional[str]:
+        """Encontra o id de uma sala pelo id ou pelo nome (sem diferenciar maiúsculas)."""
+        key = name.strip().casefold()
+        room_id = self._names.get(key)
+        if room_id is None and self.base is not None:
+            return self.base.resolve_room(name)
+        return room_id
+
+    def _tree(self, source: str) -> Tree:
+        tree = self._trees.get(source)
+        if tree is not None:
+            self._trees.move_to_end(source)
+            return tree
+        dist = {source: 0}
+        parent: Dict[str, Tuple[str, str]] = {}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            next_dist = dist[current] + 1
+            for direction, target in self.neighbours(current).items():
+                if target not in dist:
+                    dist[target] = next_dist
+                    parent[target] = (current, direction)
+                    queue.append(target)
+        tree = (dist, parent)
+        self._trees[source] = tree
+        self._owned.add(source)
+        if len(self._trees) > self.MAX_TREES:
+            evicted, _ = self._trees.popitem(last=False)
+            self._owned.discard(evicted)
+        return tree
+
+    def distance(self, source: str, target: str) -> Optional[int]:
+        if not self.connected(source, target):
+            return None
+        return self._tree(source)[0].get(target)
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[str]]:
+        """Lista de direções do caminho mais curto, ou None se não houver caminho."""
+        if source == target:
+            return []
+        if not self.connected(source, target):
+            return None
+        dist, parent = self._tree(source)
+        if target not in dist:
+            return None
+        directions = []
+        current = target
+        while current != source:
+            current, direction = parent[current]
+            directions.append(direction)
+        directions.reverse()
+        return directions
+
+    # --- atualização incremental ---
+
+    def add_edge(self, room_id: str, direction: str, target: str) -> None:
+        """Registra uma nova passagem e corrige só as árvores que ela encurta."""
+        self._reverse.setdefault(target, set()).add(room_id)
+        self._union(room_id, target)
+        for source in list(self._trees):
+            dist, _ = self._trees[source]
+            if room_id not in dist:
+                continue
+            new_dist = dist[room_id] + 1
+            if dist.get(target, new_dist + 1) <= new_dist:
+                continue
+            self._repair(source, room_id, direction, target, new_dist)
+
+    def _repair(self, source: str, room_id: str, direction: str, target: str, new_dist: int) -> None:
+        dist, parent = self._trees[source]
+        if source not in self._owned:
+            # Árvore herdada do modelo: copia antes de alterar
+            dist, parent = dict(dist), dict(parent)
+            self._trees[source] = (dist, parent)
+            self._owned.add(source)
+        dist[target] = new_dist
+        parent[target] = (room_id, direction)
+        queue = deque([target])
+        while queue:
+            current = queue.popleft()
+            next_dist = dist[current] + 1
+            for next_direction, neighbour in self.neighbours(current).items():
+                if dist.get(neighbour, next_dist + 1) > next_dist:
+                    dist[neighbour] = next_dist
+                    parent[neighbour] = (current, next_direction)
+                    queue.append(neighbour)
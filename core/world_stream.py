@@ -0,0 +1,212 @@
+"""
+Carregamento sob demanda de mundos muito grandes.
+
+Formato em disco (diretório `world.shards/` ao lado dos outros arquivos de dados):
+
+    manifest.json          {"format": "casa-shards-1", "rooms": N, "shards": S}
+    index.tsv              uma linha por sala: id <TAB> shard <TAB> offset em bytes
+    shard_00000.ndjson     uma sala por linha: {"id": ..., "name": ..., "connections": {...}, ...}
+
+As salas são gravadas na ordem em que aparecem no mundo, que nas mansões
+geradas segue a árvore da casa: salas vizinhas tendem a cair no mesmo
+shard (região). Um ShardedRoomStore lê uma sala quando ela é pedida pela
+primeira vez, já trazendo as vizinhas, e descarta as menos usadas quando o
+orçamento de memória estoura. Salas modificadas ficam na camada da sessão
+(World.edit_room) e por isso nunca são descartadas.
+
+Uso: python -m core.world_stream DIRETÓRIO_DE_DADOS [--rooms-per-shard 10000]
+     (converte DIRETÓRIO/world.json em DIRETÓRIO/world.shards)
+"""
+import json
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional, Tuple
+
+FORMAT = "casa-shards-1"
+SHARDS_DIR = "world.shards"
+DEFAULT_BUDGET_BYTES = 64 * 2 ** 20
+# Custo estimado de um objeto Room além do texto da linha (objetos, dicionários, tuplas)
+ROOM_OVERHEAD_BYTES = 600
+_OFFSET_BITS = 40
+
+
+def write_shards(rooms: Iterable[Tuple[str, Dict[str, Any]]], out_dir: Path, rooms_per_shard: int = 10000) -> Path:
+    """Grava salas (pares id, configuração) no formato de shards NDJSON."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    count = 0
+    shard = -1
+    handle: Optional[BinaryIO] = None
+    with open(out_dir / "index.tsv", 'w', encoding='utf-8') as index:
+        for room_id, room in rooms:
+            if count % rooms_per_shard == 0:
+                if handle is not None:
+                    handle.close()
+                shard += 1
+                handle = open(out_dir / f"shard_{shard:05d}.ndjson", 'wb')
+            line = json.dumps(dict(room, id=room_id), ensure_ascii=False).encode('utf-8') + b"\n"
+            index.write(f"{room_id}\t{shard}\t{handle.tell()}\n")
+            handle.write(line)
+            count += 1
+    if handle is not None:
+        handle.close()
+    manifest = {"format": FORMAT, "rooms": count, "shards": shard + 1}
+    (out_dir / "manifest.json").write_text(json.dumps(manifest), encoding='utf-8')
+    return out_dir
+
+
+def has_shards(data_dir: Path) -> bool:
+    return (Path(data_dir) / SHARDS_DIR / "manifest.json").exists()
+
+
+class ShardedRoomStore(Mapping):
+    """
+    Mapeamento id -> Room que lê as salas dos shards sob demanda.
+    Mantém no máximo `budget_bytes` (estimados) de salas em memória, descartando
+    as menos usadas recentemente.
+    """
+
+    def __init__(self, directory: Path, budget_bytes: int = DEFAULT_BUDGET_BYTES, prefetch: bool = True):
+        self.directory = Path(directory)
+        manifest = json.loads((self.directory / "manifest.json").read_text(encoding='utf-8'))
+        if manifest.get("format") != FORMAT:
+            raise ValueError(f"{self.directory}: formato de shards desconhecido")
+        self.budget_bytes = budget_bytes
+        self.prefetch = prefetch
+        self._index: Dict[str, int] = {}
+        with open(self.directory / "index.tsv", 'r', encoding='utf-8') as f:
+            for line in f:
+                room_id, shard, offset = line.rstrip("\n").split("\t")
+                self._index[room_id] = (int(shard) << _OFFSET_BITS) | int(offset)
+        self._handles: Dict[int, BinaryIO] = {}
+        self._resident: 'OrderedDict[str, Any]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.evictions = 0
+
+    def _read(self, room_id: str) -> Tuple[Dict[str, Any], int]:
+        location = self._index[room_id]
+        shard, offset = location >> _OFFSET_BITS, location & ((1 << _OFFSET_BITS) - 1)
+        handle = self._handles.get(shard)
+        if handle is None:
+            handle = self._handles[shard] = open(self.directory / f"shard_{shard:05d}.ndjson", 'rb')
+        handle.seek(offset)
+        line = handle.readline()
+        return json.loads(line), len(line) + ROOM_OVERHEAD_BYTES
+
+    def _materialize(self, room_id: str):
+        from core.world import Room
+        config, size = self._read(room_id)
+        room = Room(
+            name=config.get('name'),
+            description=config.get('description'),
+            items=config.get('items', []),
+            quiz_id=config.get('quiz_id'),
+            puzzle_id=config.get('puzzle_id')
+        )
+        room.connections = config.get('connections', {})
+        room.freeze()
+        self._resident[room_id] = room
+        self._sizes[room_id] = size
+        self.resident_bytes += size
+        return room
+
+    def _evict(self, keep: str) -> None:
+        while self.resident_bytes > self.budget_bytes and len(self._resident) > 1:
+            room_id, _ = self._resident.popitem(last=False)
+            if room_id == keep:
+                # Nunca descarta a sala que acabou de ser pedida
+                self._resident[room_id] = _
+                continue
+            self.resident_bytes -= self._sizes.pop(room_id)
+            self.evictions += 1
+
+    def get(self, room_id: str, default=None):
+        room = self._resident.get(room_id)
+        if room is not None:
+            self._resident.move_to_end(room_id)
+            self.hits += 1
+            return room
+        if room_id not in self._index:
+            return default
+        self.misses += 1
+        room = self._materialize(room_id)
+        if self.prefetch:
+            for target in room.connections.values():
+                if target not in self._resident and target in self._index:
+                    self._materialize(target)
+                    self.prefetched += 1
+            self._resident.move_to_end(room_id)
+        self._evict(keep=room_id)
+        return room
+
+    def __getitem__(self, room_id: str):
+        room = self.get(room_id)
+        if room is None:
+            raise KeyError(room_id)
+        return room
+
+    def __contains__(self, room_id: object) -> bool:
+        return room_id in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def iter_links(self) -> Iterator[Tuple[str, Optional[str], Dict[str, str]]]:
+        """Percorre todos os shards em sequência sem guardar as salas (para montar índices)."""
+        for shard in sorted(self.directory.glob("shard_*.ndjson")):
+            with open(shard, 'rb') as f:
+                for line in f:
+                    config = json.loads(line)
+                    yield config['id'], config.get('name'), config.get('connections', {})
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "rooms": len(self._index),
+            "resident": len(self._resident),
+            "resident_bytes": self.resident_bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "prefetched": self.prefetched,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        for handle in self._handles.values():
+            handle.close()
+        self._handles.clear()
+
+
+def main(argv=None) -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description="Converte world.json para o formato de shards NDJSON")
+    parser.add_argument("data_dir")
+    parser.add_argument("--rooms-per-shard", type=int, default=10000)
+    args = parser.parse_args(argv)
+    data_dir = Path(args.data_dir)
+    with open(data_dir / "world.json", 'r', encoding='utf-8') as f:
+        world = json.load(f)
+    from core.content import ContentError, ContentRegistry
+    from core.game_state import GAME_CONFIG
+    from core.utils import load_json_data
+    # Depois da conversão o jogo não lê mais world.json: a validação completa acontece aqui
+    registry = ContentRegistry(world, load_json_data("quizzes.json", data_dir=data_dir),
+                               load_json_data("puzzles.json", data_dir=data_dir), GAME_CONFIG["start_room"])
+    if registry.errors:
+        for error in registry.errors:
+            print(f"  - {error}")
+        raise SystemExit(f"{len(registry.errors)} erro(s) no conteúdo; shards não gravados")
+    out = write_shards(world.items(), data_dir / SHARDS_DIR, args.rooms_per_shard)
+    print(f"{len(world)} salas gravadas em {out}")
+
+
+if __name__ == "__main__":
+    main()
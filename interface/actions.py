@@ -0,0 +1,122 @@
+"""
+Menu de ações (tecla -> comando) do terminal e do servidor.
+
+O menu é montado uma vez por estado: a chave do cache é a sala atual, a
+versão dela no mundo da sessão (World.room_version) e a versão do inventário
+(Inventory.version). Enquanto nada disso mudar, os turnos ('olhar', comandos
+inválidos, troca de página) reaproveitam o mesmo mapa e as mesmas linhas.
+
+As teclas seguem a ordem das colunas de planilha (a..z, aa, ab, ...), então
+uma sala pode oferecer centenas de ações. As ações fixas ficam sempre nas
+primeiras teclas e em todas as páginas; saídas, itens da sala e inventário
+são agrupados e divididos em páginas, trocadas com '>' e '<'. Qualquer tecla
+vale em qualquer página.
+"""
+from typing import Dict, List, Optional, Tuple
+from core.colors import GameColors as C
+
+PAGE_SIZE = 15  # ações agrupadas por página (as fixas não contam)
+NEXT_PAGE = '>'
+PREVIOUS_PAGE = '<'
+
+FIXED_ACTIONS = ('olhar', 'inventario', 'ajuda', 'sair')
+
+
+def menu_key(index: int) -> str:
+    """Tecla da ação na posição `index`: a..z, depois aa..az, ba.. (como colunas de planilha)."""
+    key = ""
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        key = chr(ord('a') + rest) + key
+    return key
+
+
+class ActionMenu:
+    """Menu de ações de uma sessão, guardado enquanto o estado não mudar."""
+
+    def __init__(self, page_size: int = PAGE_SIZE):
+        self.page_size = page_size
+        self.page = 0
+        self._state: Optional[tuple] = None
+        self._room: Optional[str] = None
+        self._actions: Dict[str, str] = {}
+        # (título do grupo, tecla, comando) das ações paginadas, em ordem
+        self._entries: List[Tuple[str, str, str]] = []
+        self._lines: Dict[int, List[str]] = {}
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-len(self._entries) // self.page_size))
+
+    def actions(self, game) -> Dict[str, str]:
+        """Mapa tecla -> comando de todas as ações possíveis no estado atual (de todas as páginas)."""
+        self._refresh(game)
+        return self._actions
+
+    def lines(self, game) -> List[str]:
+        """Linhas do menu na página atual."""
+        self._refresh(game)
+        lines = self._lines.get(self.page)
+        if lines is None:
+            lines = self._lines[self.page] = self._page_lines(self.page)
+        return lines
+
+    def turn_page(self, key: str) -> bool:
+        """Troca de página se `key` for '>' ou '<'; False se não for uma tecla de página."""
+        if key == NEXT_PAGE:
+            self.page = min(self.page + 1, self.pages - 1)
+        elif key == PREVIOUS_PAGE:
+            self.page = max(self.page - 1, 0)
+        else:
+            return False
+        return True
+
+    def _refresh(self, game) -> None:
+        world, inventory = game.world, game.inventory
+        room_name = game.current_room
+        state = (world, room_name, world.room_version(room_name) if world else None, inventory, inventory.version)
+        if state == self._state:
+            return
+        self._state = state
+        room = game.get_current_room_data()
+        groups = []
+        if room is not None:
+            groups.append(("Saídas", [f'mover {direction}' for direction in room.connections]))
+            groups.append(("Na sala", [f'pegar {item}' for item in room.items]))
+        groups.append(("Inventário", [f'examinar {item.name}' for item in inventory]))
+
+        self._actions = {menu_key(index): command for index, command in enumerate(FIXED_ACTIONS)}
+        self._entries = []
+        for title, commands in groups:
+            for command in commands:
+                key = menu_key(len(self._actions))
+                self._actions[key] = command
+                self._entries.append((title, key, command))
+        self._lines = {}
+        # Na mesma sala a página é mantida (pegar um item não volta à primeira)
+        if room_name != self._room:
+            self.page = 0
+        self._room = room_name
+        self.page = min(self.page, self.pages - 1)
+
+    def _page_lines(self, page: int) -> List[str]:
+        pages = self.pages
+        header = "Opções disponíveis:" if pages == 1 else f"Opções disponíveis (página {page + 1}/{pages}):"
+        lines = [f"\n{C.INFO}{header}{C.RESET}"]
+        lines.append("  " + "  ".join(f"({C.BRIGHT}{menu_key(index)}{C.NORMAL}) {command.title()}"
+                                      for index, command in enumerate(FIXED_ACTIONS)))
+        title = None
+        for group, key, command in self._entries[page * self.page_size:(page + 1) * self.page_size]:
+            if group != title:
+                title = group
+                lines.append(f"  {C.INFO}{title}:{C.RESET}")
+            lines.append(f"    ({C.BRIGHT}{key}{C.NORMAL}) {command.title()}")
+        if pages > 1:
+            turns = []
+            if page > 0:
+                turns.append(f"({C.BRIGHT}{PREVIOUS_PAGE}{C.NORMAL}) Página anterior")
+            if page < pages - 1:
+                turns.append(f"({C.BRIGHT}{NEXT_PAGE}{C.NORMAL}) Próxima página")
+            lines.append("  " + "  ".join(turns))
+        return lines
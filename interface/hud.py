@@ -4,10 +4,14 @@ class HUD:
     """Interface do usuário (Head-Up Display)"""
     
     @staticmethod
-    def show_status(game_state):
-        print(f"""{C.HEALTH}❤ Saúde: {game_state.health}  
+    def status_text(game_state):
+        return f"""{C.HEALTH}❤ Saúde: {game_state.health}  
 {C.FEAR}😨 Medo: {game_state.fear}  
-{C.LUCK}🍀 Sorte: {game_state.luck}""")
+{C.LUCK}🍀 Sorte: {game_state.luck}"""
+
+    @staticmethod
+    def show_status(game_state):
+        print(HUD.status_text(game_state))
     
     @staticmethod
     def show_inventory(items):
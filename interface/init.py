@@ -1,4 +1,6 @@
+from .actions import ActionMenu
 from .hud import HUD
 from .menu import MainMenu
+from .text_stream import TextStreamer
 
-__all__ = ['HUD', 'MainMenu']
+__all__ = ['ActionMenu', 'HUD', 'MainMenu', 'TextStreamer']
@@ -1,11 +1,18 @@
 from core.colors import GameColors as C
-import time
-import os
+from interface.renderer import clear_screen
+from interface.text_stream import DEFAULT_FPS, TextStreamer
 
 class MainMenu:
+    # (texto, cor, pausa em segundos depois da linha)
+    INTRO_LINES = [
+        ("A casa aguarda...", C.DANGER, 1),
+        ("Os corredores sussurram segredos...", C.DARK_AREA, 1),
+        ("Você está preparado para a verdade?", C.BLOOD, 2),
+    ]
+
     @staticmethod
     def clear_screen():
-        os.system('cls' if os.name == 'nt' else 'clear')
+        clear_screen()
 
     @staticmethod
     def show():
@@ -55,20 +62,38 @@ class MainMenu:
         input(C.format("\nPressione ENTER para voltar...", C.WARNING))
 
     @staticmethod
-    def typewriter(text, color=C.NORMAL, delay=0.03):
-        for char in text:
-            print(C.format(char, color), end='', flush=True)
-            time.sleep(delay)
-        print()
+    def typewriter(text, color=C.NORMAL, delay=0.03, streamer=None):
+        """Escreve o texto com efeito de máquina de escrever (vários caracteres por write; ENTER pula)."""
+        streamer = streamer or TextStreamer(cps=1 / delay)
+        streamer.type(text, color)
+
+    @staticmethod
+    async def typewriter_async(write, text, color=C.NORMAL, delay=0.03, streamer=None):
+        """
+        Versão assíncrona do typewriter: escreve através de `write` (uma corrotina)
+        e cede o loop de eventos entre os quadros em vez de bloquear.
+        """
+        streamer = streamer or TextStreamer(speed="normal", cps=1 / delay, key_pressed=None)
+        await streamer.type_async(write, text, color)
 
     @staticmethod
-    def show_intro():
+    def show_intro(streamer=None):
         MainMenu.clear_screen()
         print("\n")
-        MainMenu.typewriter("A casa aguarda...", C.DANGER)
-        time.sleep(1)
-        MainMenu.typewriter("Os corredores sussurram segredos...", C.DARK_AREA)
-        time.sleep(1)
-        MainMenu.typewriter("Você está preparado para a verdade?", C.BLOOD)
-        time.sleep(2)
-        input(C.format("\nPressione ENTER para entrar...", C.WARNING))
\ No newline at end of file
+        streamer = streamer or TextStreamer()
+        for text, color, pause in MainMenu.INTRO_LINES:
+            streamer.type(text, color)
+            streamer.pause(pause)
+        input(C.format("\nPressione ENTER para entrar...", C.WARNING))
+
+    @staticmethod
+    async def show_intro_async(write, delay=0.03, pause_scale=1.0, streamer=None, fps=DEFAULT_FPS):
+        """
+        Exibe a introdução sem bloquear outras sessões. Com um `streamer`, quem
+        chama pode pulá-la (streamer.skip()) enquanto ela é escrita.
+        """
+        streamer = streamer or TextStreamer(speed="normal", cps=1 / delay, fps=fps, key_pressed=None)
+        await write("\n\n")
+        for text, color, pause in MainMenu.INTRO_LINES:
+            await streamer.type_async(write, text, color)
+            await streamer.pause_async(pause * pause_scale)
@@ -0,0 +1,132 @@
+import os
+import shutil
+import sys
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, TextIO
+from core.metrics import inc, timed
+from core.utils import strip_ansi
+
+CLEAR = "\x1b[H\x1b[2J"
+# Cada linha termina sem estilo ativo, para a cor não vazar para a linha seguinte
+RESET = "\x1b[0m"
+
+
+def _output_stream() -> TextIO:
+    # No Windows o texto passa pelo wrapper do colorama, que traduz as sequências ANSI;
+    # nos outros sistemas escrevemos direto, sem o reset automático a cada write.
+    if os.name == 'nt':
+        return sys.stdout
+    return sys.__stdout__ or sys.stdout
+
+
+def clear_screen(stream: Optional[TextIO] = None) -> None:
+    """Limpa a tela com uma sequência ANSI (sem abrir um processo de shell)."""
+    stream = stream or _output_stream()
+    if stream.isatty():
+        stream.write(CLEAR)
+        stream.flush()
+
+
+@lru_cache(maxsize=2048)
+def display_width(text: str) -> int:
+    """Largura visível de uma linha no terminal (sem códigos de cor; caracteres largos contam 2)."""
+    width = 0
+    for char in strip_ansi(text):
+        if unicodedata.combining(char):
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in ('W', 'F') else 1
+    return width
+
+
+class FrameRenderer:
+    """
+    Desenha a tela inteira como um quadro.
+
+    O quadro (HUD, sala, mensagens, menu) é montado em uma lista de linhas e
+    comparado com o anterior: só as linhas que mudaram são reescritas, com
+    posicionamento de cursor ANSI, em um único write. No modo 'plain' (saída
+    redirecionada ou NO_COLOR) o quadro é escrito inteiro, sem cores nem
+    sequências de controle.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, mode: str = 'auto'):
+        self.stream = stream or _output_stream()
+        if mode == 'auto':
+            mode = 'ansi' if self.stream.isatty() and not os.environ.get('NO_COLOR') else 'plain'
+        self.mode = mode
+        self._previous: Optional[List[str]] = None
+        self._size = None
+        self.frames = 0
+        self.bytes_written = 0
+        self.render_time = 0.0
+
+    @staticmethod
+    def compose(*sections: Iterable[str]) -> List[str]:
+        """Junta seções de linhas em um quadro (textos com '\\n' viram várias linhas)."""
+        lines: List[str] = []
+        for section in sections:
+            for text in section:
+                lines.extend(text.split("\n"))
+        return lines
+
+    def invalidate(self) -> None:
+        """Força o próximo quadro a ser desenhado por inteiro (ex.: depois de outra saída na tela)."""
+        self._previous = None
+
+    def _rows(self, line: str, columns: int) -> int:
+        return max(1, -(-display_width(line) // columns))
+
+    def _diff(self, lines: List[str]) -> str:
+        size = shutil.get_terminal_size()
+        columns = size.columns
+        heights = [self._rows(line, columns) for line in lines]
+        previous = self._previous
+        # Quadros mais altos que a tela rolam e invalidam as posições absolutas
+        if previous is None or size != self._size or sum(heights) >= size.lines:
+            self._size = size
+            return CLEAR + (RESET + "\n").join(lines) + RESET + "\x1b[J\n"
+
+        out = []
+        row = 1
+        for index, line in enumerate(lines):
+            old = previous[index] if index < len(previous) else None
+            if old != line:
+                if old is not None and self._rows(old, columns) != heights[index]:
+                    # A linha mudou de altura: tudo abaixo dela se desloca
+                    out.append(f"\x1b[{row};1H\x1b[J" + (RESET + "\n").join(lines[index:]) + RESET + "\x1b[J\n")
+                    return "".join(out)
+                out.append(f"\x1b[{row};1H{line}{RESET}\x1b[K")
+            row += heights[index]
+        # Limpa o que sobrou do quadro anterior (e o prompt/eco da última entrada)
+        out.append(f"\x1b[{row};1H\x1b[J")
+        return "".join(out)
+
+    @timed("casa_render_seconds")
+    def render(self, lines: List[str]) -> int:
+        """Desenha um quadro; retorna o número de caracteres escritos."""
+        start = time.perf_counter()
+        if self.mode == 'ansi':
+            payload = self._diff(lines)
+        else:
+            payload = "\n".join(strip_ansi(line) for line in lines) + "\n"
+        self._previous = lines
+        self.stream.write(payload)
+        self.stream.flush()
+        self.render_time += time.perf_counter() - start
+        self.frames += 1
+        size = len(payload.encode('utf-8'))
+        self.bytes_written += size
+        inc("casa_render_bytes_total", size)
+        return len(payload)
+
+    def stats(self) -> Dict[str, float]:
+        """Custo médio de desenho e bytes por quadro (para medir a latência por turno)."""
+        frames = self.frames or 1
+        return {
+            "frames": self.frames,
+            "bytes": self.bytes_written,
+            "bytes_per_frame": self.bytes_written / frames,
+            "render_us": self.render_time / frames * 1e6,
+        }
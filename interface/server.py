@@ -0,0 +1,194 @@
+import asyncio
+import itertools
+from typing import Any, Dict, List, Optional
+from core.engine import GameEngine
+from core.colors import GameColors as C
+from interface.actions import ActionMenu
+from interface.game_interface import GameInterface
+from interface.hud import HUD
+from interface.menu import MainMenu
+from interface.text_stream import TextStreamer
+
+PROMPT = f"\n{C.INFO}Escolha sua ação: {C.RESET}"
+
+
+class GameSession:
+    """
+    Uma sessão de jogo ligada a uma conexão TCP.
+    Cada sessão tem seu próprio GameState; a leitura da entrada é assíncrona,
+    então um jogador parado não trava os demais.
+    """
+
+    def __init__(self, session_id: int, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 idle_timeout: float = 300.0, intro: bool = True, typewriter_delay: float = 0.03,
+                 text_speed: str = "normal", telemetry=None):
+        self.session_id = session_id
+        self.reader = reader
+        self.writer = writer
+        self.idle_timeout = idle_timeout
+        self.intro = intro
+        self.typewriter_delay = typewriter_delay
+        # Texto animado em quadros (vários caracteres por write); 'fast'/'instant' escrevem cada linha de uma vez
+        self.streamer = TextStreamer(speed=text_speed if typewriter_delay > 0 else "instant",
+                                     cps=1 / typewriter_delay if typewriter_delay > 0 else 1.0, key_pressed=None)
+        self.engine = GameEngine(telemetry=telemetry, source="server")
+        self.menu = ActionMenu()
+        self.turns = 0
+        # Semente e linhas recebidas bastam para reproduzir a sessão com GameEngine(seed=...).replay(log)
+        self.seed = self.engine.game.seed
+        self.log: List[str] = []
+
+    def stats(self) -> Dict[str, Any]:
+        """Resumo da sessão com as métricas dela (GameEngine.metrics)."""
+        return {
+            "session": self.session_id,
+            "seed": self.seed,
+            "turns": self.turns,
+            "metrics": self.engine.metrics.snapshot(),
+        }
+
+    async def write(self, text: str) -> None:
+        # Terminais telnet esperam CRLF
+        self.writer.write(text.replace("\n", "\r\n").encode('utf-8'))
+        await self.writer.drain()
+
+    async def read_line(self) -> Optional[str]:
+        """Lê uma linha do jogador; retorna None se a conexão cair ou ficar ociosa demais."""
+        try:
+            data = await asyncio.wait_for(self.reader.readline(), timeout=self.idle_timeout)
+        except asyncio.TimeoutError:
+            await self.write(f"\n{C.WARNING}Sessão encerrada por inatividade.{C.RESET}\n")
+            return None
+        if not data:
+            return None
+        return data.decode('utf-8', errors='ignore').strip()
+
+    async def show_intro(self) -> bool:
+        """
+        Exibe a introdução animada; uma linha enviada pelo jogador durante a
+        animação (ENTER) despeja o resto de uma vez. Retorna False se a conexão cair.
+        """
+        intro = asyncio.ensure_future(MainMenu.show_intro_async(self.write, streamer=self.streamer))
+        key = asyncio.ensure_future(self.reader.readline())
+        done, _ = await asyncio.wait((intro, key), return_when=asyncio.FIRST_COMPLETED)
+        if key in done:
+            if not key.result():
+                intro.cancel()
+                return False
+            self.streamer.skip()
+        else:
+            # O readline cancelado não consome o que já chegou: a linha fica para o jogo
+            key.cancel()
+        await intro
+        return True
+
+    def frame(self) -> str:
+        """Compõe o status, a sala e o menu de ações em um único bloco de texto."""
+        game = self.engine.game
+        lines = [HUD.status_text(game)]
+        lines.extend(GameInterface.room_lines(game.get_current_room_data()))
+        lines.extend(self.menu.lines(game))
+        return "\n".join(lines) + PROMPT
+
+    async def run(self) -> None:
+        if not self.engine.running:
+            await self.write(f"\n{C.DANGER}Erro fatal: O mundo do jogo não pôde ser carregado.{C.RESET}\n")
+            return
+
+        if self.intro and not await self.show_intro():
+            return
+        await self.write(C.format("\n=== CASA ABANDONADA - ECOS DO MEDO ===", C.TITLE) + "\n")
+
+        while self.engine.running:
+            await self.write(self.frame())
+            line = await self.read_line()
+            if line is None:
+                break
+            if self.menu.turn_page(line.lower()):
+                continue
+            # Aceita tanto a tecla do menu quanto o comando por extenso
+            cmd = self.menu.actions(self.engine.game).get(line.lower(), line)
+
+            self.log.append(cmd)
+            results = self.engine.execute_line(cmd)
+            self.turns += len(results)
+            messages = [message for result in results for message in result.messages]
+            if messages:
+                await self.write("\n".join(messages) + "\n")
+            if results[-1].ending:
+                await self.write(f"\n{C.DANGER}Fim de jogo.{C.RESET}\n")
+                break
+
+
+class GameServer:
+    """Servidor asyncio que hospeda muitas sessões de jogo em um único processo."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 4000, idle_timeout: float = 300.0,
+                 intro: bool = True, typewriter_delay: float = 0.03, max_sessions: int = 1000,
+                 text_speed: str = "normal", telemetry=None):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.intro = intro
+        self.typewriter_delay = typewriter_delay
+        self.text_speed = text_speed
+        # core.telemetry.TelemetryWriter compartilhado pelas sessões (None: sem telemetria)
+        self.telemetry = telemetry
+        self.max_sessions = max_sessions
+        self.sessions: Dict[int, GameSession] = {}
+        self._ids = itertools.count(1)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(f"{C.WARNING}Servidor lotado. Tente novamente mais tarde.{C.RESET}\r\n".encode('utf-8'))
+            await writer.drain()
+            writer.close()
+            return
+
+        session = GameSession(next(self._ids), reader, writer, self.idle_timeout,
+                              self.intro, self.typewriter_delay, self.text_speed, self.telemetry)
+        self.sessions[session.session_id] = session
+        try:
+            await session.run()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            print(f"{C.DANGER}Erro na sessão {session.session_id} (semente {session.seed}): {e!r}{C.RESET}")
+            print(f"{C.DANGER}Comandos: {session.log}{C.RESET}")
+        finally:
+            session.engine.close("disconnect")
+            del self.sessions[session.session_id]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Resumo de cada sessão aberta, com as métricas só dela (o processo todo fica em metrics.REGISTRY)."""
+        return [session.stats() for session in self.sessions.values()]
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        # Porta 0 escolhe uma porta livre; guardamos a porta real
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        print(f"{C.SUCCESS}Servidor da Casa Abandonada ouvindo em {self.host}:{self.port}{C.RESET}")
+        async with self._server:
+            await self._server.serve_forever()
+
+
+def run_server(host: str = "127.0.0.1", port: int = 4000, **options) -> None:
+    """Inicia o servidor e bloqueia até Ctrl+C."""
+    try:
+        asyncio.run(GameServer(host, port, **options).serve_forever())
+    except KeyboardInterrupt:
+        print(f"\n{C.WARNING}Servidor encerrado.{C.RESET}")
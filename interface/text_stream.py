@@ -0,0 +1,187 @@
+"""
+Efeito de máquina de escrever com ritmo por quadros.
+
+Em vez de um write, um flush e um sleep por caractere, o texto é dividido em
+pedaços de um quadro (vários caracteres por write, a cor aplicada uma vez por
+pedaço) e cada pedaço sai no seu instante do relógio, sem acumular atraso.
+Uma tecla (ENTER no terminal, uma linha recebida no servidor) ou o ajuste
+'fast' despeja o resto de uma vez; no modo 'instant' (saída redirecionada,
+roteiros, testes) tudo é escrito sem pausas.
+
+O mesmo TextStreamer serve ao terminal (type/pause, bloqueantes) e ao
+servidor (type_async/pause_async, que cedem o loop de eventos).
+"""
+import os
+import sys
+import time
+from typing import Awaitable, Callable, List, Optional, TextIO
+from core.colors import GameColors as C
+from core.metrics import inc
+
+# Caracteres por segundo do efeito (um a cada 30 ms, como o typewriter original)
+DEFAULT_CPS = 1 / 0.03
+# Quadros por segundo: cada quadro é um único write com os caracteres do intervalo
+DEFAULT_FPS = 12.0
+SPEEDS = ("normal", "fast", "instant")
+
+
+def stdin_key_pressed() -> bool:
+    """
+    Houve uma tecla no terminal desde a última consulta? Não bloqueia. No Windows
+    vale qualquer tecla; nos outros sistemas o terminal entrega a linha no ENTER.
+    A entrada usada para pular é consumida.
+    """
+    stdin = sys.stdin
+    if stdin is None or not stdin.isatty():
+        return False
+    if os.name == 'nt':
+        import msvcrt
+        if not msvcrt.kbhit():
+            return False
+        while msvcrt.kbhit():
+            msvcrt.getwch()
+        return True
+    import select
+    ready, _, _ = select.select([stdin], [], [], 0)
+    if not ready:
+        return False
+    stdin.readline()
+    return True
+
+
+class TextStreamer:
+    """
+    Escreve texto no ritmo de `cps` caracteres por segundo, em `fps` writes por segundo.
+
+    speed: 'normal' (efeito completo), 'fast' (cada texto de uma vez, sem as
+    pausas entre linhas) ou 'instant' (o mesmo, para saídas sem terminal).
+    Padrão: CASA_TEXT_SPEED, ou 'normal' em um terminal e 'instant' fora dele.
+    key_pressed: consultada a cada quadro; se retornar True, o resto sai de uma vez
+    e as próximas linhas e pausas também (até reset()). sleep/clock podem ser
+    trocados por um relógio falso (benchmarks).
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, speed: Optional[str] = None,
+                 cps: float = DEFAULT_CPS, fps: float = DEFAULT_FPS,
+                 key_pressed: Optional[Callable[[], bool]] = stdin_key_pressed,
+                 sleep: Callable[[float], None] = time.sleep, clock: Callable[[], float] = time.perf_counter):
+        self.stream = stream or sys.stdout
+        if speed is None:
+            speed = os.environ.get("CASA_TEXT_SPEED") or ("normal" if self.stream.isatty() else "instant")
+        if speed not in SPEEDS:
+            raise ValueError(f"velocidade de texto desconhecida: {speed!r} (use {', '.join(SPEEDS)})")
+        self.speed = speed
+        self.cps = cps
+        self.fps = fps
+        self.key_pressed = key_pressed
+        self._sleep = sleep
+        self._clock = clock
+        self.skipped = speed != "normal"
+        self.writes = 0
+        self.bytes_written = 0
+
+    def skip(self) -> None:
+        """Despeja o resto do texto atual e dispensa o efeito até reset()."""
+        self.skipped = True
+
+    def reset(self) -> None:
+        """Volta ao efeito completo (se a velocidade for 'normal')."""
+        self.skipped = self.speed != "normal"
+
+    def _slices(self, text: str) -> List[str]:
+        per_frame = self.cps / self.fps
+        pieces = []
+        start = 0
+        frame = 1
+        while start < len(text):
+            end = max(start + 1, min(len(text), round(frame * per_frame)))
+            pieces.append(text[start:end])
+            start = end
+            frame += 1
+        return pieces
+
+    def chunks(self, text: str, color: str = C.NORMAL) -> List[str]:
+        """Pedaços de um quadro cada, já com a cor (um estilo e um reset por pedaço, não por caractere)."""
+        return [C.format(piece, color) for piece in self._slices(text)]
+
+    def _count(self, data: str) -> None:
+        self.writes += 1
+        self.bytes_written += len(data)
+        inc("casa_text_stream_writes_total")
+
+    def _poll(self) -> None:
+        if not self.skipped and self.key_pressed is not None and self.key_pressed():
+            self.skipped = True
+
+    def type(self, text: str, color: str = C.NORMAL, end: str = "\n") -> None:
+        """Escreve o texto no ritmo do efeito, bloqueando até o fim (ou até ser pulado)."""
+        pieces = self._slices(text)
+        interval = 1 / self.fps
+        deadline = self._clock()
+        for index, piece in enumerate(pieces):
+            self._poll()
+            if self.skipped:
+                rest = C.format("".join(pieces[index:]), color) + end
+                self.stream.write(rest)
+                self.stream.flush()
+                self._count(rest)
+                return
+            data = C.format(piece, color) + (end if index == len(pieces) - 1 else "")
+            self.stream.write(data)
+            self.stream.flush()
+            self._count(data)
+            if index < len(pieces) - 1:
+                # Prazos absolutos: o tempo gasto escrevendo não atrasa o próximo quadro
+                deadline += interval
+                delay = deadline - self._clock()
+                if delay > 0:
+                    self._sleep(delay)
+        if not pieces and end:
+            self.stream.write(end)
+            self.stream.flush()
+            self._count(end)
+
+    def pause(self, seconds: float) -> None:
+        """Pausa entre linhas, interrompida por uma tecla (e dispensada se o efeito foi pulado)."""
+        deadline = self._clock() + seconds
+        interval = 1 / self.fps
+        while not self.skipped:
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                return
+            self._sleep(min(interval, remaining))
+            self._poll()
+
+    async def type_async(self, write: Callable[[str], Awaitable[None]], text: str,
+                         color: str = C.NORMAL, end: str = "\n") -> None:
+        """Como type(), escrevendo por `write` (uma corrotina) e cedendo o loop entre os quadros."""
+        import asyncio  # só o servidor usa as versões assíncronas
+        pieces = self._slices(text)
+        interval = 1 / self.fps
+        deadline = self._clock()
+        for index, piece in enumerate(pieces):
+            if self.skipped:
+                rest = C.format("".join(pieces[index:]), color) + end
+                self._count(rest)
+                await write(rest)
+                return
+            data = C.format(piece, color) + (end if index == len(pieces) - 1 else "")
+            self._count(data)
+            await write(data)
+            if index < len(pieces) - 1:
+                deadline += interval
+                await asyncio.sleep(max(0.0, deadline - self._clock()))
+        if not pieces and end:
+            self._count(end)
+            await write(end)
+
+    async def pause_async(self, seconds: float) -> None:
+        """Pausa assíncrona, encurtada se skip() for chamado durante a espera."""
+        import asyncio
+        deadline = self._clock() + seconds
+        interval = 1 / self.fps
+        while not self.skipped:
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(interval, remaining))
@@ -1,18 +1,20 @@
 import os
 import sys
-from colorama import init, Fore, Back, Style
-
-# Inicializa o colorama para que as cores funcionem no Windows
-init(autoreset=True)
+import time
+from pathlib import Path
+from typing import Optional
+from colorama import Fore, Back, Style
 
 class MainGame:
     """Classe principal para iniciar e gerir o fluxo do jogo."""
     
-    def __init__(self):
+    def __init__(self, audio: Optional[str] = "auto", telemetry=None):
         # A importação aqui garante que GameInterface só é carregado se o programa começar
         try:
             from interface.game_interface import GameInterface
-            self.game_interface = GameInterface()
+            from core.audio import AudioSystem
+            # Os sons são pré-carregados em segundo plano enquanto o menu é exibido
+            self.game_interface = GameInterface(audio=AudioSystem(audio) if audio else None, telemetry=telemetry)
         except ImportError as e:
             print(f"{Fore.RED}Erro: Não foi possível importar os módulos necessários. Verifique se todos os arquivos estão na estrutura correta.")
             print(f"{Fore.RED}Detalhes do erro: {e}")
@@ -22,7 +24,8 @@ class MainGame:
     
     def clear_screen(self):
         """Limpa a tela de forma cross-platform."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        from interface.renderer import clear_screen
+        clear_screen()
     
     def show_main_menu(self):
         """Exibe o menu principal do jogo."""
@@ -39,11 +42,12 @@ class MainGame:
         """Processa a escolha do menu do jogador."""
         if choice == '1':
             print(f"{Fore.GREEN}Iniciando uma nova aventura...")
+            from core.game_state import GameState
+            self.game_interface.set_game(GameState())
+            self.game_interface.start_autosave(time.strftime("jogo_%Y%m%d_%H%M%S"))
             self.game_interface.game_loop()
         elif choice == '2':
-            # Implementação futura: carregar jogo salvo
-            print(f"{Fore.YELLOW}Funcionalidade de carregar jogo ainda não implementada.")
-            input("Pressione ENTER para voltar ao menu...")
+            self.load_saved_game()
         elif choice == '3':
             print(f"{Fore.RED}Saindo do jogo. Até a próxima!")
             self.running = False
@@ -51,17 +55,158 @@ class MainGame:
             print(f"{Fore.RED}Opção inválida. Tente novamente.")
             input("Pressione ENTER para continuar...")
 
+    def load_saved_game(self):
+        """Lista os slots salvos (pelo índice) e continua o escolhido."""
+        from core.save_system import SaveManager
+        manager = SaveManager()
+        slots = manager.list_slots()
+        if not slots:
+            print(f"{Fore.YELLOW}Nenhum jogo salvo encontrado.")
+            input("Pressione ENTER para voltar ao menu...")
+            return
+        print(f"{Fore.CYAN}\nJogos salvos:")
+        for number, meta in enumerate(slots, 1):
+            updated = time.strftime("%d/%m/%Y %H:%M", time.localtime(meta.get("updated", 0)))
+            print(f"{Fore.WHITE}{number}. {meta['slot']} - {meta['room']} (turno {meta['turn']}, "
+                  f"saúde {meta['health']}, medo {meta['fear']}) - {updated}")
+        choice = input("Escolha um jogo (ENTER para voltar): ").strip()
+        if not choice.isdigit() or not 1 <= int(choice) <= len(slots):
+            return
+        slot = slots[int(choice) - 1]['slot']
+        game = manager.load(slot)
+        if game is None:
+            print(f"{Fore.RED}Não foi possível carregar o jogo '{slot}'.")
+            input("Pressione ENTER para voltar ao menu...")
+            return
+        self.game_interface.set_game(game)
+        self.game_interface.start_autosave(slot, manager)
+        self.game_interface.game_loop()
+
     def run(self):
         """Loop principal do menu do jogo."""
         while self.running:
             self.show_main_menu()
             choice = input("Escolha uma opção: ").strip()
             self.handle_menu_choice(choice)
+        if self.game_interface.audio is not None:
+            self.game_interface.audio.close()
             
-if __name__ == "__main__":
+def run_batch(directory, pattern="*.txt", repeat=1, transcripts=None, seed=None, telemetry=None):
+    """
+    Reproduz em modo headless todos os roteiros de comandos de um diretório
+    e reporta a vazão (roteiros/s e turnos/s). Com `seed`, cada roteiro usa a
+    mesma semente e a execução é reproduzível.
+    """
+    from core.engine import GameEngine
+
+    scripts = sorted(Path(directory).glob(pattern))
+    if not scripts:
+        print(f"{Fore.RED}Nenhum roteiro '{pattern}' encontrado em {directory}.")
+        return 1
+    sources = [(path, path.read_text(encoding='utf-8').splitlines()) for path in scripts]
+
+    if transcripts:
+        Path(transcripts).mkdir(parents=True, exist_ok=True)
+
+    total_scripts = 0
+    total_turns = 0
+    endings = {}
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for path, lines in sources:
+            engine = GameEngine(seed=seed, telemetry=telemetry, source="batch")
+            result = engine.replay(lines, name=path.name)
+            engine.close()
+            total_scripts += 1
+            total_turns += len(result.turns)
+            endings[result.ending] = endings.get(result.ending, 0) + 1
+            if transcripts:
+                (Path(transcripts) / f"{path.stem}.log").write_text(result.transcript() + "\n", encoding='utf-8')
+    elapsed = time.perf_counter() - start
+
+    print(f"{Fore.GREEN}Roteiros executados: {total_scripts} ({len(scripts)} arquivos x {repeat})")
+    print(f"{Fore.GREEN}Turnos executados: {total_turns}")
+    print(f"{Fore.CYAN}Tempo total: {elapsed:.3f}s")
+    print(f"{Fore.CYAN}Vazão: {total_scripts / elapsed:,.0f} roteiros/s | {total_turns / elapsed:,.0f} turnos/s")
+    print(f"{Fore.CYAN}Roteiros por minuto: {total_scripts / elapsed * 60:,.0f}")
+    summary = ', '.join(f"{ending or 'nenhum'}={count}" for ending, count in endings.items())
+    print(f"{Fore.WHITE}Finais: {summary}")
+    return 0
+
+
+def parse_args(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Casa Abandonada - um jogo de terror psicológico")
+    parser.add_argument("--batch", metavar="DIR", help="reproduz em modo headless os roteiros de comandos do diretório")
+    parser.add_argument("--pattern", default="*.txt", help="padrão dos arquivos de roteiro (padrão: *.txt)")
+    parser.add_argument("--repeat", type=int, default=1, help="quantas vezes reproduzir cada roteiro (teste de carga)")
+    parser.add_argument("--transcripts", metavar="DIR", help="grava a transcrição de cada roteiro neste diretório")
+    parser.add_argument("--seed", type=int, help="semente dos eventos aleatórios de cada roteiro (reproduz a execução)")
+    parser.add_argument("--build-pack", action="store_true", help="compila data/*.json no pacote de conteúdo binário e sai")
+    parser.add_argument("--serve", metavar="[HOST:]PORTA", help="hospeda o jogo como serviço TCP (estilo telnet) para vários jogadores")
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="segundos de inatividade até encerrar uma sessão do servidor")
+    parser.add_argument("--no-intro", action="store_true", help="pula a introdução animada nas sessões do servidor")
+    parser.add_argument("--text-speed", choices=("normal", "fast", "instant"),
+                        help="velocidade do texto animado (padrão: CASA_TEXT_SPEED ou normal; 'fast' escreve cada linha de uma vez)")
+    parser.add_argument("--audio", choices=("auto", "pygame", "null"),
+                        help="backend de som (padrão: CASA_AUDIO ou auto, que usa o pygame se estiver instalado)")
+    parser.add_argument("--profile", metavar="ARQUIVO", nargs="?", const="casa.prof",
+                        help="executa sob o cProfile, grava as estatísticas (padrão: casa.prof) e mostra o custo por turno")
+    parser.add_argument("--telemetry", metavar="DIR",
+                        help="grava um evento por turno em arquivos NDJSON no diretório (padrão: CASA_TELEMETRY); "
+                             "relatório com python -m core.telemetry DIR")
+    parser.add_argument("--metrics", metavar="ARQUIVO", help="ao sair, grava as métricas de latência (.prom: Prometheus; senão JSON)")
+    return parser.parse_args(argv)
+
+
+def run(args):
+    """Executa o modo escolhido na linha de comando; retorna o código de saída."""
+    # Inicializa o colorama para que as cores funcionem no Windows (antes da primeira saída)
+    from core.colors import init_output
+    init_output()
+    if args.build_pack:
+        from core.content_pack import build_pack, ContentPackError
+        from core.utils import DATA_DIR
+        try:
+            print(f"{Fore.GREEN}Pacote de conteúdo gerado em {build_pack(DATA_DIR)}")
+        except ContentPackError as e:
+            print(f"{Fore.RED}{e}")
+            return 1
+        return 0
+    telemetry = None
+    telemetry_dir = args.telemetry or os.environ.get("CASA_TELEMETRY")
+    if telemetry_dir:
+        from core.telemetry import TelemetryWriter
+        telemetry = TelemetryWriter(Path(telemetry_dir))
     try:
-        game = MainGame()
-        game.run()
-    except Exception as e:
-        print(f"{Fore.RED}\nOcorreu um erro fatal durante a execução do jogo: {e}")
-        input("O programa será encerrado. Pressione ENTER para sair.")
+        if args.batch:
+            return run_batch(args.batch, args.pattern, args.repeat, args.transcripts, args.seed, telemetry)
+        if args.serve:
+            from interface.server import run_server
+            host, _, port = args.serve.rpartition(":")
+            run_server(host or "127.0.0.1", int(port), idle_timeout=args.idle_timeout, intro=not args.no_intro,
+                       text_speed=args.text_speed or os.environ.get("CASA_TEXT_SPEED", "normal"),
+                       telemetry=telemetry)
+            return 0
+        try:
+            game = MainGame(audio=args.audio or os.environ.get("CASA_AUDIO", "auto"), telemetry=telemetry)
+            game.run()
+        except Exception as e:
+            print(f"{Fore.RED}\nOcorreu um erro fatal durante a execução do jogo: {e}")
+            input("O programa será encerrado. Pressione ENTER para sair.")
+        return 0
+    finally:
+        if telemetry is not None:
+            telemetry.close()
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.profile:
+        from core.metrics import run_profiled
+        code = run_profiled(lambda: run(args), args.profile)
+    else:
+        code = run(args)
+    if args.metrics:
+        from core.metrics import REGISTRY
+        REGISTRY.write(args.metrics)
+    sys.exit(code)
@@ -0,0 +1,54 @@
+"""Testes do AudioSystem (core.audio) com o backend de gravação."""
+from core.audio import AudioSystem, RecordingBackend
+
+CUES = {"random_event": "event.mp3", "nightfall": "monster.mp3"}
+
+
+def recording_audio(tmp_path, cues=CUES, **kwargs):
+    for name in set(cues.values()):
+        (tmp_path / name).write_bytes(b"som")
+    backend = RecordingBackend()
+    return AudioSystem(backend, sounds_dir=tmp_path, cues=cues, **kwargs), backend
+
+
+def test_preloaded_cue_plays_immediately(tmp_path):
+    audio, backend = recording_audio(tmp_path)
+    audio.wait()
+    assert audio.play("random_event")
+    assert [cue for cue, _ in backend.played] == ["random_event"]
+    assert audio.stats()["decodes"] == 2
+    audio.close()
+
+
+def test_cue_before_decode_plays_from_background(tmp_path):
+    audio, backend = recording_audio(tmp_path, preload=False)
+    assert not audio.play("nightfall")
+    audio.wait()
+    assert [cue for cue, _ in backend.played] == ["nightfall"]
+    assert audio.stats()["misses"] == 1
+    audio.close()
+
+
+def test_unknown_cue_is_ignored(tmp_path):
+    audio, backend = recording_audio(tmp_path)
+    audio.wait()
+    assert not audio.play("trovao")
+    assert backend.played == []
+    audio.close()
+
+
+def test_missing_file_is_marked_failed(tmp_path):
+    (tmp_path / "event.mp3").write_bytes(b"som")
+    backend = RecordingBackend()
+    audio = AudioSystem(backend, sounds_dir=tmp_path, cues=CUES)
+    audio.wait()
+    assert "monster.mp3" in audio.stats()["failed"]
+    assert not audio.play("nightfall")
+    assert audio.play("random_event")
+    audio.close()
+
+
+def test_close_stops_background_thread(tmp_path):
+    audio, _ = recording_audio(tmp_path)
+    audio.close()
+    assert not audio._thread.is_alive()
@@ -0,0 +1,35 @@
+"""Testes da interpretação de comandos (core.command_system)."""
+from core.command_system import CommandSystem, VerbTrie
+
+
+def test_trie_resolves_unique_prefixes():
+    trie = VerbTrie(CommandSystem.VERBS)
+    assert trie.resolve("exa") == "examine"
+    assert trie.resolve("peg") == "take"
+    assert trie.resolve("reso") == "solve"
+    assert trie.resolve("inve") == "inventory"
+
+
+def test_trie_rejects_ambiguous_and_unknown_prefixes():
+    trie = VerbTrie(CommandSystem.VERBS)
+    assert trie.resolve("re") is None  # resolver, responder, refazer
+    assert trie.resolve("i") is None  # ir, inspecionar, inventario
+    assert trie.resolve("") is None
+    assert trie.resolve("xyz") is None
+    assert trie.resolve("olharr") is None
+
+
+def test_prefix_shared_by_verbs_of_one_action_is_not_ambiguous():
+    trie = VerbTrie({"inventario": "inventory", "inv": "inventory", "ir": "move"})
+    assert trie.resolve("in") == "inventory"
+    trie.insert("inspecionar", "examine")
+    assert trie.resolve("in") is None
+    assert trie.resolve("ins") == "examine"
+
+
+def test_parse_uses_exact_verbs_before_prefixes():
+    # 'ir' é também prefixo de outros verbos, mas é um verbo completo
+    assert CommandSystem.parse("ir norte") == {"action": "move", "target": "norte"}
+    assert CommandSystem.parse("EXA  espelho") == {"action": "examine", "target": "espelho"}
+    assert CommandSystem.parse("re algo") == {"action": "unknown", "original": "re algo"}
+    assert CommandSystem.parse("   ") is None
@@ -0,0 +1,30 @@
+"""Testes dos efeitos de itens (core.effects) e da rejeição de saves inválidos."""
+import pytest
+
+from core.effects import EffectError
+from core.game_state import GameState
+from core.items import Item
+from core.save_system import SaveManager
+
+
+def test_item_with_invalid_effect_is_rejected():
+    with pytest.raises(EffectError):
+        Item(name="frasco", description="", effects={"coragem": 5})
+
+
+def test_save_with_invalid_item_effect_is_not_loaded(tmp_path):
+    state = GameState(seed=1).to_dict()
+    state["inventory"] = [{"name": "frasco", "description": "", "effects": {"coragem": 5}, "count": 1}]
+    manager = SaveManager(tmp_path)
+    manager.save("slot", state)
+    assert SaveManager(tmp_path).load("slot") is None
+
+
+def test_compiled_effect_is_cached():
+    game = GameState(seed=1)
+    effect = game.effects.compile({"health": 5}, "item:frasco")
+    assert game.effects.compile({"health": 5}, "item:frasco") is effect
+    game.health = 50
+    game.apply_effects({"health": 5})
+    game.apply_effects({"health": 5})
+    assert game.health == 60
@@ -0,0 +1,56 @@
+"""Testes do histórico de desfazer/refazer (core.history)."""
+from core.engine import GameEngine
+
+
+def test_unchanged_turns_are_not_recorded():
+    engine = GameEngine(seed=3)
+    for cmd in ["olhar", "inventario", "ajuda", "pegar lanterna"]:
+        engine.execute(cmd)
+    assert engine.history.stats() == {"undo": 0, "redo": 0}
+    engine.execute("pegar chave_enferrujada")
+    assert engine.history.stats() == {"undo": 1, "redo": 0}
+
+
+def test_undo_and_redo_restore_states():
+    engine = GameEngine(seed=3)
+    start = engine.game.to_dict()
+    engine.execute("pegar chave_enferrujada")
+    engine.execute("mover norte")
+    after = engine.game.to_dict()
+    engine.execute("desfazer 2")
+    assert engine.game.to_dict() == start
+    engine.execute("refazer 2")
+    assert engine.game.to_dict() == after
+
+
+def test_change_after_undo_is_recorded():
+    engine = GameEngine(seed=3)
+    engine.execute("pegar chave_enferrujada")
+    engine.execute("desfazer")
+    # O mesmo estado de antes do desfazer precisa voltar a ser registrado
+    engine.execute("pegar chave_enferrujada")
+    assert engine.history.stats() == {"undo": 1, "redo": 0}
+    engine.execute("desfazer")
+    assert [item.name for item in engine.game.inventory] == []
+
+
+def test_first_undo_replays_the_session():
+    commands = ["pegar chave_enferrujada", "olhar", "mover norte", "usar chave_enferrujada",
+                "mover sul", "inventario", "mover norte"] * 3
+    lazy, eager = GameEngine(seed=7), GameEngine(seed=7)
+    eager.history.activate()
+    for cmd in commands:
+        lazy.execute(cmd)
+        eager.execute(cmd)
+    assert lazy.history.stats() == eager.history.stats()
+    lazy.execute("desfazer 4")
+    eager.execute("desfazer 4")
+    assert lazy.game.to_dict() == eager.game.to_dict()
+
+
+def test_changes_outside_turns_drop_the_past():
+    engine = GameEngine(seed=3)
+    engine.execute("pegar chave_enferrujada")
+    engine.game.health = 10
+    assert engine.history.stats() == {"undo": 0, "redo": 0}
+    assert engine.game.health == 10
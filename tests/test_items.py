@@ -0,0 +1,64 @@
+"""Testes do inventário com pilhas (core.items)."""
+from core.items import Inventory, Item
+
+
+def item(name):
+    return Item(name=name, description=f"Um(a) {name}.")
+
+
+def test_same_name_stacks_without_case():
+    inventory = Inventory(limit=2)
+    assert inventory.add_item(item("Vela"))
+    assert inventory.add_item(item("vela"), count=2)
+    assert len(inventory) == 1
+    assert inventory.count("VELA") == 3
+    assert "vela" in inventory and inventory.has_item("Vela")
+    # A pilha guarda o primeiro item pego
+    assert inventory.get_item("vela").name == "Vela"
+
+
+def test_limit_counts_stacks():
+    inventory = Inventory(limit=2)
+    assert inventory.add_item(item("vela"))
+    assert inventory.add_item(item("chave"))
+    assert not inventory.add_item(item("mapa"))
+    # Uma pilha que já existe continua crescendo com o inventário cheio
+    assert inventory.add_item(item("Chave"))
+    assert [i.name for i in inventory] == ["vela", "chave"]
+    assert inventory.count("chave") == 2
+
+
+def test_remove_decrements_then_frees_slot():
+    inventory = Inventory(limit=1)
+    inventory.add_item(item("vela"), count=2)
+    assert inventory.remove_item("VELA").name == "vela"
+    assert inventory.count("vela") == 1
+    assert inventory.remove_item("vela") is not None
+    assert len(inventory) == 0
+    assert inventory.remove_item("vela") is None
+    assert inventory.add_item(item("mapa"))
+
+
+def test_list_round_trip_keeps_counts_and_order():
+    inventory = Inventory()
+    inventory.add_item(item("vela"), count=3)
+    inventory.add_item(item("mapa"))
+    restored = Inventory()
+    restored.load_list(inventory.to_list())
+    assert [(i.name, restored.count(i.name)) for i in restored] == [("vela", 3), ("mapa", 1)]
+    # Saves antigos não têm 'count'
+    restored.load_list([{"name": "chave", "description": "x"}])
+    assert restored.count("chave") == 1
+
+
+def test_snapshot_is_shared_until_a_change():
+    inventory = Inventory()
+    inventory.add_item(item("vela"))
+    snapshot = inventory.snapshot()
+    assert inventory.snapshot() is snapshot
+    version = inventory.version
+    inventory.add_item(item("mapa"))
+    assert inventory.version > version
+    assert inventory.snapshot() is not snapshot
+    inventory.restore(snapshot)
+    assert [i.name for i in inventory] == ["vela"]
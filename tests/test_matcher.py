@@ -0,0 +1,23 @@
+"""Testes da comparação tolerante de alvos (core.matcher)."""
+from core.matcher import Matcher
+
+NAMES = ["chave_enferrujada", "pó_estranho", "lanterna", "livro_antigo"]
+
+
+def test_resolve_tolerates_accents_prefixes_and_typos():
+    matcher = Matcher(NAMES)
+    room = ["chave_enferrujada", "pó_estranho"]
+    assert matcher.resolve("po estranho", room) == "pó_estranho"
+    assert matcher.resolve("chave", room) == "chave_enferrujada"
+    assert matcher.resolve("chave enferujada", room) == "chave_enferrujada"
+    assert matcher.resolve("lanterna", room) is None
+
+
+def test_suggest_only_present_names():
+    matcher = Matcher(NAMES)
+    room = ["chave_enferrujada", "lanterna"]
+    assert matcher.suggest("lantena", allowed=room) == ["lanterna"]
+    assert matcher.suggest("livro", allowed=room) == []
+    # Repetida, a sugestão vem do cache e não pode ser alterada por quem a recebeu
+    matcher.suggest("lantena", allowed=room).append("livro_antigo")
+    assert matcher.suggest("lantena", allowed=room) == ["lanterna"]
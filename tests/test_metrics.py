@@ -0,0 +1,53 @@
+"""Testes das métricas do processo e da sessão (core.metrics)."""
+import pytest
+
+from core import metrics
+from core.command_system import CommandSystem
+from core.engine import GameEngine
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    metrics.REGISTRY.reset()
+    CommandSystem._parse_cached.cache_clear()
+    yield
+    metrics.REGISTRY.reset()
+
+
+def test_turns_go_to_session_and_process_registries():
+    first, second = GameEngine(seed=1), GameEngine(seed=2)
+    first.execute("olhar")
+    first.execute("olhar")
+    second.execute("inventario")
+    labels = (("action", "look"),)
+    assert first.metrics.histogram("casa_command_seconds", labels).count == 2
+    assert second.metrics.histogram("casa_command_seconds", labels) is None
+    assert metrics.REGISTRY.total("casa_command_seconds") == 3
+    assert second.metrics.total("casa_command_seconds") == 1
+
+
+def test_parse_is_timed_only_on_cache_miss():
+    for _ in range(3):
+        CommandSystem.parse("olhar")
+    CommandSystem.parse("inventario")
+    assert metrics.REGISTRY.histogram("casa_parse_seconds").count == 2
+
+
+def test_session_counter_and_export():
+    registry = metrics.MetricsRegistry()
+    metrics.inc("casa_test_total", 2, session=registry)
+    with metrics.timer("casa_test_seconds", session=registry):
+        pass
+    assert registry.counter("casa_test_total") == 2
+    assert "casa_test_seconds_count 1" in registry.to_prometheus()
+    assert registry.snapshot()["counters"][0]["value"] == 2
+
+
+def test_reset_keeps_bound_histograms():
+    engine = GameEngine(seed=1)
+    engine.execute("olhar")
+    metrics.REGISTRY.reset()
+    assert metrics.REGISTRY.snapshot()["histograms"] == []
+    engine.execute("olhar")
+    assert metrics.REGISTRY.total("casa_command_seconds") == 1
+    assert engine.metrics.total("casa_command_seconds") == 2
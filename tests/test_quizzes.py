@@ -0,0 +1,50 @@
+"""Testes das respostas aos quizzes (core.quizzes e o comando 'responder')."""
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from core.engine import GameEngine
+from core.game_state import GameState
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Partida com o quiz 'espelho_misterioso' na sala inicial."""
+    shutil.copytree(DATA_DIR, tmp_path, dirs_exist_ok=True)
+    world_file = tmp_path / "world.json"
+    world = json.loads(world_file.read_text(encoding="utf-8"))
+    world["hall_entrada"]["quiz_id"] = "espelho_misterioso"
+    world_file.write_text(json.dumps(world, ensure_ascii=False), encoding="utf-8")
+    return GameEngine(GameState(data_dir=tmp_path, seed=3))
+
+
+def stats(game):
+    return game.health, game.fear, game.sanity
+
+
+def test_option_index_by_number_and_text(engine):
+    quizzes = engine.game.quiz_system
+    assert quizzes.option_index("espelho_misterioso", "2") == 1
+    assert quizzes.option_index("espelho_misterioso", "espelhos") == 2
+    assert quizzes.option_index("espelho_misterioso", "9") == -1
+    assert quizzes.option_index("espelho_misterioso", "0") == -1
+
+
+@pytest.mark.parametrize("answer", ["9", "0", "martelo"])
+def test_answer_outside_options_is_not_a_mistake(engine, answer):
+    before = stats(engine.game)
+    result = engine.execute(f"responder {answer}")
+    assert "não é uma das opções" in "".join(result.messages)
+    assert result.outcome is None
+    assert stats(engine.game) == before
+
+
+def test_wrong_answer_applies_penalty(engine):
+    before = stats(engine.game)
+    result = engine.execute("responder 2")
+    assert result.outcome == {"kind": "quiz", "id": "espelho_misterioso", "ok": False}
+    assert stats(engine.game) != before
@@ -0,0 +1,146 @@
+"""Testes do salvamento com diário (core.save_system)."""
+import copy
+import json
+
+import pytest
+
+from core import save_system
+from core.engine import GameEngine
+from core.game_state import GameState
+from core.save_system import JOURNAL_FILE, SNAPSHOT_FILE, AutoSaver, SaveManager, apply_delta, state_delta
+
+COMMANDS = ["pegar chave_enferrujada", "mover norte", "pegar pó_estranho", "mover leste", "olhar"]
+
+
+def states_after_commands():
+    """Estados (to_dict) antes e depois de cada comando de uma partida com semente fixa."""
+    engine = GameEngine(seed=3)
+    states = [engine.game.to_dict()]
+    for cmd in COMMANDS:
+        engine.execute(cmd)
+        states.append(engine.game.to_dict())
+    return states
+
+
+def test_delta_round_trip():
+    states = states_after_commands()
+    for old, new in zip(states, states[1:]):
+        state = copy.deepcopy(old)
+        apply_delta(state, state_delta(old, new))
+        assert state == new
+
+
+def test_delta_is_empty_without_changes():
+    state = GameState(seed=1).to_dict()
+    assert state_delta(state, copy.deepcopy(state)) == {}
+
+
+def test_delta_keeps_only_changed_rooms():
+    states = states_after_commands()
+    delta = state_delta(states[0], states[1])
+    assert set(delta["world"]) == {"hall_entrada"}
+    assert "world" not in delta["set"]
+
+
+def test_journal_replay(tmp_path):
+    states = states_after_commands()
+    manager = SaveManager(tmp_path, snapshot_every=100)
+    for state in states:
+        manager.append("slot", state)
+    assert SaveManager(tmp_path).load_state("slot") == states[-1]
+
+
+def test_truncated_last_journal_line_is_ignored(tmp_path):
+    states = states_after_commands()
+    manager = SaveManager(tmp_path, snapshot_every=100)
+    written = [state for state in states if manager.append("slot", state)]
+    journal = tmp_path / "slot" / JOURNAL_FILE
+    lines = journal.read_text(encoding="utf-8").splitlines(keepends=True)
+    assert len(lines) == len(written) - 1  # o primeiro estado vai para o snapshot
+    # Queda no meio da gravação da última entrada
+    journal.write_text("".join(lines[:-1]) + lines[-1][:len(lines[-1]) // 2], encoding="utf-8")
+    assert SaveManager(tmp_path).load_state("slot") == written[-2]
+
+
+def test_journal_entries_covered_by_snapshot_are_skipped(tmp_path):
+    states = states_after_commands()
+    manager = SaveManager(tmp_path, snapshot_every=100)
+    for state in states[:3]:
+        manager.append("slot", state)
+    journal = tmp_path / "slot" / JOURNAL_FILE
+    stale = journal.read_text(encoding="utf-8")
+    # Queda entre gravar o snapshot novo e esvaziar o diário: as entradas antigas ficam
+    manager.save("slot", states[3])
+    journal.write_text(stale, encoding="utf-8")
+    assert json.loads((tmp_path / "slot" / SNAPSHOT_FILE).read_text(encoding="utf-8"))["seq"] > 2
+    assert SaveManager(tmp_path).load_state("slot") == states[3]
+
+
+def test_compaction_starts_new_snapshot(tmp_path):
+    states = states_after_commands()
+    manager = SaveManager(tmp_path, snapshot_every=2)
+    for state in states:
+        manager.append("slot", state)
+    journal_lines = (tmp_path / "slot" / JOURNAL_FILE).read_text(encoding="utf-8").splitlines()
+    assert len(journal_lines) < 2
+    assert SaveManager(tmp_path).load_state("slot") == states[-1]
+
+
+def test_load_rebuilds_game_state(tmp_path):
+    engine = GameEngine(seed=3)
+    for cmd in COMMANDS:
+        engine.execute(cmd)
+    manager = SaveManager(tmp_path)
+    manager.save("slot", engine.game.to_dict())
+    game = manager.load("slot")
+    assert game.to_dict() == engine.game.to_dict()
+    assert manager.load("inexistente") is None
+
+
+def test_autosaver_close_writes_pending_state(tmp_path):
+    engine = GameEngine(seed=3)
+    manager = SaveManager(tmp_path)
+    saver = AutoSaver(manager, "auto", engine.game)
+    for cmd in COMMANDS:
+        engine.execute(cmd)
+        saver.submit()
+    engine.execute("mover oeste")  # alteração ainda não enviada: close() grava
+    saver.close(timeout=None)
+    assert saver.errors == 0
+    assert 1 <= saver.writes <= len(COMMANDS) + 1
+    assert SaveManager(tmp_path).load_state("auto") == engine.game.to_dict()
+    assert manager.list_slots()[0]["slot"] == "auto"
+
+
+def test_resumed_slot_survives_crash_before_journal_reset(tmp_path, monkeypatch):
+    states = states_after_commands()
+    first = SaveManager(tmp_path, snapshot_every=100)
+    for state in states[:3]:
+        first.append("slot", state)
+    # Outro processo retoma o slot e compacta logo na primeira alteração
+    resumed = SaveManager(tmp_path, snapshot_every=1)
+    assert resumed.load_state("slot") == states[2]
+    write = save_system.atomic_write
+
+    def crash_on_journal(path, text):
+        if path.name == JOURNAL_FILE:
+            raise OSError("queda antes de esvaziar o diário")
+        write(path, text)
+
+    monkeypatch.setattr(save_system, "atomic_write", crash_on_journal)
+    with pytest.raises(OSError):
+        resumed.append("slot", states[3])
+    monkeypatch.undo()
+    assert SaveManager(tmp_path).load_state("slot") == states[3]
+
+
+def test_save_continues_sequence_on_disk(tmp_path):
+    states = states_after_commands()
+    first = SaveManager(tmp_path, snapshot_every=100)
+    for state in states[:3]:
+        first.append("slot", state)
+    journal = tmp_path / "slot" / JOURNAL_FILE
+    stale = journal.read_text(encoding="utf-8")
+    SaveManager(tmp_path).save("slot", states[3])
+    journal.write_text(stale, encoding="utf-8")
+    assert SaveManager(tmp_path).load_state("slot") == states[3]
@@ -0,0 +1,41 @@
+"""Teste de uma sessão do servidor asyncio por um socket local (interface.server)."""
+import asyncio
+
+from interface.server import PROMPT, GameServer
+
+PROMPT_BYTES = PROMPT.replace("\n", "\r\n").encode("utf-8")
+
+
+async def play_session():
+    server = GameServer(port=0, intro=False, typewriter_delay=0)
+    await server.start()
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", server.port), 5)
+        first = await asyncio.wait_for(reader.readuntil(PROMPT_BYTES), 5)
+        writer.write("mover norte\r\n".encode("utf-8"))
+        await writer.drain()
+        moved = await asyncio.wait_for(reader.readuntil(PROMPT_BYTES), 5)
+        stats = server.stats()
+        writer.write(b"sair\r\n")
+        await writer.drain()
+        await asyncio.wait_for(reader.read(), 5)  # o servidor fecha a conexão
+        writer.close()
+        # A sessão sai do servidor depois que a conexão fecha
+        for _ in range(100):
+            if not server.sessions:
+                break
+            await asyncio.sleep(0.01)
+        return first.decode("utf-8"), moved.decode("utf-8"), stats, dict(server.sessions)
+    finally:
+        await server.stop()
+
+
+def test_session_over_loopback():
+    first, moved, stats, open_sessions = asyncio.run(play_session())
+    assert "CASA ABANDONADA" in first
+    assert "Hall de Entrada" in first
+    assert "\r\n" in first and "\n" not in first.replace("\r\n", "")
+    assert "Sala de Estar" in moved
+    assert len(stats) == 1 and stats[0]["turns"] == 1
+    assert stats[0]["metrics"]["histograms"][0]["labels"] == {"action": "move"}
+    assert open_sessions == {}
@@ -0,0 +1,48 @@
+"""Testes do índice de grafo do mundo (core.world_graph)."""
+from core.game_state import GameState
+from core.world_graph import WorldGraph
+
+
+def fresh_distances(world, source):
+    """Distâncias de uma BFS feita do zero, para comparar com as árvores corrigidas."""
+    return WorldGraph(world)._tree(source)[0]
+
+
+def test_shortest_paths_follow_directed_connections():
+    graph = GameState(seed=1).world.graph
+    assert graph.shortest_path("hall_entrada", "biblioteca") == ["norte", "leste"]
+    assert graph.shortest_path("biblioteca", "hall_entrada") == ["oeste", "sul"]
+    assert graph.distance("hall_entrada", "biblioteca") == 2
+    assert graph.shortest_path("hall_entrada", "hall_entrada") == []
+    # A sala secreta só tem saída: ligada ao resto, mas sem caminho até ela
+    assert graph.connected("hall_entrada", "sala_secreta")
+    assert graph.shortest_path("hall_entrada", "sala_secreta") is None
+
+
+def test_resolve_room_by_id_or_name():
+    graph = GameState(seed=1).world.graph
+    assert graph.resolve_room("Sala de Estar") == "sala_estar"
+    assert graph.resolve_room("  BIBLIOTECA ") == "biblioteca"
+    assert graph.resolve_room("sala secreta") == "sala_secreta"
+    assert graph.resolve_room("porão") is None
+
+
+def test_unlock_repairs_cached_trees():
+    world = GameState(seed=1).world
+    assert world.graph.shortest_path("hall_entrada", "sala_secreta") is None
+    world.unlock("biblioteca", "estante", "sala_secreta")
+    graph = world.graph
+    assert graph.shortest_path("hall_entrada", "sala_secreta") == ["norte", "leste", "estante"]
+    # Atalho que encurta uma árvore já em cache
+    assert graph.distance("hall_entrada", "biblioteca") == 2
+    world.unlock("hall_entrada", "alçapão", "biblioteca")
+    assert graph.shortest_path("hall_entrada", "sala_secreta") == ["alçapão", "estante"]
+    for source in ("hall_entrada", "sala_estar", "biblioteca"):
+        assert graph._tree(source)[0] == fresh_distances(world, source)
+
+
+def test_unlock_does_not_leak_into_other_sessions():
+    first, second = GameState(seed=1), GameState(seed=1)
+    first.world.unlock("biblioteca", "estante", "sala_secreta")
+    assert first.world.graph.shortest_path("hall_entrada", "sala_secreta") is not None
+    assert second.world.graph.shortest_path("hall_entrada", "sala_secreta") is None